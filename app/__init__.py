@@ -1,10 +1,21 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
 from app.config import config  
-from app.database.db import engine, Base, SessionLocal
+from app.database.db import Base, configure_engine
+from app.database import session as db_session, warmup
+from app.utils import content_negotiation, metrics, profiler
 from app.controllers.auth_controller import auth_bp
 from app.controllers.task_controller import task_bp
 from app.controllers.dashboard_controller import dashboard_bp
+from app.controllers.internal_controller import internal_bp
+from app.controllers.event_controller import event_bp
+from app.controllers.metrics_controller import metrics_bp
+from app.commands.rollup_commands import rollups_cli
+from app.commands.log_commands import logs_cli
+from app.commands.event_commands import events_cli
+from app.commands.analytics_commands import analytics_cli
+from app.commands.task_commands import tasks_cli
+from app.commands.db_commands import db_cli
 
 def create_app(config_name='development'):
     """Application factory"""
@@ -14,8 +25,17 @@ def create_app(config_name='development'):
     conf = config.get(config_name, config['default'])
     app.config.from_object(conf)
 
-    # --- Initialize database (create tables) ---
-    Base.metadata.create_all(bind=engine)
+    # --- Initialize database (engine for this config; tables only where DB_CREATE_ALL) ---
+    engine = configure_engine(conf)
+    if app.config['DB_CREATE_ALL']:
+        Base.metadata.create_all(bind=engine)
+    # Metrics hooks first: after_request runs in reverse, so they see the commit
+    metrics.init_app(app)
+    profiler.init_app(app)
+    # Task / log / dashboard responses: MessagePack via Accept, gzip or brotli
+    # via Accept-Encoding; registered before the session hooks so it runs after the commit
+    content_negotiation.init_app(app, (task_bp.name, dashboard_bp.name))
+    db_session.init_app(app)
 
     # --- Setup CORS ---
     CORS(app, resources={
@@ -30,6 +50,17 @@ def create_app(config_name='development'):
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(task_bp, url_prefix='/api/tasks')
     app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
+    app.register_blueprint(internal_bp, url_prefix='/api/internal')
+    app.register_blueprint(event_bp, url_prefix='/api/events')
+    app.register_blueprint(metrics_bp, url_prefix='/api/metrics')
+
+    # --- Register CLI commands ---
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(logs_cli)
+    app.cli.add_command(events_cli)
+    app.cli.add_command(analytics_cli)
+    app.cli.add_command(tasks_cli)
+    app.cli.add_command(db_cli)
 
     # --- Health check ---
     @app.route('/api/health', methods=['GET'])
@@ -46,7 +77,8 @@ def create_app(config_name='development'):
                 'health': '/api/health',
                 'auth': '/api/auth',
                 'tasks': '/api/tasks',
-                'dashboard': '/api/dashboard'
+                'dashboard': '/api/dashboard',
+                'events': '/api/events'
             }
         }), 200
 
@@ -59,4 +91,8 @@ def create_app(config_name='development'):
     def internal_error(error):
         return jsonify({'success': False, 'message': 'Internal server error'}), 500
 
+    # --- Warm-up (with gunicorn --preload, once in the master; see gunicorn.conf.py) ---
+    if app.config['STARTUP_WARMUP']:
+        warmup.warm_up(app)
+
     return app
@@ -0,0 +1,68 @@
+"""Async (ASGI) variant of the API.
+
+Serves the same /api/auth, /api/tasks and /api/dashboard routes as the Flask
+app on Quart with an asyncpg engine, reusing the sync services' statement
+builders, models and caches. Run it with `hypercorn asgi:app`.
+"""
+from quart import Quart, jsonify
+from quart_cors import cors
+from app.config import config
+from app.aio import database
+from app.aio.controllers.auth_controller import auth_bp
+from app.aio.controllers.task_controller import task_bp
+from app.aio.controllers.dashboard_controller import dashboard_bp
+
+
+def create_async_app(config_name='development'):
+    """Application factory for the ASGI app; the schema is created by the sync app or schema.sql"""
+    app = Quart(__name__)
+
+    # --- Load configuration ---
+    conf = config.get(config_name, config['default'])
+    app.config.from_object(conf)
+
+    # --- Initialize database (async engine is created when serving starts) ---
+    database.init_app(app, conf)
+
+    # --- Setup CORS ---
+    app = cors(
+        app,
+        allow_origin=app.config.get('CORS_ORIGINS', ['http://localhost:5173']),
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        allow_headers=["Content-Type", "Authorization"]
+    )
+
+    # --- Register blueprints ---
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(task_bp, url_prefix='/api/tasks')
+    app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
+
+    # --- Health check ---
+    @app.route('/api/health', methods=['GET'])
+    async def health_check():
+        return jsonify({'success': True, 'message': 'Server is running', 'status': 'healthy'}), 200
+
+    @app.route('/', methods=['GET'])
+    async def root():
+        return jsonify({
+            'success': True,
+            'message': 'Team Task Tracker API (async)',
+            'version': '1.0.0',
+            'endpoints': {
+                'health': '/api/health',
+                'auth': '/api/auth',
+                'tasks': '/api/tasks',
+                'dashboard': '/api/dashboard'
+            }
+        }), 200
+
+    # --- Error handlers ---
+    @app.errorhandler(404)
+    async def not_found(error):
+        return jsonify({'success': False, 'message': 'Endpoint not found'}), 404
+
+    @app.errorhandler(500)
+    async def internal_error(error):
+        return jsonify({'success': False, 'message': 'Internal server error'}), 500
+
+    return app
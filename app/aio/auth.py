@@ -0,0 +1,34 @@
+from functools import wraps
+from quart import request, jsonify, g
+from app.utils.jwt_utils import authenticate_token
+
+
+def token_required(f):
+    """Async counterpart of app.utils.jwt_utils.token_required; sets `g.current_user`"""
+    @wraps(f)
+    async def decorated(*args, **kwargs):
+        token = None
+        auth_header = request.headers.get('Authorization')
+        if auth_header:
+            token = auth_header.partition(' ')[2]
+            if not token:
+                return jsonify({
+                    'success': False,
+                    'message': 'Token format invalid. Use: Bearer <token>'
+                }), 401
+        if not token:
+            return jsonify({
+                'success': False,
+                'message': 'Authentication token is missing'
+            }), 401
+        try:
+            g.current_user = authenticate_token(token)
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 401
+
+        return await f(*args, **kwargs)
+
+    return decorated
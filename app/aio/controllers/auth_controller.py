@@ -0,0 +1,60 @@
+from quart import Blueprint, request, jsonify
+from app.aio.services.auth_service import AsyncAuthService
+from app.aio.auth import token_required
+from app.utils.jwt_utils import revoke_token
+from app.utils.password_utils import PasswordPoolSaturated
+
+auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
+
+@auth_bp.route('/login', methods=['POST'])
+async def login():
+    """Login endpoint"""
+    data = await request.get_json() or {}
+
+    username = data.get('username')
+    password = data.get('password')
+
+    if not username or not password:
+        return jsonify({
+            'success': False,
+            'message': 'Username and password are required'
+        }), 400
+
+    try:
+        result, error = await AsyncAuthService.login(username, password)
+        if error:
+            return jsonify({
+                'success': False,
+                'message': error
+            }), 401
+
+        return jsonify({
+            'success': True,
+            'message': 'Login successful',
+            'data': result
+        }), 200
+
+    except PasswordPoolSaturated as e:
+        response = jsonify({
+            'success': False,
+            'message': str(e)
+        })
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 503
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Server error: {str(e)}'
+        }), 500
+
+
+@auth_bp.route('/logout', methods=['POST'])
+@token_required
+async def logout():
+    """Revoke the request's token (in this worker process only; see TokenCache)"""
+    revoke_token(request.headers['Authorization'].partition(' ')[2])
+    return jsonify({
+        'success': True,
+        'message': 'Logout successful'
+    }), 200
@@ -0,0 +1,52 @@
+from quart import Blueprint, jsonify, current_app, request
+from app.aio.auth import token_required
+from app.aio.http import cached_json_response
+from app.aio.services.dashboard_service import AsyncDashboardService
+from app.services.task_analytics_service import parse_trend_args
+from app.utils.cache import get_version
+
+dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
+
+@dashboard_bp.route('/statistics', methods=['GET'])
+@token_required
+async def get_statistics():
+    """Get dashboard statistics (cached per tasks version, see the sync controller)"""
+    async def build():
+        return {'success': True, 'data': await AsyncDashboardService.get_statistics()}
+
+    try:
+        return await cached_json_response(
+            f"dashboard:statistics:v{get_version('tasks')}",
+            current_app.config['STATISTICS_CACHE_TTL'],
+            build
+        )
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Server error: {str(e)}'
+        }), 500
+
+
+@dashboard_bp.route('/trends', methods=['GET'])
+@token_required
+async def get_trends():
+    """Trend rollups for a date range (see the sync controller)"""
+    try:
+        try:
+            start, end, interval, assigned_to = parse_trend_args(request.args, current_app.config['TRENDS_MAX_DAYS'])
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+
+        async def build():
+            return {'success': True, 'data': await AsyncDashboardService.get_trends(start, end, interval, assigned_to)}
+
+        return await cached_json_response(
+            f"dashboard:trends:v{get_version('analytics')}:{start}:{end}:{interval}:{assigned_to or ''}",
+            current_app.config['TRENDS_CACHE_TTL'],
+            build
+        )
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Server error: {str(e)}'
+        }), 500
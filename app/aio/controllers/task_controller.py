@@ -0,0 +1,233 @@
+from quart import Blueprint, request, jsonify, current_app, make_response, g
+from app.aio.auth import token_required
+from app.aio.http import not_modified, stream_json_list
+from app.aio.services.task_log_service import AsyncTaskLogService
+from app.aio.services.task_service import AsyncTaskService
+from app.services.task_service import TaskVersionConflict
+from app.utils.http_cache import make_etag, is_not_modified, set_validators
+
+task_bp = Blueprint('tasks', __name__, url_prefix='/api/tasks')
+
+
+def _wants_stream() -> bool:
+    return request.args.get('stream', '').lower() in ('1', 'true')
+
+
+@task_bp.route('', methods=['GET'])
+@token_required
+async def get_tasks():
+    """Get all tasks with optional filters; same parameters and ETags as the sync API"""
+    try:
+        status = request.args.get('status')
+        assigned_to = request.args.get('assigned_to')
+        if 'limit' in request.args or 'cursor' in request.args:
+            return await _tasks_page(status, assigned_to)
+
+        version = await AsyncTaskService.get_collection_version(assigned_to=assigned_to)
+        etag = make_etag('tasks', sorted(request.args.items(multi=True)), version)
+        if is_not_modified(etag, req=request):
+            return not_modified(etag)
+
+        response = await make_response(await _list_tasks(status, assigned_to))
+        set_validators(response, etag)
+        return response
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
+
+
+async def _tasks_page(status, assigned_to):
+    try:
+        limit = int(request.args.get('limit', current_app.config['TASKS_PAGE_DEFAULT_LIMIT']))
+    except ValueError:
+        return jsonify({"success": False, "message": "limit must be an integer"}), 400
+    limit = max(1, min(limit, current_app.config['TASKS_PAGE_MAX_LIMIT']))
+    try:
+        tasks, next_cursor = await AsyncTaskService.get_tasks_page(
+            status=status, assigned_to=assigned_to, limit=limit, cursor=request.args.get('cursor')
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    etag = make_etag(
+        'tasks-page', sorted(request.args.items(multi=True)),
+        [(task.id, task.version) for task in tasks], next_cursor
+    )
+    if is_not_modified(etag, req=request):
+        return not_modified(etag)
+    response = jsonify({
+        "success": True,
+        "data": [task.to_dict() for task in tasks],
+        "pagination": {"limit": limit, "next_cursor": next_cursor}
+    })
+    set_validators(response, etag)
+    return response
+
+
+async def _list_tasks(status, assigned_to):
+    if _wants_stream():
+        tasks = AsyncTaskService.iter_tasks(
+            status=status, assigned_to=assigned_to, batch_size=current_app.config['STREAM_BATCH_SIZE']
+        )
+        return stream_json_list(tasks, lambda task: task.to_dict())
+
+    tasks = await AsyncTaskService.get_all_tasks(status=status, assigned_to=assigned_to)
+    return jsonify({
+        "success": True,
+        "data": [task.to_dict() for task in tasks]
+    }), 200
+
+
+@task_bp.route('/search', methods=['GET'])
+@token_required
+async def search_tasks():
+    try:
+        q = (request.args.get('q') or '').strip()
+        if not q:
+            return jsonify({"success": False, "message": "q is required"}), 400
+        try:
+            limit = int(request.args.get('limit', current_app.config['TASKS_PAGE_DEFAULT_LIMIT']))
+            offset = int(request.args.get('offset', 0))
+        except ValueError:
+            return jsonify({"success": False, "message": "limit and offset must be integers"}), 400
+        limit = max(1, min(limit, current_app.config['TASKS_PAGE_MAX_LIMIT']))
+        offset = max(0, offset)
+        try:
+            results, has_more = await AsyncTaskService.search_tasks(
+                q, status=request.args.get('status'), assigned_to=request.args.get('assigned_to'),
+                limit=limit, offset=offset
+            )
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        return jsonify({
+            "success": True,
+            "data": [{**task.to_dict(), "rank": rank} for task, rank in results],
+            "pagination": {"limit": limit, "offset": offset, "next_offset": offset + limit if has_more else None}
+        }), 200
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
+
+
+@task_bp.route('/<int:task_id>', methods=['GET'])
+@token_required
+async def get_task(task_id):
+    try:
+        stamp = await AsyncTaskService.get_task_stamp(task_id)
+        if stamp is None:
+            return jsonify({"success": False, "message": "Task not found"}), 404
+        etag = make_etag('task', task_id, stamp.version)
+        if is_not_modified(etag, stamp.updated_at, req=request):
+            return not_modified(etag)
+
+        task = await AsyncTaskService.get_task_by_id(task_id)
+        if not task:
+            return jsonify({"success": False, "message": "Task not found"}), 404
+        response = jsonify({"success": True, "data": task.to_dict()})
+        set_validators(response, make_etag('task', task.id, task.version), task.updated_at)
+        return response, 200
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
+
+
+@task_bp.route('', methods=['POST'])
+@token_required
+async def create_task():
+    try:
+        data = await request.get_json()
+        user_id = g.current_user.user_id
+        if not data.get('title') or not data.get('assigned_to'):
+            return jsonify({"success": False, "message": "Title and assigned_to are required"}), 400
+        if not isinstance(data['assigned_to'], str):
+            return jsonify({"success": False, "message": "assigned_to must be a non-blank string"}), 400
+        try:
+            task = await AsyncTaskService.create_task(data, user_id)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        return jsonify({"success": True, "message": "Task created successfully", "data": task.to_dict()}), 201
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
+
+
+@task_bp.route('/batch', methods=['POST'])
+@token_required
+async def batch_tasks():
+    try:
+        data = await request.get_json() or {}
+        user_id = g.current_user.user_id
+        creates = data.get('create') or []
+        updates = data.get('update') or []
+        deletes = data.get('delete') or []
+        if not all(isinstance(items, list) for items in (creates, updates, deletes)):
+            return jsonify({"success": False, "message": "create, update and delete must be arrays"}), 400
+        if not all(isinstance(item, dict) for item in creates + updates):
+            return jsonify({"success": False, "message": "create and update items must be objects"}), 400
+        if len(creates) + len(updates) + len(deletes) > current_app.config['TASKS_BATCH_MAX_ITEMS']:
+            return jsonify({
+                "success": False,
+                "message": f"Batch is limited to {current_app.config['TASKS_BATCH_MAX_ITEMS']} items"
+            }), 400
+        results = await AsyncTaskService.apply_batch(creates, updates, deletes, user_id)
+        return jsonify({"success": True, "message": "Batch applied", "data": results}), 200
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
+
+
+@task_bp.route('/<int:task_id>', methods=['PUT'])
+@token_required
+async def update_task(task_id):
+    try:
+        data = await request.get_json()
+        user_id = g.current_user.user_id
+        expected_version = data.get('version')
+        if expected_version is not None and (isinstance(expected_version, bool) or not isinstance(expected_version, int)):
+            return jsonify({"success": False, "message": "version must be an integer"}), 400
+        try:
+            task = await AsyncTaskService.update_task(task_id, data, user_id, expected_version=expected_version)
+        except TaskVersionConflict as e:
+            return jsonify({"success": False, "message": str(e), "current_version": e.current_version}), 409
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        if not task:
+            return jsonify({"success": False, "message": "Task not found"}), 404
+        return jsonify({"success": True, "message": "Task updated successfully", "data": task.to_dict()}), 200
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
+
+
+@task_bp.route('/<int:task_id>', methods=['DELETE'])
+@token_required
+async def delete_task(task_id):
+    try:
+        success = await AsyncTaskService.delete_task(task_id)
+        if not success:
+            return jsonify({"success": False, "message": "Task not found"}), 404
+        return jsonify({"success": True, "message": "Task deleted successfully"}), 200
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
+
+
+@task_bp.route('/<int:task_id>/logs', methods=['GET'])
+@token_required
+async def get_task_logs(task_id):
+    try:
+        if 'limit' in request.args or 'cursor' in request.args:
+            try:
+                limit = int(request.args.get('limit', current_app.config['TASKS_PAGE_DEFAULT_LIMIT']))
+            except ValueError:
+                return jsonify({"success": False, "message": "limit must be an integer"}), 400
+            limit = max(1, min(limit, current_app.config['TASKS_PAGE_MAX_LIMIT']))
+            try:
+                logs, next_cursor = await AsyncTaskLogService.get_logs_page(task_id, limit=limit, cursor=request.args.get('cursor'))
+            except ValueError as e:
+                return jsonify({"success": False, "message": str(e)}), 400
+            return jsonify({
+                "success": True,
+                "data": [log.to_dict() for log in logs],
+                "pagination": {"limit": limit, "next_cursor": next_cursor}
+            }), 200
+        if _wants_stream():
+            logs = AsyncTaskLogService.iter_logs_by_task(task_id, batch_size=current_app.config['STREAM_BATCH_SIZE'])
+            return stream_json_list(logs, lambda log: log.to_dict())
+        logs = await AsyncTaskLogService.get_logs_by_task(task_id)
+        return jsonify({"success": True, "data": [log.to_dict() for log in logs]}), 200
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
@@ -0,0 +1,72 @@
+from quart import Quart, g, jsonify
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+
+def build_async_engine(conf):
+    """Create an asyncpg engine from the same Config DB_* and pool settings as the sync engine"""
+    settings = conf()
+    connect_args = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args['server_settings'] = {'statement_timeout': str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    return create_async_engine(
+        settings.DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://', 1),
+        echo=settings.SQLALCHEMY_ECHO,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args
+    )
+
+
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def get_session() -> AsyncSession:
+    """Return the async session shared by every service call in the current request.
+
+    Same contract as app.database.session.get_session: opened lazily, committed
+    after a successful response, rolled back otherwise.
+    """
+    if 'db_session' not in g:
+        g.db_session = AsyncSessionLocal()
+    return g.db_session
+
+
+def init_app(app: Quart, conf) -> None:
+    """Create the async engine on startup and install the session hooks"""
+
+    @app.before_serving
+    async def open_engine():
+        app.extensions['async_engine'] = engine = build_async_engine(conf)
+        AsyncSessionLocal.configure(bind=engine)
+
+    @app.after_serving
+    async def close_engine():
+        engine = app.extensions.pop('async_engine', None)
+        if engine is not None:
+            await engine.dispose()
+
+    @app.after_request
+    async def commit_session(response):
+        session = g.get('db_session')
+        if session is None:
+            return response
+        if response.status_code >= 400:
+            await session.rollback()
+            return response
+        try:
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            app.logger.exception('Commit failed')
+            response = jsonify({'success': False, 'message': f'Server error: {str(e)}'})
+            response.status_code = 500
+        return response
+
+    @app.teardown_appcontext
+    async def close_session(exception=None):
+        session = g.pop('db_session', None)
+        if session is not None:
+            await session.close()
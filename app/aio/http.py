@@ -0,0 +1,49 @@
+import hashlib
+from typing import Any, AsyncIterator, Awaitable, Callable
+from quart import Response, current_app, request
+from app.utils.cache import get_cache
+from app.utils.http_cache import is_not_modified, set_validators
+from app.utils.serialization import dumps
+
+
+def not_modified(etag: str) -> Response:
+    """Build an empty 304 response carrying the current ETag"""
+    response = current_app.response_class('', status=304)
+    response.set_etag(etag)
+    return response
+
+
+async def cached_json_response(key: str, ttl: int, build: Callable[[], Awaitable[dict]]) -> Response:
+    """Async app.utils.http_cache.cached_json_response; shares the same cache entries"""
+    cache = get_cache()
+    entry = cache.get(key)
+    if entry is None:
+        body = dumps(await build())
+        entry = (hashlib.sha1(body).hexdigest(), body)
+        cache.set(key, entry, ttl)
+
+    etag, body = entry
+    if is_not_modified(etag, req=request):
+        return not_modified(etag)
+    return set_validators(current_app.response_class(body, mimetype='application/json'), etag)
+
+
+async def iter_json_list(items: AsyncIterator[Any], serialize: Callable[[Any], dict], chunk_size: int = 100):
+    """Async app.utils.streaming.iter_json_list"""
+    yield b'{"success": true, "data": ['
+    separator = b''
+    chunk = []
+    async for item in items:
+        chunk.append(dumps(serialize(item)))
+        if len(chunk) >= chunk_size:
+            yield separator + b', '.join(chunk)
+            separator = b', '
+            chunk = []
+    if chunk:
+        yield separator + b', '.join(chunk)
+    yield b']}'
+
+
+def stream_json_list(items: AsyncIterator[Any], serialize: Callable[[Any], dict]) -> Response:
+    """Stream a list response from an async iterator, e.g. a server-side cursor"""
+    return Response(iter_json_list(items, serialize), mimetype='application/json')
@@ -0,0 +1,24 @@
+from sqlalchemy import select
+from app.aio.database import get_session
+from app.models.user import User
+from app.utils.jwt_utils import generate_token
+from app.utils.password_utils import verify_password_async
+
+
+class AsyncAuthService:
+    @staticmethod
+    async def login(username: str, password: str):
+        """See AuthService.login; password verification is awaited, not blocked on"""
+        session = get_session()
+        user = await session.scalar(select(User).where(User.username == username))
+        if not user:
+            return None, "Invalid username or password"
+        valid, new_hash = await verify_password_async(user.password_hash, password)
+        if not valid:
+            return None, "Invalid username or password"
+        if new_hash:
+            user.password_hash = new_hash
+            await session.flush()
+
+        token = generate_token(user.id, user.username)
+        return {'access_token': token, 'user': user.to_dict()}, None
@@ -0,0 +1,25 @@
+from datetime import date
+from typing import Optional
+from app.aio.database import get_session
+from app.services.dashboard_service import DashboardService
+from app.services.task_analytics_service import TaskAnalyticsService
+from app.services.task_rollup_service import TaskRollupService
+
+
+class AsyncDashboardService:
+    @staticmethod
+    async def get_statistics() -> dict:
+        session = get_session()
+        rows = (await session.execute(TaskRollupService._counts_select())).all()
+        overdue = await session.scalar(DashboardService._overdue_select())
+        recent_activities = (await session.execute(DashboardService._recent_activities_select())).all()
+        return DashboardService._build_statistics(TaskRollupService._totals(rows), rows, overdue, recent_activities)
+
+    @staticmethod
+    async def get_trends(start: date, end: date, interval: str = 'day', assigned_to: Optional[str] = None) -> dict:
+        """See TaskAnalyticsService.get_trends"""
+        session = get_session()
+        series = (await session.execute(TaskAnalyticsService._series_select(start, end, interval, assigned_to))).all()
+        assignees = (await session.execute(TaskAnalyticsService._assignees_select(start, end, assigned_to))).all()
+        processed_until = await session.scalar(TaskAnalyticsService._watermark_select())
+        return TaskAnalyticsService._build_trends(start, end, interval, series, assignees, processed_until)
@@ -0,0 +1,23 @@
+from typing import AsyncIterator, List, Optional, Tuple
+from app.aio.database import AsyncSessionLocal, get_session
+from app.models.task_log import TaskLog
+from app.services.task_log_service import TaskLogService
+
+
+class AsyncTaskLogService:
+    @staticmethod
+    async def get_logs_by_task(task_id: int) -> List[TaskLog]:
+        result = await get_session().scalars(TaskLogService._logs_by_task_select(task_id))
+        return result.all()
+
+    @staticmethod
+    async def get_logs_page(task_id: int, limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[TaskLog], Optional[str]]:
+        result = await get_session().scalars(TaskLogService._logs_page_select(task_id, limit, cursor))
+        return TaskLogService._split_page(result.all(), limit)
+
+    @staticmethod
+    async def iter_logs_by_task(task_id: int, batch_size: int = 500) -> AsyncIterator[TaskLog]:
+        async with AsyncSessionLocal() as session:
+            stmt = TaskLogService._logs_by_task_select(task_id).execution_options(yield_per=batch_size)
+            async for log in await session.stream_scalars(stmt):
+                yield log
@@ -0,0 +1,131 @@
+from typing import AsyncIterator, List, Optional, Tuple
+from sqlalchemy import select
+from app.aio.database import AsyncSessionLocal, get_session
+from app.models.task import Task
+from app.services.assignee_service import AssigneeService
+from app.services.task_event_service import TaskEventService
+from app.services.task_rollup_service import TaskRollupService
+from app.services.task_service import TaskService, TaskVersionConflict
+from app.utils.cache import mark_changed
+
+
+async def _apply_rollup(session, changes) -> None:
+    stmt = TaskRollupService._upsert_statement(changes)
+    if stmt is not None:
+        await session.execute(stmt)
+
+
+class AsyncTaskService:
+    """Awaitable TaskService: same statements and semantics, executed over asyncpg"""
+
+    @staticmethod
+    async def get_all_tasks(status: Optional[str] = None, assigned_to: Optional[str] = None) -> List[Task]:
+        result = await get_session().scalars(TaskService._list_select(status, assigned_to))
+        return result.all()
+
+    @staticmethod
+    async def iter_tasks(
+        status: Optional[str] = None,
+        assigned_to: Optional[str] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Task]:
+        """Yield tasks over a server-side cursor, using its own session like TaskService.iter_tasks"""
+        async with AsyncSessionLocal() as session:
+            stmt = TaskService._list_select(status, assigned_to).execution_options(yield_per=batch_size)
+            async for task in await session.stream_scalars(stmt):
+                yield task
+
+    @staticmethod
+    async def get_tasks_page(
+        status: Optional[str] = None,
+        assigned_to: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Task], Optional[str]]:
+        stmt = TaskService._page_select(status, assigned_to, limit, cursor)
+        result = await get_session().scalars(stmt)
+        return TaskService._split_page(result.all(), limit)
+
+    @staticmethod
+    async def search_tasks(
+        q: str,
+        status: Optional[str] = None,
+        assigned_to: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Tuple[List[Tuple[Task, float]], bool]:
+        """See TaskService.search_tasks"""
+        result = await get_session().execute(TaskService._search_select(q, status, assigned_to, limit, offset))
+        rows = result.all()
+        return [tuple(row) for row in rows[:limit]], len(rows) > limit
+
+    @staticmethod
+    async def get_collection_version(assigned_to: Optional[str] = None) -> int:
+        """See TaskService.get_collection_version"""
+        return await get_session().scalar(TaskRollupService._version_select(assigned_to))
+
+    @staticmethod
+    async def get_task_stamp(task_id: int):
+        result = await get_session().execute(TaskService._task_stamp_select(task_id))
+        return result.first()
+
+    @staticmethod
+    async def get_task_by_id(task_id: int) -> Optional[Task]:
+        return await get_session().get(Task, task_id)
+
+    @staticmethod
+    async def create_task(task_data: dict, user_id: int) -> Task:
+        session = get_session()
+        assignee = await session.run_sync(AssigneeService.resolve_one, task_data.get('assigned_to'))
+        task = Task(**TaskService._new_task_values(task_data, user_id, assignee))
+        session.add(task)
+        await session.flush()
+        session.add(TaskService._creation_log(task, user_id))
+        await _apply_rollup(session, [(None, (task.assignee_id, task.status))])
+        await session.run_sync(TaskEventService.record, [TaskEventService.task_created(task)])
+        mark_changed(session, 'tasks')
+        await session.flush()
+        return task
+
+    @staticmethod
+    async def update_task(
+        task_id: int, task_data: dict, user_id: int, expected_version: Optional[int] = None
+    ) -> Optional[Task]:
+        """See TaskService.update_task"""
+        session = get_session()
+        assignee = None
+        if task_data.get('assigned_to'):
+            assignee = await session.run_sync(AssigneeService.resolve_one, task_data['assigned_to'])
+        stmt, params = TaskService._update_statement(task_id, task_data, user_id, expected_version, assignee)
+        row = (await session.execute(stmt, params)).first()
+        if row is None:
+            current = await session.scalar(select(Task.version).where(Task.id == task_id))
+            if current is None:
+                return None
+            raise TaskVersionConflict(task_id, current)
+
+        task, old_status, old_assignee_id, old_assigned_to = row
+        await _apply_rollup(session, [((old_assignee_id, old_status), (task.assignee_id, task.status))])
+        await session.run_sync(TaskEventService.record, [TaskEventService.task_updated(task, old_status, old_assigned_to)])
+        mark_changed(session, 'tasks')
+        return task
+
+    @staticmethod
+    async def delete_task(task_id: int) -> bool:
+        session = get_session()
+        task = await session.get(Task, task_id)
+        if not task:
+            return False
+        await _apply_rollup(session, [((task.assignee_id, task.status), None)])
+        await session.run_sync(
+            TaskEventService.record, [TaskEventService.task_deleted(task.id, task.assigned_to, task.status)]
+        )
+        await session.delete(task)
+        mark_changed(session, 'tasks')
+        await session.flush()
+        return True
+
+    @staticmethod
+    async def apply_batch(creates: List[dict], updates: List[dict], deletes: List[int], user_id: int) -> dict:
+        """See TaskService.apply_batch; the bulk statements run on the async session's sync facade"""
+        return await get_session().run_sync(TaskService._apply_batch, creates, updates, deletes, user_id)
@@ -0,0 +1,31 @@
+import click
+from datetime import datetime
+from flask.cli import AppGroup
+from app.services.task_analytics_service import TaskAnalyticsService
+
+analytics_cli = AppGroup('analytics', help='Maintain the daily trend rollups.')
+
+
+def _parse_day(value, param_hint):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        raise click.BadParameter('expected YYYY-MM-DD', param_hint=param_hint)
+
+
+@analytics_cli.command('refresh')
+def refresh():
+    """Fold task_logs written since the last run into task_daily_stats; run every few minutes."""
+    start, end, rows = TaskAnalyticsService.refresh()
+    click.echo(f"Recomputed {start} to {end}: {rows} row(s)")
+
+
+@analytics_cli.command('backfill')
+@click.option('--from', 'start', default=None, help='First day, YYYY-MM-DD (default: first task log).')
+@click.option('--to', 'end', default=None, help='Last day, YYYY-MM-DD (default: today).')
+def backfill(start, end):
+    """Recompute task_daily_stats from task_logs for a date range."""
+    chunks = TaskAnalyticsService.backfill(_parse_day(start, '--from'), _parse_day(end, '--to'))
+    for chunk_start, chunk_end, rows in chunks:
+        click.echo(f"Recomputed {chunk_start} to {chunk_end}: {rows} row(s)")
+    click.echo(f"{len(chunks)} chunk(s) recomputed")
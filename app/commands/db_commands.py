@@ -0,0 +1,58 @@
+import click
+from flask.cli import AppGroup
+from app.database import schema
+
+db_cli = AppGroup('db', help='Create or upgrade the database schema (instead of DB_CREATE_ALL).')
+
+
+@db_cli.command('init')
+def init():
+    """Create the schema on an empty database from migrations/schema.sql."""
+    if schema.is_initialized():
+        raise click.ClickException(
+            "The database already has tables; use `db migrate` (or `db stamp` for a "
+            "database set up by hand)"
+        )
+    schema.run_script(schema.read_sql(schema.SCHEMA_FILE))
+    # schema.sql already contains every upgrade script's changes
+    schema.record_applied(schema.migration_files())
+    click.echo(f"Created the schema from {schema.SCHEMA_FILE}")
+
+
+@db_cli.command('migrate')
+def migrate():
+    """Apply the migrations/NNN_*.sql scripts not yet recorded in schema_migrations."""
+    if not schema.is_initialized():
+        raise click.ClickException("The database has no schema yet; run `db init` first")
+    if not schema.is_tracked():
+        raise click.ClickException(
+            "The database was set up without `db init`; record the migrations it already "
+            "has with `db stamp` (or `db stamp --through NNN`) first"
+        )
+    pending = schema.pending_migrations()
+    if not pending:
+        click.echo("Database is up to date")
+        return
+    for name in pending:
+        sql = schema.read_sql(name)
+        click.echo(f"Applying {name}")
+        try:
+            schema.run_script(sql)
+        except Exception as e:
+            # Scripts before this one stay recorded; fix the cause and run migrate again
+            raise click.ClickException(f"{name} failed: {e}")
+        schema.record_applied([name])
+        for note in schema.header_notes(sql):
+            click.echo(f"  {note}")
+    click.echo(f"Applied {len(pending)} migration(s)")
+
+
+@db_cli.command('stamp')
+@click.option('--through', default=None, help='Last migration already applied, e.g. 007 (default: all).')
+def stamp(through):
+    """Record migrations as applied without running them (databases upgraded by hand)."""
+    pending = schema.pending_migrations()
+    if through is not None:
+        pending = [name for name in pending if name[:3] <= through.zfill(3)]
+    schema.record_applied(pending)
+    click.echo(f"Recorded {len(pending)} migration(s) as applied")
@@ -0,0 +1,17 @@
+import click
+from datetime import datetime, timedelta
+from flask import current_app
+from flask.cli import AppGroup
+from app.services.task_event_service import TaskEventService
+
+events_cli = AppGroup('events', help='Maintain the task change feed.')
+
+
+@events_cli.command('prune')
+@click.option('--hours', type=int, default=None, help='Keep this many hours of events (default TASK_EVENTS_RETENTION_HOURS).')
+def prune(hours):
+    """Delete task_events older than the retention window."""
+    if hours is None:
+        hours = current_app.config['TASK_EVENTS_RETENTION_HOURS']
+    count = TaskEventService.prune(datetime.utcnow() - timedelta(hours=hours))
+    click.echo(f"Deleted {count} event(s)")
@@ -0,0 +1,40 @@
+import click
+from datetime import date, datetime
+from flask import current_app
+from flask.cli import AppGroup
+from app.services.task_log_partition_service import TaskLogPartitionService, add_months
+
+logs_cli = AppGroup('logs', help='Manage task_logs partitions and archives.')
+
+
+@logs_cli.command('ensure-partitions')
+@click.option('--ahead', type=int, default=None, help='Future months to create (default TASK_LOGS_PARTITIONS_AHEAD).')
+def ensure_partitions(ahead):
+    """Create monthly task_logs partitions up to N months ahead; run at least monthly."""
+    if ahead is None:
+        ahead = current_app.config['TASK_LOGS_PARTITIONS_AHEAD']
+    created = TaskLogPartitionService.ensure_partitions(ahead)
+    for name in created:
+        click.echo(f"Created {name}")
+    click.echo(f"{len(created)} partition(s) created")
+
+
+@logs_cli.command('archive')
+@click.option('--before', default=None, help='Archive months before YYYY-MM (default: keep TASK_LOGS_RETENTION_MONTHS).')
+@click.option('--dir', 'directory', default=None, help='Output directory (default TASK_LOGS_ARCHIVE_DIR).')
+@click.option('--keep-table', is_flag=True, help='Detach partitions but do not drop them.')
+def archive(before, directory, keep_table):
+    """Detach old task_logs partitions, export them to .ndjson.gz files, then drop them."""
+    if before:
+        try:
+            cutoff = datetime.strptime(before, '%Y-%m').date()
+        except ValueError:
+            raise click.BadParameter('expected YYYY-MM', param_hint='--before')
+    else:
+        cutoff = add_months(date.today().replace(day=1), -current_app.config['TASK_LOGS_RETENTION_MONTHS'])
+    archived = TaskLogPartitionService.archive_partitions(
+        cutoff, directory or current_app.config['TASK_LOGS_ARCHIVE_DIR'], drop=not keep_table
+    )
+    for name, path, count in archived:
+        click.echo(f"Archived {name}: {count} row(s) -> {path}")
+    click.echo(f"{len(archived)} partition(s) archived")
@@ -0,0 +1,24 @@
+import click
+from flask.cli import AppGroup
+from app.services.task_rollup_service import TaskRollupService
+
+rollups_cli = AppGroup('rollups', help='Maintain the dashboard counter rollups.')
+
+
+@rollups_cli.command('rebuild')
+def rebuild():
+    """Recompute task_status_counts from the tasks table."""
+    count = TaskRollupService.rebuild()
+    click.echo(f"Rebuilt rollups for {count} assignee(s)")
+
+
+@rollups_cli.command('check')
+def check():
+    """Compare the rollups with the task_statistics / team_activity views."""
+    mismatches = TaskRollupService.check_consistency()
+    if not mismatches:
+        click.echo("Rollups are consistent")
+        return
+    for line in mismatches:
+        click.echo(line, err=True)
+    raise SystemExit(1)
@@ -4,10 +4,17 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    return default if value is None else value.lower() in ('1', 'true', 'yes')
+
+
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 10000))
     
     DB_HOST = os.getenv('DB_HOST')
     DB_PORT = os.getenv('DB_PORT')
@@ -21,6 +28,110 @@ class Config:
     
     SQLALCHEMY_DATABASE_URI = property(lambda self: self.DATABASE_URL)
 
+    # Engine / connection pool (per worker process)
+    SQLALCHEMY_ECHO = _env_bool('SQLALCHEMY_ECHO', False)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = _env_bool('DB_POOL_PRE_PING', True)
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000))
+
+    # Read replicas (comma-separated postgresql:// URLs, same pool settings):
+    # read-only calls of GET requests go to a replica lagging at most
+    # DB_REPLICA_MAX_LAG_SECONDS (measured every DB_REPLICA_LAG_CHECK_SECONDS),
+    # except for a user who wrote in the last DB_REPLICA_STICKY_SECONDS
+    DB_REPLICA_URLS = [url.strip() for url in os.getenv('DB_REPLICA_URLS', '').split(',') if url.strip()]
+    DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv('DB_REPLICA_MAX_LAG_SECONDS', 5))
+    DB_REPLICA_LAG_CHECK_SECONDS = float(os.getenv('DB_REPLICA_LAG_CHECK_SECONDS', 2))
+    DB_REPLICA_STICKY_SECONDS = int(os.getenv('DB_REPLICA_STICKY_SECONDS', 10))
+    DB_REPLICA_CONNECT_TIMEOUT = int(os.getenv('DB_REPLICA_CONNECT_TIMEOUT', 2))
+
+    # Startup: DB_CREATE_ALL creates missing tables on every boot (development
+    # and testing only; production runs `flask db init` / `flask db migrate`).
+    # STARTUP_WARMUP opens STARTUP_WARMUP_CONNECTIONS (0 = DB_POOL_SIZE) and
+    # runs the hot read queries once before serving
+    DB_CREATE_ALL = _env_bool('DB_CREATE_ALL', False)
+    STARTUP_WARMUP = _env_bool('STARTUP_WARMUP', False)
+    STARTUP_WARMUP_CONNECTIONS = int(os.getenv('STARTUP_WARMUP_CONNECTIONS', 0))
+
+    TASKS_PAGE_DEFAULT_LIMIT = int(os.getenv('TASKS_PAGE_DEFAULT_LIMIT', 50))
+    TASKS_PAGE_MAX_LIMIT = int(os.getenv('TASKS_PAGE_MAX_LIMIT', 200))
+    STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', 500))
+    TASKS_BATCH_MAX_ITEMS = int(os.getenv('TASKS_BATCH_MAX_ITEMS', 1000))
+
+    # Bulk import / export over COPY (`/api/tasks/import`, `/api/tasks/export`,
+    # `flask tasks ...`): largest import body, and the statement timeout used
+    # instead of DB_STATEMENT_TIMEOUT_MS while a transfer runs
+    TASKS_IMPORT_MAX_BYTES = int(os.getenv('TASKS_IMPORT_MAX_BYTES', 100 * 1024 * 1024))
+    TASKS_TRANSFER_STATEMENT_TIMEOUT_MS = int(os.getenv('TASKS_TRANSFER_STATEMENT_TIMEOUT_MS', 600000))
+
+    # task_logs monthly partitions: how many future months `logs ensure-partitions`
+    # keeps ready, and how many past months `logs archive` leaves attached
+    TASK_LOGS_PARTITIONS_AHEAD = int(os.getenv('TASK_LOGS_PARTITIONS_AHEAD', 3))
+    TASK_LOGS_RETENTION_MONTHS = int(os.getenv('TASK_LOGS_RETENTION_MONTHS', 12))
+    TASK_LOGS_ARCHIVE_DIR = os.getenv('TASK_LOGS_ARCHIVE_DIR', 'archives/task_logs')
+
+    # Change feed (GET /api/events): keep-alive interval, how many missed events a
+    # reconnecting client may replay before it is told to resync, per-stream buffer
+    # and how long task_events rows are kept (`flask events prune`)
+    EVENTS_HEARTBEAT_SECONDS = float(os.getenv('EVENTS_HEARTBEAT_SECONDS', 15))
+    EVENTS_REPLAY_LIMIT = int(os.getenv('EVENTS_REPLAY_LIMIT', 1000))
+    EVENTS_SUBSCRIBER_QUEUE = int(os.getenv('EVENTS_SUBSCRIBER_QUEUE', 1000))
+    TASK_EVENTS_RETENTION_HOURS = int(os.getenv('TASK_EVENTS_RETENTION_HOURS', 72))
+
+    # Request metrics at /api/metrics (per process unless METRICS_MULTIPROC_DIR
+    # is shared by all workers) and the opt-in slow request profiler
+    METRICS_ENABLED = _env_bool('METRICS_ENABLED', True)
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR')
+    METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', 5))
+    PROFILE_SLOW_REQUEST_MS = int(os.getenv('PROFILE_SLOW_REQUEST_MS', 0))
+    PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', 5))
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+
+    # Per-route SQL statement budgets (@query_budget): `off`, `log` a report, or
+    # `raise` QueryBudgetExceeded; identical statements run more than
+    # QUERY_BUDGET_MAX_REPEATS times in one request are reported as N+1
+    QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'off')
+    QUERY_BUDGET_MAX_REPEATS = int(os.getenv('QUERY_BUDGET_MAX_REPEATS', 1))
+
+    # GET /api/dashboard/trends: longest date range and cache lifetime (the cache
+    # is also invalidated by every `flask analytics refresh`)
+    TRENDS_MAX_DAYS = int(os.getenv('TRENDS_MAX_DAYS', 366))
+    TRENDS_CACHE_TTL = int(os.getenv('TRENDS_CACHE_TTL', 300))
+
+    # Response compression for the task / dashboard APIs: bodies under
+    # COMPRESS_MIN_SIZE bytes are sent as-is; streamed lists are always compressed
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))
+
+    # Password hashing: hashes with another method/cost are upgraded on login.
+    # Verification runs in a per-worker process pool (0 workers = inline).
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    PASSWORD_POOL_WORKERS = int(os.getenv('PASSWORD_POOL_WORKERS', 2))
+    PASSWORD_POOL_MAX_PENDING = int(os.getenv('PASSWORD_POOL_MAX_PENDING', 8))
+    PASSWORD_VERIFY_TIMEOUT = float(os.getenv('PASSWORD_VERIFY_TIMEOUT', 5))
+    PASSWORD_POOL_RETRY_AFTER = int(os.getenv('PASSWORD_POOL_RETRY_AFTER', 1))
+
+    # Shared cache for multi-worker deployments; process-local when unset
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+    STATISTICS_CACHE_TTL = int(os.getenv('STATISTICS_CACHE_TTL', 30))
+
+    # Token-bucket rate limits (@rate_limit): each authenticated user has an
+    # `api` bucket that routes draw from by cost, and each client IP a `login`
+    # bucket. Buckets are per process unless RATE_LIMIT_REDIS_URL is set.
+    # RATE_LIMIT_TRUSTED_PROXIES = reverse proxies that append X-Forwarded-For
+    RATE_LIMIT_ENABLED = _env_bool('RATE_LIMIT_ENABLED', True)
+    RATE_LIMIT_REDIS_URL = os.getenv('RATE_LIMIT_REDIS_URL')
+    RATE_LIMIT_LOCAL_MAX_KEYS = int(os.getenv('RATE_LIMIT_LOCAL_MAX_KEYS', 10000))
+    RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv('RATE_LIMIT_TRUSTED_PROXIES', 0))
+    RATE_LIMIT_API_CAPACITY = float(os.getenv('RATE_LIMIT_API_CAPACITY', 120))
+    RATE_LIMIT_API_PER_SECOND = float(os.getenv('RATE_LIMIT_API_PER_SECOND', 10))
+    RATE_LIMIT_LOGIN_CAPACITY = float(os.getenv('RATE_LIMIT_LOGIN_CAPACITY', 10))
+    RATE_LIMIT_LOGIN_PER_SECOND = float(os.getenv('RATE_LIMIT_LOGIN_PER_SECOND', 0.2))
+
     CORS_ORIGINS = [
         "https://task-tracker-front-delta.vercel.app",
         "http://localhost:5173"
@@ -30,6 +141,9 @@ class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     TESTING = False
+    SQLALCHEMY_ECHO = _env_bool('SQLALCHEMY_ECHO', True)
+    QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'log')
+    DB_CREATE_ALL = _env_bool('DB_CREATE_ALL', True)
 
 class ProductionConfig(Config):
     """Production configuration"""
@@ -41,6 +155,10 @@ class TestingConfig(Config):
     DEBUG = True
     TESTING = True
     DB_NAME = 'task_tracker_test_db'
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 2))
+    QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'raise')
+    DB_CREATE_ALL = _env_bool('DB_CREATE_ALL', True)
+    RATE_LIMIT_ENABLED = _env_bool('RATE_LIMIT_ENABLED', False)
 
 config = {
     'development': DevelopmentConfig,
@@ -1,9 +1,15 @@
 from flask import Blueprint, request, jsonify
 from app.services.auth_service import AuthService
+from app.utils.password_utils import PasswordPoolSaturated
+from app.utils.jwt_utils import revoke_token, token_required
+from app.database.query_budget import query_budget
+from app.utils.rate_limit import rate_limit
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limit(1, bucket='login')
+@query_budget(2)
 def login():
     """Login endpoint"""
     data = request.get_json() or {}
@@ -31,8 +37,29 @@ def login():
             'data': result
         }), 200
 
+    except PasswordPoolSaturated as e:
+        response = jsonify({
+            'success': False,
+            'message': str(e)
+        })
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 503
+
     except Exception as e:
         return jsonify({
             'success': False,
             'message': f'Server error: {str(e)}'
         }), 500
+
+
+@auth_bp.route('/logout', methods=['POST'])
+@token_required
+@rate_limit(1)
+@query_budget(0)
+def logout():
+    """Revoke the request's token (in this worker process only; see TokenCache)"""
+    revoke_token(request.headers['Authorization'].partition(' ')[2])
+    return jsonify({
+        'success': True,
+        'message': 'Logout successful'
+    }), 200
@@ -1,19 +1,58 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, current_app, request
+from app.database.query_budget import query_budget
 from app.services.dashboard_service import DashboardService
+from app.services.task_analytics_service import TaskAnalyticsService, parse_trend_args
+from app.utils.cache import get_version
+from app.utils.http_cache import cached_json_response
 from app.utils.jwt_utils import token_required
+from app.utils.rate_limit import rate_limit
 
 dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
 
 @dashboard_bp.route('/statistics', methods=['GET'])
 @token_required
+@rate_limit(5)
+@query_budget(3)
 def get_statistics():
-    """Get dashboard statistics"""
+    """Get dashboard statistics.
+
+    Cached per tasks version (bumped by every task write) for at most
+    STATISTICS_CACHE_TTL seconds; supports ETag / If-None-Match revalidation.
+    """
     try:
-        stats = DashboardService.get_statistics()
+        return cached_json_response(
+            f"dashboard:statistics:v{get_version('tasks')}",
+            current_app.config['STATISTICS_CACHE_TTL'],
+            lambda: {'success': True, 'data': DashboardService.get_statistics()}
+        )
+    except Exception as e:
         return jsonify({
-            'success': True,
-            'data': stats
-        }), 200
+            'success': False,
+            'message': f'Server error: {str(e)}'
+        }), 500
+
+
+@dashboard_bp.route('/trends', methods=['GET'])
+@token_required
+@rate_limit(5)
+@query_budget(3)
+def get_trends():
+    """Tasks created / started / completed and average cycle time per day or week.
+
+    Query args: `from` / `to` (YYYY-MM-DD, inclusive; default the last 30 days),
+    `interval` (day or week) and `assigned_to`. Reads only the daily rollups
+    kept by `flask analytics refresh`; `refreshed_until` says how current they are.
+    """
+    try:
+        try:
+            start, end, interval, assigned_to = parse_trend_args(request.args, current_app.config['TRENDS_MAX_DAYS'])
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        return cached_json_response(
+            f"dashboard:trends:v{get_version('analytics')}:{start}:{end}:{interval}:{assigned_to or ''}",
+            current_app.config['TRENDS_CACHE_TTL'],
+            lambda: {'success': True, 'data': TaskAnalyticsService.get_trends(start, end, interval, assigned_to)}
+        )
     except Exception as e:
         return jsonify({
             'success': False,
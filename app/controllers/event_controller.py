@@ -0,0 +1,100 @@
+import json
+from flask import Blueprint, Response, request, jsonify, current_app
+from app.services.task_event_service import TaskEventService
+from app.utils.event_broker import SubscriptionOverflow, get_broker
+from app.utils.jwt_utils import authenticate_token
+
+event_bp = Blueprint('events', __name__, url_prefix='/api/events')
+
+# Client reconnect delay suggested to EventSource, in milliseconds
+RETRY_MS = 3000
+
+
+def _sse(event_id, event_type: str, data: dict) -> str:
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+def _reset(reason: str):
+    # Clients refetch their lists on `reset` and continue from its id
+    latest = TaskEventService.latest_id()
+    return latest, _sse(latest, 'reset', {'reason': reason})
+
+
+def _event_stream(subscription, last_event_id, heartbeat: float, replay_limit: int):
+    broker = get_broker()
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        cursor = last_event_id if last_event_id is not None else broker.last_id
+
+        oldest = TaskEventService.oldest_id()
+        replay = TaskEventService.get_events_after(cursor, limit=replay_limit + 1)
+        if (oldest is not None and cursor < oldest - 1) or len(replay) > replay_limit:
+            cursor, message = _reset('history_unavailable')
+            yield message
+            replay = []
+        for event in replay:
+            yield _sse(event.id, event.event_type, event.to_dict())
+            cursor = event.id
+
+        while True:
+            try:
+                event = subscription.get(timeout=heartbeat)
+            except SubscriptionOverflow:
+                # The stream ends; EventSource reconnects from the reset's id
+                yield _reset('client_too_slow')[1]
+                return
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            if event.id <= cursor:
+                continue
+            yield _sse(event.id, event.event_type, event.to_dict())
+            cursor = event.id
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@event_bp.route('', methods=['GET'])
+def stream_events():
+    """Server-Sent Events feed of task changes.
+
+    Event types: task.created, task.updated, task.status_changed, task.deleted
+    and reset (refetch, then continue). Resumes after the `Last-Event-ID`
+    header (sent by EventSource on reconnect) or `last_event_id` parameter.
+    EventSource cannot set headers, so the token may also be passed as
+    `access_token`. Each open stream holds a worker thread; run gunicorn
+    with a threaded or async worker class.
+    """
+    auth_header = request.headers.get('Authorization')
+    token = auth_header.partition(' ')[2] if auth_header else request.args.get('access_token')
+    if not token:
+        return jsonify({'success': False, 'message': 'Authentication token is missing'}), 401
+    try:
+        authenticate_token(token)
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 401
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    if last_event_id is not None:
+        try:
+            last_event_id = int(last_event_id)
+        except ValueError:
+            return jsonify({'success': False, 'message': 'last_event_id must be an integer'}), 400
+
+    try:
+        subscription = get_broker(current_app.config['EVENTS_SUBSCRIBER_QUEUE']).subscribe()
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Server error: {str(e)}'}), 500
+
+    response = Response(
+        _event_stream(
+            subscription,
+            last_event_id,
+            current_app.config['EVENTS_HEARTBEAT_SECONDS'],
+            current_app.config['EVENTS_REPLAY_LIMIT']
+        ),
+        mimetype='text/event-stream'
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
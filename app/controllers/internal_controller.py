@@ -0,0 +1,30 @@
+from flask import Blueprint, jsonify
+from app.database.db import get_engine
+from app.database.pool_stats import engine_pool_snapshot
+from app.database.replicas import get_replica_set
+from app.utils.jwt_utils import token_required
+
+internal_bp = Blueprint('internal', __name__, url_prefix='/api/internal')
+
+@internal_bp.route('/db-pool', methods=['GET'])
+@token_required
+def get_db_pool_stats():
+    """Connection pool counters for this worker process: the primary's at the top
+    level, and each read replica's (with its lag) under `replicas`"""
+    try:
+        data = engine_pool_snapshot(get_engine())
+        replica_set = get_replica_set()
+        if replica_set is not None:
+            data['replicas'] = [
+                {**replica, 'pool': engine_pool_snapshot(engine)}
+                for replica, engine in zip(replica_set.snapshot(), replica_set.engines)
+            ]
+        return jsonify({
+            'success': True,
+            'data': data
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Server error: {str(e)}'
+        }), 500
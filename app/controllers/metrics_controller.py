@@ -0,0 +1,25 @@
+import hmac
+from flask import Blueprint, Response, request, jsonify, current_app
+from app.utils.metrics import render_metrics
+
+metrics_bp = Blueprint('metrics', __name__, url_prefix='/api/metrics')
+
+@metrics_bp.route('', methods=['GET'])
+def get_metrics():
+    """Request latency, status, DB time and SQL count histograms in Prometheus text format.
+
+    Unauthenticated unless METRICS_TOKEN is set, in which case scrapers send
+    it as a bearer token.
+    """
+    expected = current_app.config.get('METRICS_TOKEN')
+    if expected:
+        token = (request.headers.get('Authorization') or '').partition(' ')[2]
+        if not hmac.compare_digest(token.encode(), expected.encode()):
+            return jsonify({'success': False, 'message': 'Invalid metrics token'}), 401
+    try:
+        return Response(render_metrics(current_app), mimetype='text/plain; version=0.0.4')
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Server error: {str(e)}'
+        }), 500
@@ -1,22 +1,154 @@
-from flask import Blueprint, request, jsonify
-from app.services.task_service import TaskService
-from app.services.task_log_service import TaskLogService
+from flask import Blueprint, request, jsonify, current_app, make_response, g
+from app.database.query_budget import query_budget
+from app.services.task_service import TaskService, TaskVersionConflict, encode_task_row
+from app.services.task_log_service import TaskLogService, encode_task_log_row
+from app.services.task_transfer_service import TaskTransferService, TaskImportTooLarge, TRANSFER_FORMATS
+from app.database.session import get_session
+from app.utils.http_cache import make_etag, is_not_modified, not_modified, set_validators
 from app.utils.jwt_utils import token_required
+from app.utils.rate_limit import rate_limit
+from app.utils.serialization import json_response
+from app.utils.streaming import stream_json_list
 
 task_bp = Blueprint('tasks', __name__, url_prefix='/api/tasks')
 
 
+def _wants_stream() -> bool:
+    return request.args.get('stream', '').lower() in ('1', 'true')
+
+
+def _list_cost() -> int:
+    # A page is bounded by TASKS_PAGE_MAX_LIMIT; the full list is not
+    return 1 if 'limit' in request.args or 'cursor' in request.args else 10
+
+
+TRANSFER_MIMETYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+
+def _transfer_format() -> str:
+    """`format` query arg, else the body's Content-Type (imports), else csv"""
+    if request.args.get('format'):
+        return request.args['format']
+    for fmt, mimetype in TRANSFER_MIMETYPES.items():
+        if request.mimetype == mimetype:
+            return fmt
+    return 'csv'
+
+
+def _export_response(rows, fmt: str, filename: str):
+    response = current_app.response_class(iter(rows), mimetype=TRANSFER_MIMETYPES[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    return response
+
+
 @task_bp.route('', methods=['GET'])
 @token_required
+@rate_limit(_list_cost)
+@query_budget(2)
 def get_tasks():
-    """Get all tasks with optional filters"""
+    """Get all tasks with optional filters.
+
+    Passing `limit` and/or `cursor` switches to keyset pagination; the response
+    then carries `pagination.next_cursor` for fetching the following page.
+    Passing `stream=1` instead streams the full list as it is read from the database.
+    Responses carry an ETag: a page's is derived from its own rows, the full
+    list's from the collection version (see TaskService.get_collection_version).
+    """
     try:
         status = request.args.get('status')
         assigned_to = request.args.get('assigned_to')
-        tasks = TaskService.get_all_tasks(status=status, assigned_to=assigned_to)
+        if 'limit' in request.args or 'cursor' in request.args:
+            return _tasks_page(status, assigned_to)
+
+        version = TaskService.get_collection_version(assigned_to=assigned_to)
+        etag = make_etag('tasks', sorted(request.args.items(multi=True)), version)
+        if is_not_modified(etag):
+            return not_modified(etag)
+
+        response = make_response(_list_tasks(status, assigned_to))
+        set_validators(response, etag)
+        return response
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
+
+
+def _tasks_page(status, assigned_to):
+    try:
+        limit = int(request.args.get('limit', current_app.config['TASKS_PAGE_DEFAULT_LIMIT']))
+    except ValueError:
+        return jsonify({"success": False, "message": "limit must be an integer"}), 400
+    limit = max(1, min(limit, current_app.config['TASKS_PAGE_MAX_LIMIT']))
+    try:
+        rows, next_cursor = TaskService.get_tasks_page(
+            status=status, assigned_to=assigned_to, limit=limit, cursor=request.args.get('cursor')
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    # Keyset pages are small: versioning them by their rows avoids an
+    # aggregate over the whole filter on every page
+    etag = make_etag(
+        'tasks-page', sorted(request.args.items(multi=True)),
+        [(row.id, row.version) for row in rows], next_cursor
+    )
+    if is_not_modified(etag):
+        return not_modified(etag)
+    response = json_response({
+        "success": True,
+        "data": [encode_task_row(row) for row in rows],
+        "pagination": {"limit": limit, "next_cursor": next_cursor}
+    })
+    set_validators(response, etag)
+    return response
+
+
+def _list_tasks(status, assigned_to):
+    if _wants_stream():
+        rows = TaskService.iter_tasks(
+            status=status, assigned_to=assigned_to, batch_size=current_app.config['STREAM_BATCH_SIZE']
+        )
+        return stream_json_list(rows, encode_task_row)
+
+    rows = TaskService.get_all_tasks(status=status, assigned_to=assigned_to)
+    return json_response({
+        "success": True,
+        "data": [encode_task_row(row) for row in rows]
+    })
+
+
+@task_bp.route('/search', methods=['GET'])
+@token_required
+@rate_limit(2)
+@query_budget(1)
+def search_tasks():
+    """Full-text search over title and description.
+
+    `q` terms are prefix-matched ("desa lan" finds "Desain Landing Page") and
+    results are ranked, best first; `status` / `assigned_to` narrow them and
+    `limit` / `offset` page through them.
+    """
+    try:
+        q = (request.args.get('q') or '').strip()
+        if not q:
+            return jsonify({"success": False, "message": "q is required"}), 400
+        try:
+            limit = int(request.args.get('limit', current_app.config['TASKS_PAGE_DEFAULT_LIMIT']))
+            offset = int(request.args.get('offset', 0))
+        except ValueError:
+            return jsonify({"success": False, "message": "limit and offset must be integers"}), 400
+        limit = max(1, min(limit, current_app.config['TASKS_PAGE_MAX_LIMIT']))
+        offset = max(0, offset)
+        try:
+            results, has_more = TaskService.search_tasks(
+                q, status=request.args.get('status'), assigned_to=request.args.get('assigned_to'),
+                limit=limit, offset=offset
+            )
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
         return jsonify({
             "success": True,
-            "data": [task.to_dict() for task in tasks]
+            "data": [{**task.to_dict(), "rank": rank} for task, rank in results],
+            "pagination": {"limit": limit, "offset": offset, "next_offset": offset + limit if has_more else None}
         }), 200
     except Exception as e:
         return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
@@ -24,37 +156,168 @@ def get_tasks():
 
 @task_bp.route('/<int:task_id>', methods=['GET'])
 @token_required
+@rate_limit(1)
+@query_budget(2)
 def get_task(task_id):
+    """Get one task; supports If-None-Match / If-Modified-Since revalidation"""
     try:
+        stamp = TaskService.get_task_stamp(task_id)
+        if stamp is None:
+            return jsonify({"success": False, "message": "Task not found"}), 404
+        etag = make_etag('task', task_id, stamp.version)
+        if is_not_modified(etag, stamp.updated_at):
+            return not_modified(etag)
+
         task = TaskService.get_task_by_id(task_id)
         if not task:
             return jsonify({"success": False, "message": "Task not found"}), 404
-        return jsonify({"success": True, "data": task.to_dict()}), 200
+        response = jsonify({"success": True, "data": task.to_dict()})
+        set_validators(response, make_etag('task', task.id, task.version), task.updated_at)
+        return response, 200
     except Exception as e:
         return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
 
 
 @task_bp.route('', methods=['POST'])
 @token_required
+@rate_limit(2)
+@query_budget(4)
 def create_task():
     try:
         data = request.get_json()
-        user_id = request.current_user['user_id']
+        user_id = g.current_user.user_id
         if not data.get('title') or not data.get('assigned_to'):
             return jsonify({"success": False, "message": "Title and assigned_to are required"}), 400
-        task = TaskService.create_task(data, user_id)
+        if not isinstance(data['assigned_to'], str):
+            return jsonify({"success": False, "message": "assigned_to must be a non-blank string"}), 400
+        try:
+            task = TaskService.create_task(data, user_id)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
         return jsonify({"success": True, "message": "Task created successfully", "data": task.to_dict()}), 201
     except Exception as e:
         return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
 
 
+@task_bp.route('/batch', methods=['POST'])
+@token_required
+@rate_limit(10)
+@query_budget(8)
+def batch_tasks():
+    """Create, update and delete many tasks in one transaction.
+
+    Body: {"create": [task, ...], "update": [{"id": ..., ...}, ...], "delete": [id, ...]}
+    Returns per-item results under data.create / data.update / data.delete.
+    """
+    try:
+        data = request.get_json() or {}
+        user_id = g.current_user.user_id
+        creates = data.get('create') or []
+        updates = data.get('update') or []
+        deletes = data.get('delete') or []
+        if not all(isinstance(items, list) for items in (creates, updates, deletes)):
+            return jsonify({"success": False, "message": "create, update and delete must be arrays"}), 400
+        if not all(isinstance(item, dict) for item in creates + updates):
+            return jsonify({"success": False, "message": "create and update items must be objects"}), 400
+        if len(creates) + len(updates) + len(deletes) > current_app.config['TASKS_BATCH_MAX_ITEMS']:
+            return jsonify({
+                "success": False,
+                "message": f"Batch is limited to {current_app.config['TASKS_BATCH_MAX_ITEMS']} items"
+            }), 400
+        results = TaskService.apply_batch(creates, updates, deletes, user_id)
+        return jsonify({"success": True, "message": "Batch applied", "data": results}), 200
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
+
+
+@task_bp.route('/import', methods=['POST'])
+@token_required
+@rate_limit(30)
+@query_budget(6)
+def import_tasks():
+    """Create tasks in bulk from a CSV (with header) or NDJSON body.
+
+    The format comes from `format` or the Content-Type (text/csv,
+    application/x-ndjson). The body is streamed into Postgres with COPY; the
+    import is all-or-nothing and reports the first invalid row.
+    """
+    try:
+        fmt = _transfer_format()
+        if fmt not in TRANSFER_FORMATS:
+            return jsonify({"success": False, "message": f"format must be one of: {', '.join(TRANSFER_FORMATS)}"}), 400
+        max_bytes = current_app.config['TASKS_IMPORT_MAX_BYTES']
+        if request.content_length is not None and request.content_length > max_bytes:
+            return jsonify({"success": False, "message": f"Import is limited to {max_bytes} bytes"}), 413
+        try:
+            result = TaskTransferService.import_tasks(
+                get_session(), request.stream, fmt, user_id=g.current_user.user_id, max_bytes=max_bytes,
+                statement_timeout_ms=current_app.config['TASKS_TRANSFER_STATEMENT_TIMEOUT_MS']
+            )
+        except TaskImportTooLarge as e:
+            return jsonify({"success": False, "message": str(e)}), 413
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        return jsonify({"success": True, "message": f"{result['imported']} task(s) imported", "data": result}), 201
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
+
+
+@task_bp.route('/export', methods=['GET'])
+@token_required
+@rate_limit(30)
+@query_budget(0)
+def export_tasks():
+    """Stream every task (filtered by `status` / `assigned_to`) as CSV or NDJSON (`format`)"""
+    try:
+        fmt = _transfer_format()
+        if fmt not in TRANSFER_FORMATS:
+            return jsonify({"success": False, "message": f"format must be one of: {', '.join(TRANSFER_FORMATS)}"}), 400
+        rows = TaskTransferService.export_tasks(
+            fmt, status=request.args.get('status'), assigned_to=request.args.get('assigned_to'),
+            statement_timeout_ms=current_app.config['TASKS_TRANSFER_STATEMENT_TIMEOUT_MS']
+        )
+        return _export_response(rows, fmt, 'tasks')
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
+
+
+@task_bp.route('/export/logs', methods=['GET'])
+@token_required
+@rate_limit(30)
+@query_budget(0)
+def export_task_logs():
+    """Stream the status history of all tasks (or of `task_id`) as CSV or NDJSON (`format`)"""
+    try:
+        fmt = _transfer_format()
+        if fmt not in TRANSFER_FORMATS:
+            return jsonify({"success": False, "message": f"format must be one of: {', '.join(TRANSFER_FORMATS)}"}), 400
+        task_id = request.args.get('task_id', type=int)
+        rows = TaskTransferService.export_logs(
+            fmt, task_id=task_id, statement_timeout_ms=current_app.config['TASKS_TRANSFER_STATEMENT_TIMEOUT_MS']
+        )
+        return _export_response(rows, fmt, 'task_logs')
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
+
+
 @task_bp.route('/<int:task_id>', methods=['PUT'])
 @token_required
+@rate_limit(2)
+@query_budget(3)
 def update_task(task_id):
+    """Update a task; pass the `version` last read to reject concurrent edits with 409"""
     try:
         data = request.get_json()
-        user_id = request.current_user['user_id']
-        task = TaskService.update_task(task_id, data, user_id)
+        user_id = g.current_user.user_id
+        expected_version = data.get('version')
+        if expected_version is not None and (isinstance(expected_version, bool) or not isinstance(expected_version, int)):
+            return jsonify({"success": False, "message": "version must be an integer"}), 400
+        try:
+            task = TaskService.update_task(task_id, data, user_id, expected_version=expected_version)
+        except TaskVersionConflict as e:
+            return jsonify({"success": False, "message": str(e), "current_version": e.current_version}), 409
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
         if not task:
             return jsonify({"success": False, "message": "Task not found"}), 404
         return jsonify({"success": True, "message": "Task updated successfully", "data": task.to_dict()}), 200
@@ -64,6 +327,8 @@ def update_task(task_id):
 
 @task_bp.route('/<int:task_id>', methods=['DELETE'])
 @token_required
+@rate_limit(2)
+@query_budget(3)
 def delete_task(task_id):
     try:
         success = TaskService.delete_task(task_id)
@@ -76,9 +341,33 @@ def delete_task(task_id):
 
 @task_bp.route('/<int:task_id>/logs', methods=['GET'])
 @token_required
+@rate_limit(1)
+@query_budget(1)
 def get_task_logs(task_id):
+    """Get a task's status history, newest first.
+
+    `limit` / `cursor` page through it like GET /api/tasks; `stream=1` streams it.
+    """
     try:
-        logs = TaskLogService.get_logs_by_task(task_id)
-        return jsonify({"success": True, "data": [log.to_dict() for log in logs]}), 200
+        if 'limit' in request.args or 'cursor' in request.args:
+            try:
+                limit = int(request.args.get('limit', current_app.config['TASKS_PAGE_DEFAULT_LIMIT']))
+            except ValueError:
+                return jsonify({"success": False, "message": "limit must be an integer"}), 400
+            limit = max(1, min(limit, current_app.config['TASKS_PAGE_MAX_LIMIT']))
+            try:
+                rows, next_cursor = TaskLogService.get_logs_page(task_id, limit=limit, cursor=request.args.get('cursor'))
+            except ValueError as e:
+                return jsonify({"success": False, "message": str(e)}), 400
+            return json_response({
+                "success": True,
+                "data": [encode_task_log_row(row) for row in rows],
+                "pagination": {"limit": limit, "next_cursor": next_cursor}
+            })
+        if _wants_stream():
+            rows = TaskLogService.iter_logs_by_task(task_id, batch_size=current_app.config['STREAM_BATCH_SIZE'])
+            return stream_json_list(rows, encode_task_log_row)
+        rows = TaskLogService.get_logs_by_task(task_id)
+        return json_response({"success": True, "data": [encode_task_log_row(row) for row in rows]})
     except Exception as e:
         return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
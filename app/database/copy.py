@@ -0,0 +1,161 @@
+import queue
+import threading
+from typing import Iterator, Optional
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.database.db import get_engine
+
+_DONE = object()
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class _Source:
+    """Keeps the exception raised by the wrapped reader, which psycopg2 would
+    otherwise only report as the message of a QueryCanceled"""
+
+    def __init__(self, source):
+        self._source = source
+        self.error = None
+
+    def read(self, size: int = -1):
+        try:
+            return self._source.read(size)
+        except Exception as e:
+            self.error = e
+            raise
+
+
+def copy_in(session: Session, sql: str, source, chunk_size: int = 65536) -> int:
+    """Run `COPY ... FROM STDIN` on the session's connection, reading `source` in chunks.
+
+    `source` is any object with read(size) returning bytes; an exception it
+    raises aborts the COPY and is re-raised as is. The COPY joins the
+    session's transaction. Returns the number of rows copied.
+    """
+    wrapped = _Source(source)
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(sql, wrapped, size=chunk_size)
+        return cursor.rowcount
+    except Exception:
+        if wrapped.error is not None:
+            raise wrapped.error from None
+        raise
+    finally:
+        cursor.close()
+
+
+def render(statement) -> str:
+    """Compile a Core select with its parameters inlined, for COPY (query), which takes no bind parameters"""
+    return str(statement.compile(dialect=get_engine().dialect, compile_kwargs={'literal_binds': True}))
+
+
+class _QueueWriter:
+    """File-like target for COPY TO: buffers rows and hands full chunks to the consumer"""
+
+    def __init__(self, chunks: queue.Queue, cancelled: threading.Event, chunk_size: int):
+        self._chunks = chunks
+        self._cancelled = cancelled
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+
+    def write(self, data) -> None:
+        self._buffer += data.encode() if isinstance(data, str) else data
+        if len(self._buffer) >= self._chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def put(self, item) -> None:
+        # Blocks while the consumer is behind (so memory stays bounded), but
+        # gives up once it has stopped reading
+        while True:
+            if self._cancelled.is_set():
+                raise _Cancelled()
+            try:
+                self._chunks.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+
+class CopyOut:
+    """Stream the output of `COPY (...) TO STDOUT` as byte chunks of about `chunk_size`.
+
+    psycopg2 pushes COPY output into a file object, so the COPY runs on a
+    worker thread with its own pooled connection and hands chunks over through
+    a bounded queue: at most `queue_size` chunks are buffered whatever the
+    table size. Closing the iterator early (e.g. the client disconnected)
+    aborts the COPY and discards its connection. `rows` holds the row count
+    once the iteration has finished. `engine` defaults to the primary.
+    """
+
+    def __init__(self, sql: str, chunk_size: int = 65536, queue_size: int = 8,
+                 statement_timeout_ms: Optional[int] = None, engine: Optional[Engine] = None):
+        self.sql = sql
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.statement_timeout_ms = statement_timeout_ms
+        self.rows: Optional[int] = None
+
+    def _run(self, chunks: queue.Queue, cancelled: threading.Event, running: dict) -> None:
+        writer = _QueueWriter(chunks, cancelled, self.chunk_size)
+        try:
+            with (self.engine or get_engine()).connect() as connection:
+                with running['lock']:
+                    running['connection'] = connection.connection.dbapi_connection
+                cursor = connection.connection.cursor()
+                try:
+                    if self.statement_timeout_ms is not None:
+                        cursor.execute("SET LOCAL statement_timeout = %s", (self.statement_timeout_ms,))
+                    cursor.copy_expert(self.sql, writer, size=self.chunk_size)
+                    self.rows = cursor.rowcount
+                except BaseException:
+                    # The connection may still be mid-COPY; never return it to the pool
+                    connection.invalidate()
+                    raise
+                finally:
+                    cursor.close()
+                    # Released before the connection goes back to the pool, so
+                    # a late cancel() can never hit another request's query
+                    with running['lock']:
+                        running.pop('connection', None)
+                connection.rollback()
+            writer.flush()
+            writer.put(_DONE)
+        except _Cancelled:
+            pass
+        except BaseException as e:
+            try:
+                writer.put(e)
+            except _Cancelled:
+                pass
+
+    def __iter__(self) -> Iterator[bytes]:
+        chunks = queue.Queue(maxsize=self.queue_size)
+        cancelled = threading.Event()
+        running = {'lock': threading.Lock()}
+        worker = threading.Thread(target=self._run, args=(chunks, cancelled, running), daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = chunks.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+            with running['lock']:
+                if 'connection' in running:
+                    # Interrupts a query that has not produced its next row yet
+                    running['connection'].cancel()
+            worker.join()
@@ -1,8 +1,73 @@
+import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from app.config import Config
+from app.config import config
+from app.database.pool_stats import InstrumentedQueuePool, instrument
 
-DATABASE_URL = f"postgresql://{Config.DB_USER}:{Config.DB_PASSWORD}@{Config.DB_HOST}:{Config.DB_PORT}/{Config.DB_NAME}"
-engine = create_engine(DATABASE_URL, echo=True)
+
+def build_engine(conf, url=None):
+    """Create an engine from a Config class's DB_* and pool settings (for `url`, a replica, if given)"""
+    settings = conf()
+    connect_args = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args['options'] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    if url is not None:
+        # An unreachable replica must fail fast: reads fall back to the primary
+        connect_args['connect_timeout'] = settings.DB_REPLICA_CONNECT_TIMEOUT
+    return instrument(create_engine(
+        url or settings.DATABASE_URL,
+        echo=settings.SQLALCHEMY_ECHO,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+        # values_plus_batch also pages executemany UPDATE/DELETE into few round trips (bulk task writes)
+        executemany_mode='values_plus_batch'
+    ))
+
+
+# Built for the FLASK_ENV configuration at import; create_app rebuilds it if
+# the app is created with a different one.
+_engine_config = config.get(os.getenv('FLASK_ENV', 'production'), config['default'])
+engine = build_engine(_engine_config)
+replica_engines = [build_engine(_engine_config, url) for url in _engine_config.DB_REPLICA_URLS]
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
 Base = declarative_base()
+
+
+def get_engine():
+    """Return the engine currently bound to SessionLocal"""
+    return engine
+
+
+def get_replica_engines():
+    """Engines for DB_REPLICA_URLS (empty without replicas); see app.database.replicas"""
+    return replica_engines
+
+
+def configure_engine(conf):
+    """Bind SessionLocal to an engine built for `conf`, replacing the import-time one"""
+    global engine, replica_engines, _engine_config
+    if conf is not _engine_config:
+        for old in [engine, *replica_engines]:
+            old.dispose()
+        engine = build_engine(conf)
+        replica_engines = [build_engine(conf, url) for url in conf.DB_REPLICA_URLS]
+        _engine_config = conf
+        SessionLocal.configure(bind=engine)
+    return engine
+
+
+def _reset_pool_after_fork():
+    # A forked child (gunicorn --preload) inherits the parent's pooled
+    # connections; sharing their sockets would interleave both processes'
+    # traffic, so the child forgets them without closing them
+    for inherited in [engine, *replica_engines]:
+        inherited.dispose(close=False)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pool_after_fork)
@@ -0,0 +1,113 @@
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats:
+    """Connection pool counters of one engine in this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+
+    def incr(self, name: str, amount=1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def observe_usage(self, pool: QueuePool) -> None:
+        with self._lock:
+            self.peak_checked_out = max(self.peak_checked_out, pool.checkedout())
+            self.peak_overflow = max(self.peak_overflow, pool.overflow())
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            data = {
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'invalidations': self.invalidations,
+                'waits': self.waits,
+                'wait_seconds_total': round(self.wait_seconds, 6),
+                'timeouts': self.timeouts,
+                'peak_checked_out': self.peak_checked_out,
+                'peak_overflow': max(self.peak_overflow, 0)
+            }
+        if isinstance(pool, QueuePool):
+            data.update({
+                'pool_size': pool.size(),
+                'max_overflow': pool._max_overflow,
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0)
+            })
+        return data
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how often and how long checkouts wait for a free connection.
+
+    Counters go to the pool's own `stats`, which carries over when the engine
+    recreates the pool (dispose), so they accumulate per engine.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        # A checkout blocks only when no idle connection is left and overflow is exhausted
+        will_wait = (
+            self._max_overflow > -1
+            and self.checkedin() == 0
+            and self.overflow() >= self._max_overflow
+        )
+        if not will_wait:
+            record = super()._do_get()
+        else:
+            start = time.perf_counter()
+            try:
+                record = super()._do_get()
+            except exc.TimeoutError:
+                self.stats.incr('timeouts')
+                raise
+            finally:
+                self.stats.incr('waits')
+                self.stats.incr('wait_seconds', time.perf_counter() - start)
+        self.stats.observe_usage(self)
+        return record
+
+
+def instrument(engine: Engine) -> Engine:
+    """Count `engine`'s connects, checkouts, checkins and invalidations in its pool's stats.
+
+    Registered per engine (the pool events do not say which pool fired);
+    engine.pool is looked up on each event, so recreated pools keep counting.
+    """
+    def incr(name):
+        return lambda *args: engine.pool.stats.incr(name)
+
+    event.listen(engine, 'connect', incr('connects'))
+    event.listen(engine, 'checkout', incr('checkouts'))
+    event.listen(engine, 'checkin', incr('checkins'))
+    event.listen(engine, 'invalidate', incr('invalidations'))
+    return engine
+
+
+def engine_pool_snapshot(engine: Engine) -> dict:
+    pool = engine.pool
+    return pool.stats.snapshot(pool) if isinstance(pool, InstrumentedQueuePool) else {}
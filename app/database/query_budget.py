@@ -0,0 +1,94 @@
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+from flask import current_app, has_app_context, has_request_context, request
+from app.config import Config
+from app.database.query_stats import QueryStats, track_queries
+
+logger = logging.getLogger(__name__)
+
+# Expanded IN lists and multi-row VALUES render one placeholder group per value;
+# fold them so the same query with a different number of rows still counts as a repeat
+_PLACEHOLDER_LIST = re.compile(r'\(\s*%\(\w+\)s(?:\s*,\s*%\(\w+\)s)*\s*\)')
+_VALUES_LIST = re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in QUERY_BUDGET_MODE=raise when a block runs too many (or repeated) statements"""
+
+    def __init__(self, report: str):
+        super().__init__(report)
+        self.report = report
+
+
+def _setting(name: str):
+    if has_app_context():
+        return current_app.config.get(name, getattr(Config, name))
+    return getattr(Config, name)
+
+
+def normalize_statement(statement: str) -> str:
+    folded = _PLACEHOLDER_LIST.sub('(...)', _WHITESPACE.sub(' ', statement).strip())
+    return _VALUES_LIST.sub('(...)', folded)
+
+
+def repeated_statements(stats: QueryStats, max_repeats: int) -> List[Tuple[str, int]]:
+    """Statements executed more than `max_repeats` times, most repeated first.
+
+    The same SQL text with different parameters, run once per row of an earlier
+    result, is the signature of an N+1 lazy load.
+    """
+    counts = Counter(normalize_statement(statement) for statement, _ in stats.statements or ())
+    return [(statement, count) for statement, count in counts.most_common() if count > max_repeats]
+
+
+def format_report(label: str, stats: QueryStats, max_statements: int, repeats: List[Tuple[str, int]]) -> str:
+    lines = [
+        f"Query budget exceeded in {label}: {stats.count} statements "
+        f"(budget {max_statements}), {stats.seconds * 1000:.1f}ms in the database"
+    ]
+    if repeats:
+        lines.append('Repeated statements (likely N+1):')
+        lines.extend(f"  {count}x {statement}" for statement, count in repeats)
+    lines.append('Statements:')
+    lines.extend(
+        f"  {index}. [{seconds * 1000:.1f}ms] {normalize_statement(statement)}"
+        for index, (statement, seconds) in enumerate(stats.statements or (), start=1)
+    )
+    return '\n'.join(lines)
+
+
+@contextmanager
+def query_budget(
+    max_statements: int, max_repeats: Optional[int] = None, label: Optional[str] = None
+) -> Iterator[Optional[QueryStats]]:
+    """Check that a block or function runs at most `max_statements` SQL statements.
+
+    Also fails when any one statement runs more than `max_repeats` times
+    (QUERY_BUDGET_MAX_REPEATS by default). Usable as a context manager or a
+    decorator. QUERY_BUDGET_MODE decides what a violation does: `raise`
+    QueryBudgetExceeded (testing), `log` a warning with the report
+    (development), or `off`, which skips tracking entirely.
+    """
+    mode = _setting('QUERY_BUDGET_MODE')
+    if mode not in ('log', 'raise'):
+        yield None
+        return
+
+    if max_repeats is None:
+        max_repeats = _setting('QUERY_BUDGET_MAX_REPEATS')
+    with track_queries(record_statements=True) as stats:
+        yield stats
+
+    repeats = repeated_statements(stats, max_repeats)
+    if stats.count <= max_statements and not repeats:
+        return
+    if label is None:
+        label = request.endpoint if has_request_context() and request.endpoint else 'block'
+    report = format_report(label, stats, max_statements, repeats)
+    if mode == 'raise':
+        raise QueryBudgetExceeded(report)
+    logger.warning(report)
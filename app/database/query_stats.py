@@ -0,0 +1,83 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryStats:
+    """Statement count and DB time accumulated while it is being tracked"""
+
+    __slots__ = ('count', 'seconds', 'statements')
+
+    def __init__(self, record_statements: bool = False):
+        self.count = 0
+        self.seconds = 0.0
+        # (SQL text, seconds) per statement, only when asked for
+        self.statements: Optional[List[Tuple[str, float]]] = [] if record_statements else None
+
+
+# Trackers active in the current thread / task; nested tracking counts in each
+_active: ContextVar[Tuple[QueryStats, ...]] = ContextVar('query_stats', default=())
+
+
+def begin_tracking(record_statements: bool = False) -> Tuple[QueryStats, Token]:
+    """Start counting statements in the current context; pass the token to end_tracking"""
+    stats = QueryStats(record_statements)
+    return stats, _active.set(_active.get() + (stats,))
+
+
+def end_tracking(token: Token) -> None:
+    _active.reset(token)
+
+
+@contextmanager
+def track_queries(record_statements: bool = False) -> Iterator[QueryStats]:
+    """Count the SQL statements executed in the current context while the block runs"""
+    stats, token = begin_tracking(record_statements)
+    try:
+        yield stats
+    finally:
+        end_tracking(token)
+
+
+@contextmanager
+def untracked() -> Iterator[None]:
+    """Run housekeeping statements (e.g. replica lag checks) without counting
+    them against the request's trackers"""
+    token = _active.set(())
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+# Registered on the Engine class so engines rebuilt by configure_engine, and the
+# sync engine behind the async app, are covered without re-registration
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active.get():
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trackers = _active.get()
+    starts = conn.info.get('query_start')
+    if not trackers or not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    for stats in trackers:
+        stats.count += 1
+        stats.seconds += elapsed
+        if stats.statements is not None:
+            stats.statements.append((statement, elapsed))
+
+
+@event.listens_for(Engine, 'handle_error')
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('query_start'):
+        connection.info['query_start'].pop()
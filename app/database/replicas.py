@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+from typing import List, Optional
+from flask import g, has_request_context, request
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.config import Config
+from app.database.db import get_replica_engines
+from app.database.query_stats import untracked
+from app.utils.cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Seconds since the last replayed transaction, or 0 when the replica has
+# replayed everything it received (an idle primary sends nothing to replay).
+# That only holds while the WAL receiver is streaming: a disconnected replica
+# has replayed all it received and still falls behind, so it reports NULL,
+# which counts as too far behind. (Unless the replica's database user has
+# pg_read_all_stats, pg_stat_wal_receiver hides the status and the replica
+# is never used.)
+_LAG_QUERY = text("""
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
+""")
+
+
+class _Replica:
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.lag: Optional[float] = None
+        self.checked_at = float('-inf')
+        self.lock = threading.Lock()
+
+
+class ReplicaSet:
+    """Round-robin over the replicas whose last measured lag is within `max_lag`.
+
+    Lag is measured lazily, at most every `check_interval` seconds per replica
+    and process, by the request that finds the measurement stale; concurrent
+    requests keep using the previous value meanwhile. An unreachable replica
+    counts as lagging until a later check succeeds.
+    """
+
+    def __init__(self, engines: List[Engine], max_lag: float, check_interval: float):
+        self.engines = engines
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._replicas = [_Replica(engine) for engine in engines]
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def choose(self) -> Optional[Engine]:
+        """A replica fresh enough to read from, or None to use the primary"""
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self._replicas)
+        for offset in range(len(self._replicas)):
+            replica = self._replicas[(start + offset) % len(self._replicas)]
+            if self._is_fresh(replica):
+                return replica.engine
+        return None
+
+    def _is_fresh(self, replica: _Replica) -> bool:
+        if time.monotonic() - replica.checked_at >= self.check_interval and replica.lock.acquire(blocking=False):
+            try:
+                replica.lag = self._measure(replica.engine)
+                replica.checked_at = time.monotonic()
+            finally:
+                replica.lock.release()
+        return replica.lag is not None and replica.lag <= self.max_lag
+
+    @staticmethod
+    def _measure(engine: Engine) -> Optional[float]:
+        try:
+            with untracked(), engine.connect() as connection:
+                lag = connection.scalar(_LAG_QUERY)
+        except Exception as e:
+            logger.warning('Replica %s unavailable: %s', engine.url.render_as_string(hide_password=True), e)
+            return None
+        if lag is None:
+            logger.warning('Replica %s is not streaming from the primary (or its user lacks pg_read_all_stats)',
+                           engine.url.render_as_string(hide_password=True))
+            return None
+        return float(lag)
+
+    def snapshot(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {
+                'url': replica.engine.url.render_as_string(hide_password=True),
+                'lag_seconds': replica.lag,
+                'fresh': replica.lag is not None and replica.lag <= self.max_lag,
+                'checked_seconds_ago': round(now - replica.checked_at, 1) if replica.checked_at > float('-inf') else None,
+            }
+            for replica in self._replicas
+        ]
+
+
+_replica_set: Optional[ReplicaSet] = None
+_replica_set_lock = threading.Lock()
+
+
+def get_replica_set() -> Optional[ReplicaSet]:
+    """The ReplicaSet for the current replica engines, or None without DB_REPLICA_URLS"""
+    global _replica_set
+    engines = get_replica_engines()
+    if not engines:
+        return None
+    if _replica_set is None or _replica_set.engines is not engines:
+        with _replica_set_lock:
+            if _replica_set is None or _replica_set.engines is not engines:
+                _replica_set = ReplicaSet(
+                    engines, Config.DB_REPLICA_MAX_LAG_SECONDS, Config.DB_REPLICA_LAG_CHECK_SECONDS
+                )
+    return _replica_set
+
+
+def _sticky_key(user_id: int) -> str:
+    return f"replica:sticky:{user_id}"
+
+
+def mark_written() -> None:
+    """Keep the current user's reads on the primary for DB_REPLICA_STICKY_SECONDS.
+
+    Stored in the shared cache, so with CACHE_REDIS_URL it holds across workers.
+    """
+    user = g.get('current_user')
+    if user is None or not get_replica_engines():
+        return
+    get_cache().set(_sticky_key(user.user_id), True, Config.DB_REPLICA_STICKY_SECONDS)
+
+
+def read_engine() -> Optional[Engine]:
+    """Replica engine for the current request's read-only calls, or None for the primary.
+
+    Only GET / HEAD / OPTIONS requests read from replicas (a write request
+    reads its own writes on the primary), and not for a user who wrote recently.
+    """
+    replica_set = get_replica_set()
+    if replica_set is None or not has_request_context() or request.method not in SAFE_METHODS:
+        return None
+    user = g.get('current_user')
+    if user is not None and get_cache().get(_sticky_key(user.user_id)) is not None:
+        return None
+    return replica_set.choose()
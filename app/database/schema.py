@@ -0,0 +1,95 @@
+import os
+import re
+from typing import List
+from sqlalchemy import inspect, text
+from app.database.db import get_engine
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'migrations')
+SCHEMA_FILE = 'schema.sql'
+
+_MIGRATION_NAME = re.compile(r'^\d{3}_.+\.sql$')
+_STATEMENT_END = re.compile(r';[ \t]*(?:\n|$)')
+
+_CREATE_TRACKING_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    name VARCHAR(200) PRIMARY KEY,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def migration_files() -> List[str]:
+    """Names of the numbered upgrade scripts in migrations/, in order"""
+    return sorted(name for name in os.listdir(MIGRATIONS_DIR) if _MIGRATION_NAME.match(name))
+
+
+def read_sql(name: str) -> str:
+    with open(os.path.join(MIGRATIONS_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def header_notes(sql: str) -> List[str]:
+    """The leading comment block of a script (its operator instructions)"""
+    notes = []
+    for line in sql.splitlines():
+        if not line.startswith('--'):
+            break
+        notes.append(line[2:].strip())
+    return notes
+
+
+def _statements(sql: str) -> List[str]:
+    # Only used for scripts without function bodies: a semicolon that ends a
+    # line ends a statement
+    lines = [line for line in sql.splitlines() if not line.lstrip().startswith('--')]
+    return [stmt.strip() for stmt in _STATEMENT_END.split('\n'.join(lines)) if stmt.strip()]
+
+
+def run_script(sql: str) -> None:
+    """Execute a SQL script in autocommit mode, as psql would.
+
+    The script's own BEGIN / COMMIT delimit its transactions. Scripts using
+    CREATE/DROP INDEX CONCURRENTLY are sent one statement at a time, since a
+    multi-statement string always runs inside a transaction block.
+    """
+    batches = _statements(sql) if 'CONCURRENTLY' in sql else [sql]
+    with get_engine().connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        cursor = connection.connection.cursor()
+        try:
+            for batch in batches:
+                # No parameters, so psycopg2 leaves format()'s %I / %L alone
+                cursor.execute(batch)
+        finally:
+            cursor.close()
+
+
+def is_initialized() -> bool:
+    return inspect(get_engine()).has_table('users')
+
+
+def is_tracked() -> bool:
+    """Whether migrations are recorded (the database came from `db init` or `db stamp`)"""
+    return inspect(get_engine()).has_table('schema_migrations')
+
+
+def applied_migrations() -> List[str]:
+    if not is_tracked():
+        return []
+    with get_engine().connect() as connection:
+        return list(connection.scalars(text("SELECT name FROM schema_migrations ORDER BY name")))
+
+
+def record_applied(names: List[str]) -> None:
+    if not names:
+        return
+    with get_engine().begin() as connection:
+        connection.execute(text(_CREATE_TRACKING_TABLE))
+        connection.execute(
+            text("INSERT INTO schema_migrations (name) VALUES (:name) ON CONFLICT (name) DO NOTHING"),
+            [{'name': name} for name in names]
+        )
+
+
+def pending_migrations() -> List[str]:
+    applied = set(applied_migrations())
+    return [name for name in migration_files() if name not in applied]
@@ -0,0 +1,88 @@
+from flask import Flask, g, jsonify, request
+from sqlalchemy.orm import Session
+from app.database import replicas
+from app.database.db import SessionLocal
+
+
+def get_session() -> Session:
+    """Return the session shared by every service call in the current request.
+
+    It is opened lazily on first use, committed after a successful response and
+    rolled back otherwise, so one request costs one connection checkout and one
+    transaction. Services flush rather than commit.
+    """
+    if 'db_session' not in g:
+        g.db_session = SessionLocal()
+    return g.db_session
+
+
+def get_read_session() -> Session:
+    """Return the session for read-only service calls in the current request.
+
+    In a GET request with a fresh replica (see app.database.replicas) this is
+    a session on that replica, opened once per request and never committed.
+    Otherwise, or once the request has used the primary, it is get_session(),
+    so a request always reads its own writes.
+    """
+    if g.get('db_primary_reads'):
+        return get_session()
+    if 'db_read_session' in g:
+        return g.db_read_session
+    if 'db_session' not in g:
+        engine = replicas.read_engine()
+        if engine is not None:
+            g.db_read_session = SessionLocal(bind=engine)
+            return g.db_read_session
+    return get_session()
+
+
+def read_from_primary() -> None:
+    """Send this request's remaining get_read_session() calls to the primary.
+
+    For results that outlive the request under a version counted on the
+    primary (cached payloads): read on a lagging replica, they would be stored
+    as current while missing writes the version already includes.
+    """
+    g.db_primary_reads = True
+
+
+def open_read_session() -> Session:
+    """Open a new session for reads that outlive the request (streamed
+    responses): on a replica when get_read_session would use one. The caller closes it."""
+    engine = replicas.read_engine()
+    return SessionLocal(bind=engine) if engine is not None else SessionLocal()
+
+
+def init_app(app: Flask) -> None:
+    """Install the commit / rollback / close hooks for the request-scoped session"""
+
+    @app.after_request
+    def commit_session(response):
+        session = g.get('db_session')
+        if session is None:
+            return response
+        if response.status_code >= 400:
+            session.rollback()
+            return response
+        try:
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            app.logger.exception('Commit failed')
+            response = jsonify({'success': False, 'message': f'Server error: {str(e)}'})
+            response.status_code = 500
+        else:
+            if request.method not in replicas.SAFE_METHODS:
+                # Read-your-writes: this user's next reads stay on the primary
+                replicas.mark_written()
+        return response
+
+    @app.teardown_appcontext
+    def close_session(exception=None):
+        read_session = g.pop('db_read_session', None)
+        if read_session is not None:
+            read_session.close()
+        session = g.pop('db_session', None)
+        if session is not None:
+            # close() rolls back anything left uncommitted, e.g. after an unhandled error
+            session.close()
@@ -0,0 +1,59 @@
+import logging
+import time
+from flask import Flask
+from sqlalchemy import select
+from app.database.db import get_engine
+from app.database.session import get_session
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def warm_pool(connections: int) -> int:
+    """Open up to `connections` pooled connections at once so the first
+    requests do not pay for the TCP/auth handshake. Returns how many were opened."""
+    engine = get_engine()
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+def warm_queries() -> None:
+    """Run the hot read paths once (inside an app context) so their statements
+    are compiled into the engine's cache and their models are configured"""
+    # Imported here: services pull in most of the app, which create_app has
+    # already loaded by the time this runs
+    from app.services.dashboard_service import DashboardService
+    from app.services.task_log_service import TaskLogService
+    from app.services.task_service import TaskService
+
+    get_session().execute(select(User).where(User.username == '')).first()
+    TaskService.get_collection_version()
+    TaskService.get_tasks_page(limit=1)
+    TaskService.get_task_by_id(0)
+    TaskLogService.get_logs_page(0, limit=1)
+    DashboardService.get_statistics()
+
+
+def warm_up(app: Flask, queries: bool = True) -> None:
+    """STARTUP_WARMUP: fill the pool and (with `queries`) the compiled statement
+    cache before serving.
+
+    Failures are logged, never raised: a cold start is better than no start.
+    """
+    started = time.perf_counter()
+    try:
+        if queries:
+            with app.app_context():
+                warm_queries()
+        connections = warm_pool(app.config['STARTUP_WARMUP_CONNECTIONS'] or app.config['DB_POOL_SIZE'])
+    except Exception:
+        logger.warning('Startup warm-up failed', exc_info=True)
+        return
+    logger.info('Warmed up %s connection(s)%s in %.0f ms',
+                connections, ' and hot queries' if queries else '', (time.perf_counter() - started) * 1000)
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from app.database.db import Base
+
+
+def name_key(name: str) -> str:
+    """Matching key of an assignee name: trimmed, single-spaced and lower-cased"""
+    return ' '.join(name.split()).lower()
+
+
+class Assignee(Base):
+    """A person tasks are assigned to; tasks, counters and trend rollups reference it by id.
+
+    Names are matched on `name_key`, so "Budi Santoso" and " budi  santoso"
+    resolve to the same assignee; `name` keeps the spelling first seen.
+    """
+    __tablename__ = "assignees"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    name_key = Column(String(100), nullable=False, unique=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, DateTime
+from app.database.db import Base
+
+
+class RollupWatermark(Base):
+    """How far a log-derived rollup has been brought up to date"""
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String(50), primary_key=True)
+    processed_until = Column(DateTime, nullable=False)
@@ -1,14 +1,32 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.database.db import Base 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination: newest first on (created_at, id), per filter combination
+        Index("idx_tasks_created_at_id", "created_at", "id"),
+        Index("idx_tasks_status_created_at_id", "status", "created_at", "id"),
+        Index("idx_tasks_assignee_id_created_at_id", "assignee_id", "created_at", "id"),
+        Index("idx_tasks_status_assignee_id_created_at_id", "status", "assignee_id", "created_at", "id"),
+        # Dashboard overdue count only looks at open tasks
+        Index("idx_tasks_open_due_date", "due_date", postgresql_where=text("status <> 'Completed'")),
+        # Full-text search over title (weight A) and description (weight B)
+        Index("idx_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    # search_vector is only read by search queries; don't fetch it back after writes
+    __mapper_args__ = {"eager_defaults": False}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     description = Column(Text)
+    # Filters, indexes and rollups use the integer key; assigned_to is the
+    # assignee's name, copied on write so responses need no join
+    assignee_id = Column(Integer, ForeignKey("assignees.id"), nullable=False)
     assigned_to = Column(String(100), nullable=False)
     status = Column(String(20), default="Not_Started")
     priority = Column(String(20), default="Medium")
@@ -19,9 +37,20 @@ class Task(Base):
     created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Optimistic concurrency: incremented by every update, checked against the client's copy
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Generated by Postgres on every insert/update; 'simple' config because task
+    # text is mostly Indonesian, which has no built-in stemming dictionary
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+        persisted=True
+    )))
 
     creator = relationship("User", back_populates="tasks_created")
-    logs = relationship("TaskLog", back_populates="task", cascade="all, delete-orphan")
+    # task_logs.task_id is ON DELETE CASCADE: let Postgres remove the history
+    # instead of loading and deleting every log row
+    logs = relationship("TaskLog", back_populates="task", cascade="all, delete-orphan", passive_deletes=True)
 
     def to_dict(self):
         return {
@@ -29,6 +58,7 @@ class Task(Base):
             "title": self.title,
             "description": self.description,
             "assigned_to": self.assigned_to,
+            "assignee_id": self.assignee_id,
             "status": self.status,
             "priority": self.priority,
             "start_date": self.start_date.isoformat() if self.start_date else None,
@@ -36,5 +66,6 @@ class Task(Base):
             "completed_date": self.completed_date.isoformat() if self.completed_date else None,
             "created_by": self.created_by,
             "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "version": self.version
         }
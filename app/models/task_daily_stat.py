@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, Float, Index
+from app.database.db import Base
+
+
+class TaskDailyStat(Base):
+    """Per-day, per-assignee status transitions derived from task_logs.
+
+    Maintained by TaskAnalyticsService (`flask analytics refresh` / `backfill`);
+    trend queries read only this table. Cycle time is stored as a sum and a
+    count so averages over any range stay exact.
+    """
+    __tablename__ = "task_daily_stats"
+    __table_args__ = (
+        Index("idx_task_daily_stats_assignee_id_day", "assignee_id", "day"),
+    )
+
+    day = Column(Date, primary_key=True)
+    assignee_id = Column(Integer, ForeignKey("assignees.id"), primary_key=True)
+    created = Column(Integer, nullable=False, default=0)
+    started = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    # In_Progress -> Completed durations of the tasks completed that day
+    cycle_time_seconds = Column(Float, nullable=False, default=0)
+    cycle_time_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+from app.database.db import Base
+
+
+class TaskEvent(Base):
+    """Change-feed entry written by TaskService in the same transaction as the change.
+
+    Ids follow commit order (see _write_pending_events), so a client that
+    has seen event N can resume with every event whose id is greater.
+    """
+    __tablename__ = "task_events"
+    __table_args__ = (
+        Index("idx_task_events_created_at", "created_at"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    event_type = Column(String(40), nullable=False)
+    # No foreign key: task.deleted events outlive their task
+    task_id = Column(Integer, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "type": self.event_type,
+            "task_id": self.task_id,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            **self.payload
+        }
@@ -1,18 +1,28 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index, DDL, event
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database.db import Base 
 
 class TaskLog(Base):
     __tablename__ = "task_logs"
+    __table_args__ = (
+        # Per-task history, newest first (keyset on changed_at, id)
+        Index("idx_task_logs_task_id_changed_at", "task_id", "changed_at", "id"),
+        Index("idx_task_logs_changed_at", "changed_at"),
+        # Monthly partitions on changed_at, managed by `flask logs ...`
+        {"postgresql_partition_by": "RANGE (changed_at)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    # The task's assignee when the transition happened; trend rollups credit it
+    assignee_id = Column(Integer, ForeignKey("assignees.id"), nullable=False)
     old_status = Column(String(20))
     new_status = Column(String(20), nullable=False)
     changed_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
     change_reason = Column(Text)
-    changed_at = Column(DateTime, default=datetime.utcnow)
+    # Partition key, hence part of the primary key
+    changed_at = Column(DateTime, primary_key=True, nullable=False, default=datetime.utcnow)
 
     task = relationship("Task", back_populates="logs")
     user = relationship("User", back_populates="task_logs")
@@ -27,3 +37,11 @@ class TaskLog(Base):
             "change_reason": self.change_reason,
             "changed_at": self.changed_at.isoformat() if self.changed_at else None
         }
+
+
+# Rows outside every monthly partition land here until `flask logs ensure-partitions` moves them
+event.listen(
+    TaskLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS task_logs_default PARTITION OF task_logs DEFAULT")
+)
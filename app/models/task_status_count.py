@@ -0,0 +1,28 @@
+from sqlalchemy import BigInteger, Column, Integer, ForeignKey
+from app.database.db import Base
+
+
+class TaskStatusCount(Base):
+    """Per-assignee task counters, maintained as deltas by TaskService writes.
+
+    Global dashboard counts are the sum over all rows, so reading them costs
+    O(assignees) instead of a scan of `tasks`. `version` is bumped by every
+    write touching the assignee's tasks and versions the task list ETags.
+    """
+    __tablename__ = "task_status_counts"
+
+    assignee_id = Column(Integer, ForeignKey("assignees.id"), primary_key=True)
+    total_tasks = Column(Integer, nullable=False, default=0)
+    not_started = Column(Integer, nullable=False, default=0)
+    in_progress = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    version = Column(BigInteger, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "assignee_id": self.assignee_id,
+            "total_tasks": self.total_tasks,
+            "not_started": self.not_started,
+            "in_progress": self.in_progress,
+            "completed": self.completed
+        }
@@ -0,0 +1,90 @@
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models.assignee import Assignee, name_key
+
+# name_key -> (id, canonical name). Assignees are never renamed or deleted,
+# so entries stay valid for the life of the process.
+_resolved: Dict[str, Tuple[int, str]] = {}
+_resolved_lock = threading.Lock()
+
+
+class AssigneeService:
+    @staticmethod
+    def cached_id(name: str) -> Optional[int]:
+        """Id of an assignee resolved earlier by this process, without a query"""
+        entry = _resolved.get(name_key(name))
+        return entry[0] if entry else None
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget every resolved name (tests: query counts then match a fresh process)"""
+        with _resolved_lock:
+            _resolved.clear()
+
+    @staticmethod
+    def id_clause(name: str):
+        """Assignee id to compare against in a filter: a literal once this process has
+        resolved the name, else a scalar subquery (NULL, matching nothing, for unknown names)"""
+        assignee_id = AssigneeService.cached_id(name)
+        if assignee_id is not None:
+            return assignee_id
+        return select(Assignee.id).where(Assignee.name_key == name_key(name)).scalar_subquery()
+
+    @staticmethod
+    def _upsert_statement(names: Dict[str, str]):
+        # DO UPDATE (not DO NOTHING) so RETURNING also yields rows that already existed
+        stmt = insert(Assignee).values([
+            {'name': name, 'name_key': key} for key, name in sorted(names.items())
+        ])
+        return stmt.on_conflict_do_update(
+            index_elements=[Assignee.name_key],
+            set_={'name': Assignee.name}
+        ).returning(Assignee.id, Assignee.name, Assignee.name_key)
+
+    @staticmethod
+    def resolve(session: Session, names: Iterable[str]) -> Dict[str, Tuple[int, str]]:
+        """Map each name to its assignee's (id, canonical name), creating missing assignees.
+
+        Names already seen by this process cost nothing; the rest are fetched
+        or inserted with one upsert in the caller's transaction, and cached
+        once it commits. Raises ValueError on a blank or non-string name.
+        """
+        names = list(names)
+        staged = session.info.setdefault('assignees', {})
+        result, missing = {}, {}
+        for name in names:
+            key = name_key(name) if isinstance(name, str) else ''
+            if not key:
+                raise ValueError("assigned_to must be a non-blank string")
+            entry = _resolved.get(key) or staged.get(key)
+            if entry:
+                result[name] = entry
+            else:
+                missing.setdefault(key, ' '.join(name.split()))
+        if missing:
+            for row in session.execute(AssigneeService._upsert_statement(missing)):
+                staged[row.name_key] = (row.id, row.name)
+            for name in names:
+                result.setdefault(name, staged[name_key(name)])
+        return result
+
+    @staticmethod
+    def resolve_one(session: Session, name: str) -> Tuple[int, str]:
+        return AssigneeService.resolve(session, [name])[name]
+
+
+# Like the cache version bumps: rows from a rolled-back upsert may not exist
+@event.listens_for(Session, 'after_commit')
+def _publish_resolved(session):
+    staged = session.info.pop('assignees', None)
+    if staged:
+        with _resolved_lock:
+            _resolved.update(staged)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_resolved(session):
+    session.info.pop('assignees', None)
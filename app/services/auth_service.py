@@ -1,32 +1,39 @@
-from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.utils.jwt_utils import generate_token
+from app.utils.password_utils import hash_password, verify_password
 from app.database.db import SessionLocal
+from app.database.session import get_session
 
 class AuthService:
     @staticmethod
     def login(username: str, password: str):
-        """Authenticate user and generate token"""
-        db: Session = SessionLocal()
-        try:
-            user = db.query(User).filter(User.username == username).first()
-            if not user or not check_password_hash(user.password_hash, password):
-                return None, "Invalid username or password"
-            
-            token = generate_token(user.id, user.username)
-            return {'access_token': token, 'user': user.to_dict()}, None
-        finally:
-            db.close()
+        """Authenticate user and generate token.
+
+        Raises PasswordPoolSaturated when password verification is overloaded.
+        """
+        db: Session = get_session()
+        user = db.query(User).filter(User.username == username).first()
+        if not user:
+            return None, "Invalid username or password"
+        valid, new_hash = verify_password(user.password_hash, password)
+        if not valid:
+            return None, "Invalid username or password"
+        if new_hash:
+            user.password_hash = new_hash
+            db.flush()
+
+        token = generate_token(user.id, user.username)
+        return {'access_token': token, 'user': user.to_dict()}, None
     
     @staticmethod
     def create_default_user():
-        """Create default admin user (for initial setup)"""
+        """Create default admin user (for initial setup, outside any request)"""
         db: Session = SessionLocal()
         try:
             existing_user = db.query(User).filter(User.username == "admin").first()
             if not existing_user:
-                password_hash = generate_password_hash('admin123')
+                password_hash = hash_password('admin123')
                 user = User(
                     username="admin",
                     email="admin@herobusana.com",
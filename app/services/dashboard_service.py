@@ -1,83 +1,81 @@
+from typing import List
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case, cast, Float
-from app.database.db import SessionLocal
+from sqlalchemy import func, select
+from app.database.session import get_read_session
 from app.models.task import Task
 from app.models.task_log import TaskLog
 from app.models.user import User
+from app.services.task_rollup_service import TaskRollupService
+from app.utils.serialization import compile_row_encoder
+
+RECENT_ACTIVITY_COLUMNS = (
+    TaskLog.id,
+    Task.title.label('task_title'),
+    TaskLog.old_status,
+    TaskLog.new_status,
+    User.full_name.label('changed_by'),
+    TaskLog.changed_at,
+)
+encode_recent_activity = compile_row_encoder(RECENT_ACTIVITY_COLUMNS)
 
 class DashboardService:
     @staticmethod
     def get_statistics():
         """Get dashboard statistics for overview"""
-        db: Session = SessionLocal()
-        try:
-            stats_query = db.query(
-                func.count(Task.id),
-                func.count(case((Task.status == 'Not_Started', 1))),
-                func.count(case((Task.status == 'In_Progress', 1))),
-                func.count(case((Task.status == 'Completed', 1))),
-                func.count(case((Task.due_date < func.current_date(), Task.status != 'Completed')))
-            ).one()
+        db: Session = get_read_session()
+        totals, assignee_counts = TaskRollupService.get_counts(db)
+        overdue = db.scalar(DashboardService._overdue_select())
+        recent_activities = db.execute(DashboardService._recent_activities_select()).all()
+        return DashboardService._build_statistics(totals, assignee_counts, overdue, recent_activities)
 
-            stats = {
-                'total_tasks': stats_query[0],
-                'not_started': stats_query[1],
-                'in_progress': stats_query[2],
-                'completed': stats_query[3],
-                'overdue': stats_query[4]
-            }
+    # --- Statement builders (shared with app.aio's async services) ---
 
-            team_activity_query = db.query(
-                Task.assigned_to,
-                func.count(Task.id),
-                func.count(case((Task.status == 'Completed', 1))),
-                func.count(case((Task.status == 'In_Progress', 1))),
-                (cast(func.count(case((Task.status == 'Completed', 1))), Float) /
-                 func.nullif(func.count(Task.id), 0) * 100)
-            ).group_by(Task.assigned_to).order_by(func.count(case((Task.status == 'Completed', 1))).desc()).all()
+    @staticmethod
+    def _overdue_select():
+        # Overdue depends on the current date, so it cannot be kept as a delta;
+        # the partial index on open tasks' due_date keeps this count cheap.
+        return select(func.count(Task.id)).where(
+            Task.due_date < func.current_date(),
+            Task.status != 'Completed'
+        )
 
-            team_activity = [
-                {
-                    'assigned_to': row[0],
-                    'total_tasks': row[1],
-                    'completed_tasks': row[2],
-                    'ongoing_tasks': row[3],
-                    'completion_rate': float(row[4]) if row[4] else 0
-                } for row in team_activity_query
-            ]
+    @staticmethod
+    def _recent_activities_select(limit: int = 10):
+        return (
+            select(*RECENT_ACTIVITY_COLUMNS)
+            .join(Task, Task.id == TaskLog.task_id)
+            .outerjoin(User, User.id == TaskLog.changed_by)
+            .order_by(TaskLog.changed_at.desc())
+            .limit(limit)
+        )
 
-            recent_activities_query = (
-                db.query(
-                    TaskLog.id,
-                    Task.title,
-                    TaskLog.old_status,
-                    TaskLog.new_status,
-                    User.full_name,
-                    TaskLog.changed_at
-                )
-                .join(Task, Task.id == TaskLog.task_id)
-                .outerjoin(User, User.id == TaskLog.changed_by)
-                .order_by(TaskLog.changed_at.desc())
-                .limit(10)
-                .all()
-            )
+    @staticmethod
+    def _build_statistics(totals: dict, assignee_counts: List[Row], overdue: int, recent_rows) -> dict:
+        stats = {
+            'total_tasks': totals['total_tasks'],
+            'not_started': totals['not_started'],
+            'in_progress': totals['in_progress'],
+            'completed': totals['completed'],
+            'overdue': overdue
+        }
 
-            recent_activities = [
-                {
-                    'id': row[0],
-                    'task_title': row[1],
-                    'old_status': row[2],
-                    'new_status': row[3],
-                    'changed_by': row[4],
-                    'changed_at': row[5].isoformat() if row[5] else None
-                } for row in recent_activities_query
-            ]
+        team_activity = [
+            {
+                'assignee_id': row.assignee_id,
+                'assigned_to': row.assigned_to,
+                'total_tasks': row.total_tasks,
+                'completed_tasks': row.completed,
+                'ongoing_tasks': row.in_progress,
+                'completion_rate': row.completed / row.total_tasks * 100 if row.total_tasks else 0
+            } for row in assignee_counts
+        ]
 
-            return {
-                'statistics': stats,
-                'team_activity': team_activity,
-                'recent_activities': recent_activities
-            }
+        # changed_at stays a datetime; cached_json_response encodes it as ISO 8601
+        recent_activities = [encode_recent_activity(row) for row in recent_rows]
 
-        finally:
-            db.close()
+        return {
+            'statistics': stats,
+            'team_activity': team_activity,
+            'recent_activities': recent_activities
+        }
@@ -0,0 +1,261 @@
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import Date, cast, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.database.db import SessionLocal
+from app.database.session import get_read_session
+from app.models.assignee import Assignee
+from app.models.rollup_watermark import RollupWatermark
+from app.models.task_daily_stat import TaskDailyStat
+from app.models.task_log import TaskLog
+from app.services.assignee_service import AssigneeService
+from app.utils.cache import mark_changed
+
+WATERMARK = 'task_daily_stats'
+TREND_INTERVALS = ('day', 'week')
+# Serializes refresh / backfill runs so two never rewrite the same days at once
+_REFRESH_LOCK_KEY = 0x64617973  # 'days'
+# Logs are stamped by the app before commit; days this close to the watermark
+# are recomputed again in case a slow transaction committed late
+_SETTLE = timedelta(minutes=5)
+_BACKFILL_CHUNK_DAYS = 31
+
+# Rebuild the rows of every day in [:start, :end). The window looks back over the
+# whole history of the tasks that changed in the range, so a completion finds
+# its In_Progress start even when that happened days earlier. Each transition is
+# credited to the assignee stored on its log row (the assignee at the time), and
+# only task_logs is read, so refresh and backfill give the same rows for a day.
+# Deleting a task deletes its logs: days recomputed afterwards no longer count
+# it, while days computed before keep it until a backfill covers them.
+# Timestamps are naive UTC, so days are UTC days.
+_DAILY_STATS_INSERT = text("""
+    WITH transitions AS (
+        SELECT
+            l.task_id,
+            l.assignee_id,
+            l.old_status,
+            l.new_status,
+            l.changed_at,
+            MAX(CASE WHEN l.new_status = 'In_Progress' THEN l.changed_at END) OVER (
+                PARTITION BY l.task_id
+                ORDER BY l.changed_at, l.id
+                ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+            ) AS started_at
+        FROM task_logs l
+        WHERE l.changed_at < :end
+          AND l.task_id IN (
+              SELECT task_id FROM task_logs WHERE changed_at >= :start AND changed_at < :end
+          )
+    ),
+    in_range AS (
+        SELECT
+            t.*,
+            t.new_status = 'Completed' AND t.old_status IS DISTINCT FROM 'Completed' AS is_completion
+        FROM transitions t
+        WHERE t.changed_at >= :start
+    )
+    INSERT INTO task_daily_stats (day, assignee_id, created, started, completed, cycle_time_seconds, cycle_time_count)
+    SELECT
+        r.changed_at::date,
+        r.assignee_id,
+        COUNT(*) FILTER (WHERE r.old_status IS NULL),
+        COUNT(*) FILTER (WHERE r.new_status = 'In_Progress' AND r.old_status IS DISTINCT FROM 'In_Progress'),
+        COUNT(*) FILTER (WHERE r.is_completion),
+        COALESCE(SUM(EXTRACT(EPOCH FROM r.changed_at - r.started_at))
+                 FILTER (WHERE r.is_completion AND r.started_at IS NOT NULL), 0),
+        COUNT(*) FILTER (WHERE r.is_completion AND r.started_at IS NOT NULL)
+    FROM in_range r
+    GROUP BY 1, 2
+""")
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, time.min)
+
+
+def parse_trend_args(args, max_days: int) -> Tuple[date, date, str, Optional[str]]:
+    """Read `from`, `to`, `interval` and `assigned_to` from query args; raises ValueError"""
+    try:
+        end = datetime.strptime(args['to'], '%Y-%m-%d').date() if args.get('to') else datetime.utcnow().date()
+        start = datetime.strptime(args['from'], '%Y-%m-%d').date() if args.get('from') else end - timedelta(days=29)
+    except ValueError:
+        raise ValueError('from and to must be dates (YYYY-MM-DD)')
+    if start > end:
+        raise ValueError('from must not be after to')
+    if (end - start).days >= max_days:
+        raise ValueError(f"Date range is limited to {max_days} days")
+    interval = args.get('interval', 'day')
+    if interval not in TREND_INTERVALS:
+        raise ValueError(f"interval must be one of: {', '.join(TREND_INTERVALS)}")
+    return start, end, interval, args.get('assigned_to') or None
+
+
+def _average_hours(seconds: float, count: int) -> Optional[float]:
+    return round(seconds / count / 3600, 2) if count else None
+
+
+class TaskAnalyticsService:
+    @staticmethod
+    def _recompute(session: Session, start: date, end: date) -> int:
+        """Replace the task_daily_stats rows of days [start, end); returns rows written"""
+        session.execute(select(func.pg_advisory_xact_lock(_REFRESH_LOCK_KEY)))
+        session.execute(delete(TaskDailyStat).where(TaskDailyStat.day >= start, TaskDailyStat.day < end))
+        result = session.execute(_DAILY_STATS_INSERT, {'start': _midnight(start), 'end': _midnight(end)})
+        mark_changed(session, 'analytics')
+        return result.rowcount
+
+    @staticmethod
+    def _set_watermark(session: Session, processed_until: datetime) -> None:
+        stmt = insert(RollupWatermark).values(name=WATERMARK, processed_until=processed_until)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=[RollupWatermark.name],
+            set_={'processed_until': func.greatest(RollupWatermark.processed_until, stmt.excluded.processed_until)}
+        ))
+
+    @staticmethod
+    def _first_log_day(session: Session) -> Optional[date]:
+        first = session.scalar(select(func.min(TaskLog.changed_at)))
+        return first.date() if first else None
+
+    @staticmethod
+    def refresh(now: Optional[datetime] = None) -> Tuple[date, date, int]:
+        """Bring the rollups up to date with the logs written since the last run.
+
+        Only the days from the watermark (less a settling margin) to today are
+        recomputed, which touches the newest task_logs partition(s) only.
+        Returns the recomputed day range [start, end) and the rows written.
+        """
+        now = now or datetime.utcnow()
+        end = now.date() + timedelta(days=1)
+        with SessionLocal() as session:
+            session.execute(select(func.pg_advisory_xact_lock(_REFRESH_LOCK_KEY)))
+            processed_until = session.scalar(
+                select(RollupWatermark.processed_until).where(RollupWatermark.name == WATERMARK)
+            )
+            if processed_until is not None:
+                start = (processed_until - _SETTLE).date()
+            else:
+                start = TaskAnalyticsService._first_log_day(session) or now.date()
+            rows = TaskAnalyticsService._recompute(session, start, end)
+            TaskAnalyticsService._set_watermark(session, now)
+            session.commit()
+        return start, end, rows
+
+    @staticmethod
+    def backfill(start: Optional[date] = None, end: Optional[date] = None) -> List[Tuple[date, date, int]]:
+        """Recompute the days [start, end] (default: first log to today) in monthly chunks.
+
+        Each chunk commits on its own, so a long history does not hold one
+        huge transaction. Returns (start, end, rows) per chunk.
+        """
+        now = datetime.utcnow()
+        with SessionLocal() as session:
+            start = start or TaskAnalyticsService._first_log_day(session) or now.date()
+        stop = (end or now.date()) + timedelta(days=1)
+
+        chunks = []
+        while start < stop:
+            chunk_end = min(start + timedelta(days=_BACKFILL_CHUNK_DAYS), stop)
+            with SessionLocal() as session:
+                rows = TaskAnalyticsService._recompute(session, start, chunk_end)
+                if chunk_end > now.date():
+                    TaskAnalyticsService._set_watermark(session, now)
+                session.commit()
+            chunks.append((start, chunk_end, rows))
+            start = chunk_end
+        return chunks
+
+    # --- Trend queries (read only the rollups) ---
+
+    @staticmethod
+    def _series_select(start: date, end: date, interval: str, assigned_to: Optional[str]):
+        period = cast(func.date_trunc(interval, TaskDailyStat.day), Date).label('period')
+        stmt = (
+            select(
+                period,
+                func.sum(TaskDailyStat.created),
+                func.sum(TaskDailyStat.started),
+                func.sum(TaskDailyStat.completed),
+                func.sum(TaskDailyStat.cycle_time_seconds),
+                func.sum(TaskDailyStat.cycle_time_count),
+            )
+            .where(TaskDailyStat.day >= start, TaskDailyStat.day <= end)
+            .group_by(period)
+            .order_by(period)
+        )
+        if assigned_to:
+            stmt = stmt.where(TaskDailyStat.assignee_id == AssigneeService.id_clause(assigned_to))
+        return stmt
+
+    @staticmethod
+    def _assignees_select(start: date, end: date, assigned_to: Optional[str]):
+        completed = func.sum(TaskDailyStat.completed).label('completed')
+        stmt = (
+            select(
+                Assignee.name,
+                func.sum(TaskDailyStat.started),
+                completed,
+                func.sum(TaskDailyStat.cycle_time_seconds),
+                func.sum(TaskDailyStat.cycle_time_count),
+                TaskDailyStat.assignee_id,
+            )
+            .join(Assignee, Assignee.id == TaskDailyStat.assignee_id)
+            .where(TaskDailyStat.day >= start, TaskDailyStat.day <= end)
+            .group_by(TaskDailyStat.assignee_id, Assignee.name)
+            .order_by(completed.desc(), Assignee.name)
+        )
+        if assigned_to:
+            stmt = stmt.where(TaskDailyStat.assignee_id == AssigneeService.id_clause(assigned_to))
+        return stmt
+
+    @staticmethod
+    def _watermark_select():
+        return select(RollupWatermark.processed_until).where(RollupWatermark.name == WATERMARK)
+
+    @staticmethod
+    def get_trends(start: date, end: date, interval: str = 'day', assigned_to: Optional[str] = None) -> dict:
+        """Throughput and cycle time per day or week for [start, end], inclusive"""
+        db: Session = get_read_session()
+        series = db.execute(TaskAnalyticsService._series_select(start, end, interval, assigned_to)).all()
+        assignees = db.execute(TaskAnalyticsService._assignees_select(start, end, assigned_to)).all()
+        processed_until = db.scalar(TaskAnalyticsService._watermark_select())
+        return TaskAnalyticsService._build_trends(start, end, interval, series, assignees, processed_until)
+
+    @staticmethod
+    def _build_trends(start: date, end: date, interval: str, series_rows, assignee_rows, processed_until) -> dict:
+        by_period = {row[0]: row for row in series_rows}
+        step = timedelta(days=7 if interval == 'week' else 1)
+        period = start - timedelta(days=start.weekday()) if interval == 'week' else start
+
+        # Every period in the range is listed, with zeros where nothing happened
+        series = []
+        while period <= end:
+            row = by_period.get(period)
+            series.append({
+                'period': period.isoformat(),
+                'created': row[1] if row else 0,
+                'started': row[2] if row else 0,
+                'completed': row[3] if row else 0,
+                'avg_cycle_time_hours': _average_hours(row[4], row[5]) if row else None
+            })
+            period += step
+
+        assignees = [
+            {
+                'assignee_id': row[5],
+                'assigned_to': row[0],
+                'started': row[1],
+                'completed': row[2],
+                'avg_cycle_time_hours': _average_hours(row[3], row[4])
+            } for row in assignee_rows
+        ]
+
+        return {
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'interval': interval,
+            'series': series,
+            'assignees': assignees,
+            'refreshed_until': processed_until.isoformat() if processed_until else None
+        }
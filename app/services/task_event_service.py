@@ -0,0 +1,102 @@
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import event, func, insert, select, delete
+from sqlalchemy.orm import Session
+from app.database.db import SessionLocal
+from app.models.task import Task
+from app.models.task_event import TaskEvent
+
+# Postgres channel the change feed is announced on; the payload is unused,
+# listeners read task_events past the last id they delivered
+CHANNEL = "task_events"
+# Taken right before COMMIT by transactions writing events and held through
+# it, so event ids are assigned in commit order
+_ORDER_LOCK_KEY = 0x7461736B  # 'task'
+
+# (event_type, task_id, payload)
+Event = Tuple[str, int, dict]
+
+
+class TaskEventService:
+    @staticmethod
+    def task_created(task: Task) -> Event:
+        return 'task.created', task.id, {'task': task.to_dict()}
+
+    @staticmethod
+    def task_updated(task: Task, old_status: str, old_assigned_to: str) -> Event:
+        event_type = 'task.status_changed' if old_status != task.status else 'task.updated'
+        return event_type, task.id, {
+            'task': task.to_dict(), 'old_status': old_status, 'old_assigned_to': old_assigned_to
+        }
+
+    @staticmethod
+    def task_deleted(task_id: int, assigned_to: str, status: str) -> Event:
+        return 'task.deleted', task_id, {'assigned_to': assigned_to, 'status': status}
+
+    @staticmethod
+    def record(session: Session, events: Iterable[Event]) -> None:
+        """Queue events to be written and announced when the caller's transaction commits"""
+        rows = [
+            {'event_type': event_type, 'task_id': task_id, 'payload': payload, 'created_at': datetime.utcnow()}
+            for event_type, task_id, payload in events
+        ]
+        if rows:
+            TaskEventService.record_statement(session, insert(TaskEvent), rows)
+
+    @staticmethod
+    def record_statement(session: Session, stmt, params=None) -> None:
+        """Queue a statement writing task_events rows set-wise (INSERT ... SELECT),
+        run at commit like record()'s rows"""
+        session.info.setdefault('pending_events', []).append((stmt, params))
+
+    @staticmethod
+    def notify(session: Session) -> None:
+        """Announce new task_events rows to listeners once the transaction commits"""
+        session.execute(select(func.pg_notify(CHANNEL, '')))
+
+    @staticmethod
+    def latest_id() -> int:
+        with SessionLocal() as session:
+            return session.scalar(select(func.coalesce(func.max(TaskEvent.id), 0)))
+
+    @staticmethod
+    def oldest_id() -> Optional[int]:
+        with SessionLocal() as session:
+            return session.scalar(select(func.min(TaskEvent.id)))
+
+    @staticmethod
+    def get_events_after(after_id: int, limit: int = 500) -> List[TaskEvent]:
+        """Events with id greater than `after_id`, oldest first"""
+        with SessionLocal() as session:
+            return session.scalars(
+                select(TaskEvent).where(TaskEvent.id > after_id).order_by(TaskEvent.id).limit(limit)
+            ).all()
+
+    @staticmethod
+    def prune(before: datetime) -> int:
+        """Delete events created before `before`; returns the number removed"""
+        with SessionLocal() as session:
+            result = session.execute(delete(TaskEvent).where(TaskEvent.created_at < before))
+            session.commit()
+            return result.rowcount
+
+
+# Registered on the Session class so sync sessions and the sync sessions behind
+# AsyncSession both write their events. Deferring the inserts to here keeps the
+# order lock to the event inserts and the COMMIT itself: every other write of
+# the transaction, and the response, run without it.
+@event.listens_for(Session, 'before_commit')
+def _write_pending_events(session):
+    pending = session.info.pop('pending_events', None)
+    if not pending:
+        return
+    session.flush()
+    session.execute(select(func.pg_advisory_xact_lock(_ORDER_LOCK_KEY)))
+    for stmt, params in pending:
+        session.execute(stmt, params)
+    TaskEventService.notify(session)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_events(session):
+    session.info.pop('pending_events', None)
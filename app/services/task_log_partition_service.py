@@ -0,0 +1,162 @@
+import gzip
+import json
+import os
+import re
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.database.db import SessionLocal, get_engine
+
+# Monthly partitions are named task_logs_yYYYYmMM and cover [month, next month)
+PARTITION_NAME = re.compile(r"^task_logs_y(\d{4})m(\d{2})$")
+DEFAULT_PARTITION = "task_logs_default"
+
+
+def add_months(month: date, count: int) -> date:
+    """First day of the month `count` months after `month`'s"""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"task_logs_y{month.year:04d}m{month.month:02d}"
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class TaskLogPartitionService:
+    @staticmethod
+    def list_partitions(session: Session) -> List[Tuple[str, date]]:
+        """Attached monthly partitions as (name, first day of month), oldest first"""
+        names = session.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'task_logs'::regclass"
+        )).scalars()
+        partitions = []
+        for name in names:
+            match = PARTITION_NAME.match(name)
+            if match:
+                partitions.append((name, date(int(match[1]), int(match[2]), 1)))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    @staticmethod
+    def ensure_partitions(months_ahead: int, today: Optional[date] = None) -> List[str]:
+        """Create the partitions for this month and `months_ahead` more; returns the new names.
+
+        Months that already have rows in the default partition get a partition
+        too, and those rows are moved into it before it is attached.
+        """
+        this_month = (today or date.today()).replace(day=1)
+        created = []
+        with SessionLocal() as session:
+            existing = {month for _, month in TaskLogPartitionService.list_partitions(session)}
+            stranded = session.execute(text(
+                f"SELECT DISTINCT date_trunc('month', changed_at)::date FROM {DEFAULT_PARTITION}"
+            )).scalars().all()
+            wanted = {add_months(this_month, n) for n in range(months_ahead + 1)} | set(stranded)
+            for month in sorted(wanted - existing):
+                name = partition_name(month)
+                bounds = {"start": month, "end": add_months(month, 1)}
+                session.execute(text(f"CREATE TABLE {name} (LIKE task_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+                session.execute(text(
+                    f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                    f"WHERE changed_at >= :start AND changed_at < :end RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ), bounds)
+                session.execute(text(
+                    f"ALTER TABLE task_logs ATTACH PARTITION {name} "
+                    f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+                ))
+                created.append(name)
+            session.commit()
+        return created
+
+    @staticmethod
+    def list_detached(session: Session) -> List[Tuple[str, date]]:
+        """Monthly partition tables no longer attached to task_logs (left by
+        `archive --keep-table` or an archive run that failed after detaching)"""
+        names = session.execute(text(
+            "SELECT c.relname FROM pg_class c "
+            "WHERE c.relkind = 'r' AND c.relnamespace = 'public'::regnamespace "
+            "AND c.relname LIKE 'task\\_logs\\_y%' "
+            "AND NOT EXISTS (SELECT 1 FROM pg_inherits i WHERE i.inhrelid = c.oid)"
+        )).scalars()
+        detached = []
+        for name in names:
+            match = PARTITION_NAME.match(name)
+            if match:
+                detached.append((name, date(int(match[1]), int(match[2]), 1)))
+        return sorted(detached, key=lambda partition: partition[1])
+
+    @staticmethod
+    def archive_partitions(before: date, directory: str, drop: bool = True) -> List[Tuple[str, str, int]]:
+        """Archive every monthly partition that ends on or before `before`.
+
+        Each partition is detached from task_logs first, so no row can be
+        written to it after the export starts. The detached table is exported
+        to `<directory>/<name>.ndjson.gz` (one JSON object per row; an existing
+        archive is never overwritten, a later one gets a `.2`, `.3`... suffix)
+        and, unless `drop` is False, dropped. With `drop`, tables a failed run
+        left detached are archived too. Returns (name, path, row count) per
+        archived partition.
+        """
+        with SessionLocal() as session:
+            partitions = [
+                name for name, month in TaskLogPartitionService.list_partitions(session)
+                if add_months(month, 1) <= before
+            ]
+            leftovers = [
+                name for name, month in TaskLogPartitionService.list_detached(session)
+                if add_months(month, 1) <= before
+            ] if drop else []
+        if partitions or leftovers:
+            os.makedirs(directory, exist_ok=True)
+
+        for name in partitions:
+            # Plain DETACH: CONCURRENTLY is not allowed next to the default partition.
+            # It briefly locks task_logs; rows for this month written afterwards
+            # go to the default partition (see ensure_partitions)
+            with SessionLocal() as session:
+                session.execute(text(f"ALTER TABLE task_logs DETACH PARTITION {name}"))
+                session.commit()
+
+        archived = []
+        for name in leftovers + partitions:
+            path = TaskLogPartitionService._archive_path(directory, name)
+            count = TaskLogPartitionService._export(name, path)
+            if drop:
+                with SessionLocal() as session:
+                    session.execute(text(f"DROP TABLE {name}"))
+                    session.commit()
+            archived.append((name, path, count))
+        return archived
+
+    @staticmethod
+    def _archive_path(directory: str, name: str) -> str:
+        path = os.path.join(directory, f"{name}.ndjson.gz")
+        suffix = 1
+        while os.path.exists(path):
+            suffix += 1
+            path = os.path.join(directory, f"{name}.{suffix}.ndjson.gz")
+        return path
+
+    @staticmethod
+    def _export(name: str, path: str) -> int:
+        # Written under a temporary name and renamed, so a present archive is always complete
+        partial = path + ".partial"
+        count = 0
+        with get_engine().connect() as connection, gzip.open(partial, "wt", encoding="utf-8") as out:
+            rows = connection.execution_options(stream_results=True, yield_per=1000).execute(
+                text(f"SELECT * FROM {name} ORDER BY changed_at, id")
+            )
+            for row in rows.mappings():
+                out.write(json.dumps(dict(row), default=_json_default))
+                out.write("\n")
+                count += 1
+        os.replace(partial, path)
+        return count
@@ -1,9 +1,20 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import List, Optional, Iterator, Tuple
+from sqlalchemy import select, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, contains_eager
 from app.models.task_log import TaskLog
 from app.models.task import Task
 from app.models.user import User
-from app.database.db import SessionLocal
+from app.database.session import get_session, get_read_session, open_read_session
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.serialization import compile_row_encoder
+
+# TaskLog.to_dict() fields, read as plain rows by the history endpoints
+TASK_LOG_ROW_COLUMNS = (
+    TaskLog.id, TaskLog.task_id, TaskLog.old_status, TaskLog.new_status,
+    TaskLog.changed_by, TaskLog.change_reason, TaskLog.changed_at,
+)
+encode_task_log_row = compile_row_encoder(TASK_LOG_ROW_COLUMNS)
 
 class TaskLogService:
     @staticmethod
@@ -14,64 +25,99 @@ class TaskLogService:
         user_id: int,
         reason: Optional[str] = None,
     ) -> TaskLog:
-        """Create a task log entry"""
-        db: Session = SessionLocal()
-        try:
-            log = TaskLog(
-                task_id=task_id,
-                old_status=old_status,
-                new_status=new_status,
-                changed_by=user_id,
-                change_reason=reason
-            )
-            db.add(log)
-            db.commit()
-            db.refresh(log)
-            return log
-        finally:
-            db.close()
+        """Create a task log entry, credited to the task's current assignee"""
+        db: Session = get_session()
+        log = TaskLog(
+            task_id=task_id,
+            assignee_id=select(Task.assignee_id).where(Task.id == task_id).scalar_subquery(),
+            old_status=old_status,
+            new_status=new_status,
+            changed_by=user_id,
+            change_reason=reason
+        )
+        db.add(log)
+        db.flush()
+        return log
+
+    @staticmethod
+    def get_logs_by_task(task_id: int) -> List[Row]:
+        """Get all logs for a specific task, as TASK_LOG_ROW_COLUMNS rows"""
+        return get_read_session().execute(TaskLogService._logs_by_task_select(task_id, TASK_LOG_ROW_COLUMNS)).all()
 
     @staticmethod
-    def get_logs_by_task(task_id: int) -> List[TaskLog]:
-        """Get all logs for a specific task"""
-        db: Session = SessionLocal()
-        try:
-            logs = (
-                db.query(TaskLog)
-                .filter(TaskLog.task_id == task_id)
-                .order_by(TaskLog.changed_at.desc())
-                .all()
+    def _logs_by_task_select(task_id: int, columns=(TaskLog,)):
+        return select(*columns).where(TaskLog.task_id == task_id).order_by(TaskLog.changed_at.desc())
+
+    @staticmethod
+    def get_logs_page(task_id: int, limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[Row], Optional[str]]:
+        """Get one page of a task's log rows, newest first, keyed on (changed_at, id).
+
+        The cursor bounds changed_at from above, so later pages skip the newer
+        monthly partitions. Raises ValueError if the cursor cannot be decoded.
+        """
+        stmt = TaskLogService._logs_page_select(task_id, limit, cursor, TASK_LOG_ROW_COLUMNS)
+        return TaskLogService._split_page(get_read_session().execute(stmt).all(), limit)
+
+    @staticmethod
+    def _logs_page_select(task_id: int, limit: int, cursor: Optional[str], columns=(TaskLog,)):
+        stmt = (
+            select(*columns)
+            .where(TaskLog.task_id == task_id)
+            .order_by(TaskLog.changed_at.desc(), TaskLog.id.desc())
+        )
+        if cursor:
+            changed_at, log_id = decode_cursor(cursor)
+            # The plain bound is implied by the row comparison but is what lets
+            # Postgres prune partitions newer than the cursor
+            stmt = stmt.where(
+                TaskLog.changed_at <= changed_at,
+                tuple_(TaskLog.changed_at, TaskLog.id) < tuple_(changed_at, log_id)
             )
-            return logs
-        finally:
-            db.close()
+        return stmt.limit(limit + 1)
+
+    @staticmethod
+    def _split_page(logs: List[TaskLog], limit: int) -> Tuple[List[TaskLog], Optional[str]]:
+        if len(logs) <= limit:
+            return logs, None
+        logs = logs[:limit]
+        return logs, encode_cursor(logs[-1].changed_at, logs[-1].id)
+
+    @staticmethod
+    def iter_logs_by_task(task_id: int, batch_size: int = 500) -> Iterator[Row]:
+        """Yield log rows for a specific task, fetched in batches over a server-side cursor"""
+        with open_read_session() as session:
+            stmt = TaskLogService._logs_by_task_select(task_id, TASK_LOG_ROW_COLUMNS).execution_options(yield_per=batch_size)
+            for row in session.execute(stmt):
+                yield row
 
     @staticmethod
     def get_all_logs(limit: int = 50) -> List[dict]:
-        """Get all logs with task and user details"""
-        db: Session = SessionLocal()
-        try:
-            logs = (
-                db.query(TaskLog)
-                .join(Task, TaskLog.task_id == Task.id)
-                .outerjoin(User, TaskLog.changed_by == User.id)
-                .order_by(TaskLog.changed_at.desc())
-                .limit(limit)
-                .all()
-            )
+        """Get all logs with task and user details.
+
+        Task and user are populated from the joins, so reading them costs no
+        extra query per log.
+        """
+        db: Session = get_read_session()
+        logs = (
+            db.query(TaskLog)
+            .join(Task, TaskLog.task_id == Task.id)
+            .outerjoin(User, TaskLog.changed_by == User.id)
+            .options(contains_eager(TaskLog.task), contains_eager(TaskLog.user))
+            .order_by(TaskLog.changed_at.desc())
+            .limit(limit)
+            .all()
+        )
 
-            return [
-                {
-                    "id": log.id,
-                    "task_id": log.task_id,
-                    "task_title": log.task.title if log.task else None,
-                    "old_status": log.old_status,
-                    "new_status": log.new_status,
-                    "changed_by": log.changer.full_name if log.changer else None,
-                    "change_reason": log.change_reason,
-                    "changed_at": log.changed_at.isoformat() if log.changed_at else None
-                }
-                for log in logs
-            ]
-        finally:
-            db.close()
+        return [
+            {
+                "id": log.id,
+                "task_id": log.task_id,
+                "task_title": log.task.title if log.task else None,
+                "old_status": log.old_status,
+                "new_status": log.new_status,
+                "changed_by": log.user.full_name if log.user else None,
+                "change_reason": log.change_reason,
+                "changed_at": log.changed_at.isoformat() if log.changed_at else None
+            }
+            for log in logs
+        ]
@@ -0,0 +1,183 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func, case, text, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.database.db import SessionLocal
+from app.models.assignee import Assignee
+from app.models.task import Task
+from app.models.task_status_count import TaskStatusCount
+from app.services.assignee_service import AssigneeService
+
+# (assignee_id, status) of a task before or after a write; None when the task
+# did not exist before (create) or no longer exists after (delete)
+TaskKey = Optional[Tuple[int, str]]
+
+STATUS_COLUMNS = {
+    'Not_Started': 'not_started',
+    'In_Progress': 'in_progress',
+    'Completed': 'completed',
+}
+COUNTER_COLUMNS = ['total_tasks'] + list(STATUS_COLUMNS.values())
+
+
+class TaskRollupService:
+    @staticmethod
+    def apply_changes(session: Session, changes: Iterable[Tuple[TaskKey, TaskKey]]) -> None:
+        """Apply task (old_key, new_key) transitions to the counters in the caller's transaction.
+
+        All changes are folded into one delta per assignee and written with a
+        single multi-row upsert, so batch writes cost one statement.
+        """
+        stmt = TaskRollupService._upsert_statement(changes)
+        if stmt is not None:
+            session.execute(stmt)
+
+    @staticmethod
+    def _upsert_statement(changes: Iterable[Tuple[TaskKey, TaskKey]]):
+        """Build the counters upsert for `changes`, or None when there are none.
+
+        Every assignee a change touches (even an edit that keeps the status)
+        gets its `version` bumped, so list ETags see the write once it commits.
+        """
+        deltas: Dict[int, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNTER_COLUMNS, 0))
+        for old_key, new_key in changes:
+            for key, sign in ((old_key, -1), (new_key, 1)):
+                if key is None:
+                    continue
+                assignee_id, status = key
+                delta = deltas[assignee_id]
+                if old_key == new_key:
+                    continue
+                delta['total_tasks'] += sign
+                if status in STATUS_COLUMNS:
+                    delta[STATUS_COLUMNS[status]] += sign
+        if not deltas:
+            return None
+
+        rows = [
+            {'assignee_id': assignee_id, **delta, 'version': 1}
+            for assignee_id, delta in sorted(deltas.items())
+        ]
+        stmt = insert(TaskStatusCount).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[TaskStatusCount.assignee_id],
+            set_={
+                column: getattr(TaskStatusCount, column) + getattr(stmt.excluded, column)
+                for column in COUNTER_COLUMNS + ['version']
+            }
+        )
+
+    @staticmethod
+    def _version_select(assigned_to: Optional[str] = None):
+        """Sum of the counter versions, optionally of one assignee (0 when it has no row)"""
+        stmt = select(func.coalesce(func.sum(TaskStatusCount.version), 0))
+        if assigned_to:
+            stmt = stmt.where(TaskStatusCount.assignee_id == AssigneeService.id_clause(assigned_to))
+        return stmt
+
+    @staticmethod
+    def get_counts(session: Session) -> Tuple[dict, List[Row]]:
+        """Return global status counts and per-assignee rows (see _counts_select), most completed first"""
+        rows = session.execute(TaskRollupService._counts_select()).all()
+        return TaskRollupService._totals(rows), rows
+
+    @staticmethod
+    def _counts_select():
+        return (
+            select(
+                TaskStatusCount.assignee_id,
+                Assignee.name.label('assigned_to'),
+                *(getattr(TaskStatusCount, column) for column in COUNTER_COLUMNS)
+            )
+            .join(Assignee, Assignee.id == TaskStatusCount.assignee_id)
+            .where(TaskStatusCount.total_tasks > 0)
+            .order_by(TaskStatusCount.completed.desc(), Assignee.name)
+        )
+
+    @staticmethod
+    def _totals(rows: List[Row]) -> dict:
+        return {column: sum(getattr(row, column) for row in rows) for column in COUNTER_COLUMNS}
+
+    @staticmethod
+    def rebuild() -> int:
+        """Recompute all counters from `tasks`; returns the number of assignee rows.
+
+        Rows are zeroed rather than deleted and every version is bumped, so the
+        version sums keep increasing across a rebuild.
+        """
+        with SessionLocal() as session:
+            session.execute(text("LOCK TABLE task_status_counts IN EXCLUSIVE MODE"))
+            session.execute(
+                update(TaskStatusCount).values(
+                    **dict.fromkeys(COUNTER_COLUMNS, 0), version=TaskStatusCount.version + 1
+                )
+            )
+            grouped = session.query(
+                Task.assignee_id,
+                func.count(Task.id),
+                func.count(case((Task.status == 'Not_Started', 1))),
+                func.count(case((Task.status == 'In_Progress', 1))),
+                func.count(case((Task.status == 'Completed', 1)))
+            ).group_by(Task.assignee_id).all()
+            if grouped:
+                stmt = insert(TaskStatusCount).values([
+                    {
+                        'assignee_id': row[0],
+                        'total_tasks': row[1],
+                        'not_started': row[2],
+                        'in_progress': row[3],
+                        'completed': row[4],
+                        'version': 1,
+                    } for row in grouped
+                ])
+                session.execute(stmt.on_conflict_do_update(
+                    index_elements=[TaskStatusCount.assignee_id],
+                    set_={
+                        **{column: getattr(stmt.excluded, column) for column in COUNTER_COLUMNS},
+                        'version': TaskStatusCount.version,
+                    }
+                ))
+            session.commit()
+            return len(grouped)
+
+    @staticmethod
+    def check_consistency() -> List[str]:
+        """Compare counters with the `task_statistics` and `team_activity` views.
+
+        Returns a human-readable line per mismatch; an empty list means consistent.
+        """
+        mismatches = []
+        with SessionLocal() as session:
+            totals, rows = TaskRollupService.get_counts(session)
+
+            view_totals = session.execute(text(
+                "SELECT total_tasks, not_started, in_progress, completed FROM task_statistics"
+            )).mappings().one()
+            for column in COUNTER_COLUMNS:
+                if totals[column] != view_totals[column]:
+                    mismatches.append(
+                        f"statistics.{column}: rollup={totals[column]} view={view_totals[column]}"
+                    )
+
+            view_team = {
+                row['assignee_id']: row for row in session.execute(text(
+                    "SELECT assignee_id, total_tasks, completed_tasks, ongoing_tasks FROM team_activity"
+                )).mappings()
+            }
+            rollup_team = {row.assignee_id: row for row in rows}
+            for assignee_id in sorted(set(view_team) | set(rollup_team)):
+                rollup = rollup_team.get(assignee_id)
+                view = view_team.get(assignee_id)
+                pairs = (
+                    ('total_tasks', rollup.total_tasks if rollup else 0, view['total_tasks'] if view else 0),
+                    ('completed', rollup.completed if rollup else 0, view['completed_tasks'] if view else 0),
+                    ('in_progress', rollup.in_progress if rollup else 0, view['ongoing_tasks'] if view else 0),
+                )
+                for column, rollup_value, view_value in pairs:
+                    if rollup_value != view_value:
+                        mismatches.append(
+                            f"team_activity[{assignee_id}].{column}: rollup={rollup_value} view={view_value}"
+                        )
+        return mismatches
@@ -1,93 +1,505 @@
-from typing import Optional, List
+import re
+from typing import Optional, List, Tuple, Iterator
 from datetime import datetime
+from sqlalchemy import func, tuple_, select, insert, update, delete, text, column, literal
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models.task import Task
 from app.models.task_log import TaskLog
-from app.models.user import User
-from app.database.db import SessionLocal
+from app.database.session import get_session, get_read_session, open_read_session
+from app.services.assignee_service import AssigneeService
+from app.services.task_event_service import TaskEventService
+from app.services.task_rollup_service import STATUS_COLUMNS, TaskRollupService
+from app.utils.cache import mark_changed
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.serialization import compile_row_encoder
+
+class TaskVersionConflict(Exception):
+    """Raised when a task was changed since the version the client last read"""
+
+    def __init__(self, task_id: int, current_version: int):
+        super().__init__(f"Task {task_id} was modified by someone else (current version {current_version})")
+        self.task_id = task_id
+        self.current_version = current_version
+
+
+# Search terms are reduced to word characters so user input never reaches tsquery syntax
+_SEARCH_TERM = re.compile(r"\w+", re.UNICODE)
+SEARCH_MAX_TERMS = 8
+
+# Task.to_dict() fields, selected as plain rows by the list endpoints so they
+# skip ORM object construction
+TASK_ROW_COLUMNS = (
+    Task.id, Task.title, Task.description, Task.assigned_to, Task.assignee_id, Task.status, Task.priority,
+    Task.start_date, Task.due_date, Task.completed_date, Task.created_by,
+    Task.created_at, Task.updated_at, Task.version,
+)
+encode_task_row = compile_row_encoder(TASK_ROW_COLUMNS)
+
+# Allowed by the tasks table's CHECK constraints (statuses: STATUS_COLUMNS)
+TASK_PRIORITIES = ('Low', 'Medium', 'High')
+
+
+def _is_int(value) -> bool:
+    # JSON true / false arrive as bool, which is a subclass of int
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_choices(values: dict) -> dict:
+    """Raise ValueError unless `values` has a known status and priority, so a batch can
+    report the item instead of the whole statement failing on the CHECK constraint"""
+    if values["status"] not in STATUS_COLUMNS:
+        raise ValueError(f"status must be one of: {', '.join(STATUS_COLUMNS)}")
+    if values["priority"] not in TASK_PRIORITIES:
+        raise ValueError(f"priority must be one of: {', '.join(TASK_PRIORITIES)}")
+    return values
+
 
 class TaskService:
 
     @staticmethod
-    def get_all_tasks(status: Optional[str] = None, assigned_to: Optional[str] = None) -> List[Task]:
-        """Get all tasks with optional filters"""
-        with SessionLocal() as session:
-            query = session.query(Task)
-            if status:
-                query = query.filter(Task.status == status)
-            if assigned_to:
-                query = query.filter(Task.assigned_to == assigned_to)
-            return query.order_by(Task.created_at.desc()).all()
+    def _new_task_values(task_data: dict, user_id: int, assignee: Tuple[int, str]) -> dict:
+        """Column values for a new task assigned to the resolved (id, name).
 
-    @staticmethod
-    def get_task_by_id(task_id: int) -> Optional[Task]:
-        with SessionLocal() as session:
-            return session.query(Task).filter(Task.id == task_id).first()
+        Raises ValueError on malformed dates or an unknown status / priority.
+        """
+        return _check_choices({
+            "title": task_data.get("title"),
+            "description": task_data.get("description"),
+            "assignee_id": assignee[0],
+            "assigned_to": assignee[1],
+            "status": task_data.get("status", "Not_Started"),
+            "priority": task_data.get("priority", "Medium"),
+            "start_date": datetime.fromisoformat(task_data.get("start_date")) if task_data.get("start_date") else None,
+            "due_date": datetime.fromisoformat(task_data.get("due_date")) if task_data.get("due_date") else None,
+            "created_by": user_id
+        })
 
     @staticmethod
-    def create_task(task_data: dict, user_id: int) -> Optional[Task]:
-        with SessionLocal() as session:
-            task = Task(
-                title=task_data.get("title"),
-                description=task_data.get("description"),
-                assigned_to=task_data.get("assigned_to"),
-                status=task_data.get("status", "Not_Started"),
-                priority=task_data.get("priority", "Medium"),
-                start_date=datetime.fromisoformat(task_data.get("start_date")) if task_data.get("start_date") else None,
-                due_date=datetime.fromisoformat(task_data.get("due_date")) if task_data.get("due_date") else None,
-                created_by=user_id
-            )
-            session.add(task)
-            session.flush()
-            log = TaskLog(
-                task_id=task.id,
-                old_status=None,
-                new_status=task.status,
-                changed_by=user_id
-            )
-            session.add(log)
-            session.commit()
-            return task
+    def _updated_task_values(task: Task, task_data: dict, assignee: Optional[Tuple[int, str]]) -> dict:
+        """Column values of `task` after applying `task_data` and the resolved new assignee, if any.
 
-    @staticmethod
-    def update_task(task_id: int, task_data: dict, user_id: int) -> Optional[Task]:
-        with SessionLocal() as session:
-            task = session.query(Task).filter(Task.id == task_id).first()
-            if not task:
-                return None
-        old_status = task.status
-        task.title = task_data.get("title", task.title)
-        task.description = task_data.get("description", task.description)
-        task.assigned_to = task_data.get("assigned_to", task.assigned_to)
-        task.status = task_data.get("status", task.status)
-        task.priority = task_data.get("priority", task.priority)
+        Raises ValueError on malformed dates or an unknown status / priority.
+        """
+        assignee_id, assigned_to = assignee or (task.assignee_id, task.assigned_to)
+        values = {
+            "title": task_data.get("title", task.title),
+            "description": task_data.get("description", task.description),
+            "assignee_id": assignee_id,
+            "assigned_to": assigned_to,
+            "status": task_data.get("status", task.status),
+            "priority": task_data.get("priority", task.priority),
+            "start_date": task.start_date,
+            "due_date": task.due_date,
+            "completed_date": task.completed_date
+        }
         start_date = task_data.get("start_date")
         if start_date and isinstance(start_date, str):
-            task.start_date = datetime.fromisoformat(start_date)
+            values["start_date"] = datetime.fromisoformat(start_date)
         due_date = task_data.get("due_date")
         if due_date and isinstance(due_date, str):
-            task.due_date = datetime.fromisoformat(due_date)
-        if task.status == "Completed" and not task.completed_date:
-            task.completed_date = datetime.utcnow()
-        if old_status != task.status:
-            log = TaskLog(
-                task=task, 
-                old_status=old_status,
-                new_status=task.status,
-                changed_by=user_id,
-                change_reason=task_data.get("change_reason", f"Status changed from {old_status} to {task.status}")
+            values["due_date"] = datetime.fromisoformat(due_date)
+        if values["status"] == "Completed" and not values["completed_date"]:
+            values["completed_date"] = datetime.utcnow()
+        return _check_choices(values)
+
+    # --- Statement builders (shared with app.aio's async services) ---
+
+    @staticmethod
+    def _filter(stmt, status: Optional[str], assigned_to: Optional[str]):
+        if status:
+            stmt = stmt.where(Task.status == status)
+        if assigned_to:
+            stmt = stmt.where(Task.assignee_id == AssigneeService.id_clause(assigned_to))
+        return stmt
+
+    @staticmethod
+    def _list_select(status: Optional[str], assigned_to: Optional[str], columns=(Task,)):
+        stmt = TaskService._filter(select(*columns), status, assigned_to)
+        return stmt.order_by(Task.created_at.desc(), Task.id.desc())
+
+    @staticmethod
+    def _page_select(
+        status: Optional[str], assigned_to: Optional[str], limit: int, cursor: Optional[str], columns=(Task,)
+    ):
+        stmt = TaskService._list_select(status, assigned_to, columns)
+        if cursor:
+            created_at, task_id = decode_cursor(cursor)
+            stmt = stmt.where(tuple_(Task.created_at, Task.id) < tuple_(created_at, task_id))
+        return stmt.limit(limit + 1)
+
+    @staticmethod
+    def _split_page(tasks: List[Task], limit: int) -> Tuple[List[Task], Optional[str]]:
+        if len(tasks) <= limit:
+            return tasks, None
+        tasks = tasks[:limit]
+        return tasks, encode_cursor(tasks[-1].created_at, tasks[-1].id)
+
+    @staticmethod
+    def _task_stamp_select(task_id: int):
+        return select(Task.id, Task.version, Task.updated_at).where(Task.id == task_id)
+
+    @staticmethod
+    def _search_select(q: str, status: Optional[str], assigned_to: Optional[str], limit: int, offset: int):
+        """Ranked full-text match; every term is prefix-matched and all must occur.
+
+        Raises ValueError when `q` contains no searchable terms.
+        """
+        terms = _SEARCH_TERM.findall(q.lower())[:SEARCH_MAX_TERMS]
+        if not terms:
+            raise ValueError("q must contain at least one word")
+        query = func.to_tsquery('simple', literal(' & '.join(f"{term}:*" for term in terms)))
+        rank = func.ts_rank_cd(Task.search_vector, query).label("rank")
+        stmt = (
+            select(Task, rank)
+            .where(Task.search_vector.op('@@')(query))
+            .order_by(rank.desc(), Task.id.desc())
+            .limit(limit + 1)
+            .offset(offset)
+        )
+        return TaskService._filter(stmt, status, assigned_to)
+
+    @staticmethod
+    def _creation_log(task: Task, user_id: int) -> TaskLog:
+        return TaskLog(
+            task_id=task.id, assignee_id=task.assignee_id, old_status=None, new_status=task.status, changed_by=user_id
+        )
+
+    @staticmethod
+    def _update_statement(
+        task_id: int, task_data: dict, user_id: int, expected_version: Optional[int],
+        assignee: Optional[Tuple[int, str]] = None
+    ):
+        """Build the single-statement update (see update_task); returns (statement, params).
+
+        `assignee` is the resolved (id, name) of a new assigned_to.
+        """
+        params = {"id": task_id, "now": datetime.utcnow(), "user_id": user_id,
+                  "reason": task_data.get("change_reason")}
+        assignments = []
+        for name in ("title", "description", "status", "priority"):
+            if name in task_data:
+                assignments.append(f"{name} = :{name}")
+                params[name] = task_data[name]
+        if assignee is not None:
+            assignments.extend(("assignee_id = :assignee_id", "assigned_to = :assigned_to"))
+            params["assignee_id"], params["assigned_to"] = assignee
+        for name in ("start_date", "due_date"):
+            value = task_data.get(name)
+            if value and isinstance(value, str):
+                assignments.append(f"{name} = :{name}")
+                params[name] = datetime.fromisoformat(value)
+        # Typed explicitly so drivers that prepare server-side (asyncpg) deduce one type for :status
+        new_status = "CAST(:status AS VARCHAR)" if "status" in task_data else "t.status"
+        version_filter = ""
+        if expected_version is not None:
+            version_filter = "AND version = :version"
+            params["version"] = expected_version
+
+        stmt = text(f"""
+            WITH old AS (
+                SELECT id, status, assignee_id, assigned_to FROM tasks
+                WHERE id = :id {version_filter}
+                FOR UPDATE
+            ), upd AS (
+                UPDATE tasks t SET
+                    {''.join(a + ', ' for a in assignments)}
+                    completed_date = CASE
+                        WHEN {new_status} = 'Completed' AND t.completed_date IS NULL THEN :now
+                        ELSE t.completed_date END,
+                    updated_at = :now,
+                    version = t.version + 1
+                FROM old
+                WHERE t.id = old.id
+                RETURNING t.*, old.status AS old_status, old.assignee_id AS old_assignee_id,
+                          old.assigned_to AS old_assigned_to
+            ), log AS (
+                INSERT INTO task_logs (task_id, assignee_id, old_status, new_status, changed_by, change_reason, changed_at)
+                SELECT id, assignee_id, old_status, status, :user_id,
+                       COALESCE(:reason, 'Status changed from ' || old_status || ' to ' || status), :now
+                FROM upd
+                WHERE old_status IS DISTINCT FROM status
             )
-            session.add(log)
-        session.commit()
-        session.refresh(task)
+            SELECT * FROM upd
+        """).columns(*Task.__table__.columns, column("old_status"), column("old_assignee_id"), column("old_assigned_to"))
+
+        orm_stmt = (
+            select(Task, column("old_status"), column("old_assignee_id"), column("old_assigned_to"))
+            .from_statement(stmt)
+            .execution_options(populate_existing=True)
+        )
+        return orm_stmt, params
+
+    # --- Service methods ---
+
+    @staticmethod
+    def get_all_tasks(status: Optional[str] = None, assigned_to: Optional[str] = None) -> List[Row]:
+        """Get all tasks with optional filters, as TASK_ROW_COLUMNS rows (see encode_task_row)"""
+        return get_read_session().execute(TaskService._list_select(status, assigned_to, TASK_ROW_COLUMNS)).all()
+
+    @staticmethod
+    def iter_tasks(
+        status: Optional[str] = None,
+        assigned_to: Optional[str] = None,
+        batch_size: int = 500,
+    ) -> Iterator[Row]:
+        """Yield task rows with optional filters, fetched in batches over a server-side cursor.
+
+        Uses its own session because the generator is consumed while the
+        response streams, after the request-scoped session has been closed.
+        """
+        with open_read_session() as session:
+            stmt = TaskService._list_select(status, assigned_to, TASK_ROW_COLUMNS).execution_options(yield_per=batch_size)
+            for row in session.execute(stmt):
+                yield row
+
+    @staticmethod
+    def get_tasks_page(
+        status: Optional[str] = None,
+        assigned_to: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Row], Optional[str]]:
+        """Get one page of task rows, newest first, keyed on (created_at, id).
+
+        Returns the page and the cursor for the next one (None on the last page).
+        Raises ValueError if the cursor cannot be decoded.
+        """
+        stmt = TaskService._page_select(status, assigned_to, limit, cursor, TASK_ROW_COLUMNS)
+        return TaskService._split_page(get_read_session().execute(stmt).all(), limit)
+
+    @staticmethod
+    def search_tasks(
+        q: str,
+        status: Optional[str] = None,
+        assigned_to: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Tuple[List[Tuple[Task, float]], bool]:
+        """Full-text search over title and description, best match first.
+
+        Returns (task, rank) pairs and whether more results follow.
+        Raises ValueError when `q` has no searchable terms.
+        """
+        rows = get_read_session().execute(TaskService._search_select(q, status, assigned_to, limit, offset)).all()
+        return [tuple(row) for row in rows[:limit]], len(rows) > limit
+
+    @staticmethod
+    def get_collection_version(assigned_to: Optional[str] = None) -> int:
+        """Version of the task list, optionally of one assignee's tasks.
+
+        The sum of the rollup versions, which every task write bumps in its own
+        transaction: a reader sees the new value exactly when it can see the
+        write. Read it before the tasks it versions.
+        """
+        return get_read_session().scalar(TaskRollupService._version_select(assigned_to))
+
+    @staticmethod
+    def get_task_stamp(task_id: int):
+        """Return the (id, version, updated_at) row of a task without loading it, or None"""
+        return get_read_session().execute(TaskService._task_stamp_select(task_id)).first()
+
+    @staticmethod
+    def get_task_by_id(task_id: int) -> Optional[Task]:
+        return get_read_session().get(Task, task_id)
+
+    @staticmethod
+    def create_task(task_data: dict, user_id: int) -> Optional[Task]:
+        session = get_session()
+        assignee = AssigneeService.resolve_one(session, task_data.get("assigned_to"))
+        task = Task(**TaskService._new_task_values(task_data, user_id, assignee))
+        session.add(task)
+        session.flush()
+        session.add(TaskService._creation_log(task, user_id))
+        TaskRollupService.apply_changes(session, [(None, (task.assignee_id, task.status))])
+        TaskEventService.record(session, [TaskEventService.task_created(task)])
+        mark_changed(session, 'tasks')
+        session.flush()
+        return task
+
+    @staticmethod
+    def update_task(
+        task_id: int, task_data: dict, user_id: int, expected_version: Optional[int] = None
+    ) -> Optional[Task]:
+        """Update a task in one round trip, logging a status change in the same statement.
+
+        With `expected_version`, the update applies only if the stored version
+        still matches; otherwise TaskVersionConflict is raised. Returns None if
+        the task does not exist. Raises ValueError on malformed dates.
+        """
+        session = get_session()
+        assignee = None
+        if task_data.get("assigned_to"):
+            assignee = AssigneeService.resolve_one(session, task_data["assigned_to"])
+        stmt, params = TaskService._update_statement(task_id, task_data, user_id, expected_version, assignee)
+        row = session.execute(stmt, params).first()
+        if row is None:
+            current = session.scalar(select(Task.version).where(Task.id == task_id))
+            if current is None:
+                return None
+            raise TaskVersionConflict(task_id, current)
+
+        task, old_status, old_assignee_id, old_assigned_to = row
+        TaskRollupService.apply_changes(session, [((old_assignee_id, old_status), (task.assignee_id, task.status))])
+        TaskEventService.record(session, [TaskEventService.task_updated(task, old_status, old_assigned_to)])
+        mark_changed(session, 'tasks')
         return task
 
     @staticmethod
     def delete_task(task_id: int) -> bool:
-        with SessionLocal() as session:
-            task = session.query(Task).filter(Task.id == task_id).first()
-            if not task:
-                return False
-            session.delete(task)
-            session.commit()
-            return True
+        session = get_session()
+        task = session.get(Task, task_id)
+        if not task:
+            return False
+        TaskRollupService.apply_changes(session, [((task.assignee_id, task.status), None)])
+        TaskEventService.record(session, [TaskEventService.task_deleted(task.id, task.assigned_to, task.status)])
+        session.delete(task)
+        mark_changed(session, 'tasks')
+        session.flush()
+        return True
+
+    @staticmethod
+    def apply_batch(creates: List[dict], updates: List[dict], deletes: List[int], user_id: int) -> dict:
+        """Apply many creates, updates and deletes in a single transaction.
+
+        Each kind of operation is executed as one bulk statement (multi-row
+        INSERT ... RETURNING, executemany UPDATE, DELETE ... RETURNING) and all
+        resulting task_logs rows are written with one multi-row insert.
+        Update items carrying `version` are rejected when it is stale.
+        Invalid items are reported in the per-item results and skipped; the
+        valid ones are committed together with the request.
+        """
+        return TaskService._apply_batch(get_session(), creates, updates, deletes, user_id)
+
+    @staticmethod
+    def _apply_batch(session: Session, creates: List[dict], updates: List[dict], deletes: List[int], user_id: int) -> dict:
+        results = {"create": [], "update": [], "delete": []}
+        log_rows = []
+        rollup_changes = []
+        events = []
+
+        # Every assignee named in the batch is resolved with one upsert
+        names = [
+            data["assigned_to"] for data in creates + updates
+            if isinstance(data.get("assigned_to"), str) and data["assigned_to"].strip()
+        ]
+        assignees = AssigneeService.resolve(session, names) if names else {}
+
+        # --- Creates ---
+        create_items = []
+        for index, data in enumerate(creates):
+            assignee = assignees.get(data["assigned_to"]) if isinstance(data.get("assigned_to"), str) else None
+            if not data.get("title") or assignee is None:
+                results["create"].append({"index": index, "success": False, "message": "Title and assigned_to are required"})
+                continue
+            try:
+                create_items.append((index, TaskService._new_task_values(data, user_id, assignee)))
+            except ValueError as e:
+                results["create"].append({"index": index, "success": False, "message": str(e)})
+        if create_items:
+            created = session.scalars(
+                insert(Task).returning(Task, sort_by_parameter_order=True),
+                [values for _, values in create_items]
+            ).all()
+            for (index, _), task in zip(create_items, created):
+                log_rows.append({
+                    "task_id": task.id,
+                    "assignee_id": task.assignee_id,
+                    "old_status": None,
+                    "new_status": task.status,
+                    "changed_by": user_id,
+                    "change_reason": None
+                })
+                rollup_changes.append((None, (task.assignee_id, task.status)))
+                events.append(TaskEventService.task_created(task))
+                results["create"].append({"index": index, "success": True, "data": task.to_dict()})
+
+        # --- Updates ---
+        update_ids = [data.get("id") for data in updates if _is_int(data.get("id"))]
+        current = {
+            task.id: task for task in session.scalars(
+                select(Task).where(Task.id.in_(update_ids)).with_for_update()
+            )
+        } if update_ids else {}
+        update_params = []
+        updated_tasks = []
+        now = datetime.utcnow()
+        for index, data in enumerate(updates):
+            task = current.get(data.get("id")) if _is_int(data.get("id")) else None
+            if task is None:
+                results["update"].append({"index": index, "id": data.get("id"), "success": False, "message": "Task not found"})
+                continue
+            if data.get("version") is not None and not _is_int(data["version"]):
+                results["update"].append({"index": index, "id": task.id, "success": False, "message": "version must be an integer"})
+                continue
+            if data.get("version") is not None and data["version"] != task.version:
+                results["update"].append({
+                    "index": index, "id": task.id, "success": False,
+                    "message": "Version conflict", "current_version": task.version
+                })
+                continue
+            assignee = assignees.get(data["assigned_to"]) if isinstance(data.get("assigned_to"), str) else None
+            if data.get("assigned_to") and assignee is None:
+                results["update"].append({"index": index, "id": task.id, "success": False, "message": "assigned_to must be a non-blank string"})
+                continue
+            try:
+                values = TaskService._updated_task_values(task, data, assignee)
+            except ValueError as e:
+                results["update"].append({"index": index, "id": task.id, "success": False, "message": str(e)})
+                continue
+            values["updated_at"] = now
+            values["version"] = task.version + 1
+            old_status = task.status
+            old_assigned_to = task.assigned_to
+            rollup_changes.append(((task.assignee_id, task.status), (values["assignee_id"], values["status"])))
+            if old_status != values["status"]:
+                log_rows.append({
+                    "task_id": task.id,
+                    "assignee_id": values["assignee_id"],
+                    "old_status": old_status,
+                    "new_status": values["status"],
+                    "changed_by": user_id,
+                    "change_reason": data.get("change_reason", f"Status changed from {old_status} to {values['status']}")
+                })
+            # Keep the loaded instance in step without flushing it; the bulk UPDATE below persists it
+            for column, value in values.items():
+                set_committed_value(task, column, value)
+            update_params.append({"id": task.id, **values})
+            updated_tasks.append((index, task))
+            events.append(TaskEventService.task_updated(task, old_status, old_assigned_to))
+        if update_params:
+            session.execute(update(Task), update_params)
+            for index, task in updated_tasks:
+                results["update"].append({"index": index, "id": task.id, "success": True, "data": task.to_dict()})
+
+        # --- Deletes ---
+        delete_ids = [task_id for task_id in deletes if _is_int(task_id)]
+        deleted = {}
+        if delete_ids:
+            rows = session.execute(
+                delete(Task.__table__)
+                .where(Task.id.in_(delete_ids))
+                .returning(Task.id, Task.assignee_id, Task.assigned_to, Task.status)
+            ).all()
+            deleted = {row.id: row for row in rows}
+        for index, task_id in enumerate(deletes):
+            row = deleted.pop(task_id, None) if _is_int(task_id) else None
+            if row is None:
+                results["delete"].append({"index": index, "id": task_id, "success": False, "message": "Task not found"})
+                continue
+            rollup_changes.append(((row.assignee_id, row.status), None))
+            events.append(TaskEventService.task_deleted(row.id, row.assigned_to, row.status))
+            results["delete"].append({"index": index, "id": task_id, "success": True})
+
+        if log_rows:
+            session.execute(insert(TaskLog), log_rows)
+        TaskRollupService.apply_changes(session, rollup_changes)
+        TaskEventService.record(session, events)
+        if rollup_changes:
+            mark_changed(session, 'tasks')
+        session.flush()
+
+        for kind in results:
+            results[kind].sort(key=lambda item: item["index"])
+        return results
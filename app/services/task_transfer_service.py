@@ -0,0 +1,335 @@
+import csv
+import io
+import time
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, text
+from sqlalchemy.exc import DataError
+from sqlalchemy.orm import Session
+from app.database.copy import CopyOut, copy_in, render
+from app.database.replicas import read_engine
+from app.models.task import Task
+from app.models.task_log import TaskLog
+from app.services.task_event_service import TaskEventService
+from app.services.task_log_service import TASK_LOG_ROW_COLUMNS
+from app.services.task_rollup_service import STATUS_COLUMNS
+from app.services.task_service import TaskService, TASK_PRIORITIES, TASK_ROW_COLUMNS
+from app.utils.cache import mark_changed
+from app.utils.serialization import loads
+
+TRANSFER_FORMATS = ('csv', 'ndjson')
+
+# Fields an import may set; the rest of an export's columns (ids, counters,
+# timestamps owned by the server) are accepted so exports re-import as-is, but ignored
+IMPORT_COLUMNS = (
+    'title', 'description', 'assigned_to', 'status', 'priority',
+    'start_date', 'due_date', 'completed_date', 'created_at',
+)
+IGNORED_COLUMNS = ('id', 'assignee_id', 'created_by', 'updated_at', 'version')
+STAGING_COLUMNS = IMPORT_COLUMNS + IGNORED_COLUMNS
+
+# Every column is text so COPY accepts any row; values are checked and cast set-wise afterwards
+_STAGING_TABLE = text(
+    "CREATE TEMP TABLE task_import (row_number BIGSERIAL, "
+    + ', '.join(f"{name} TEXT" for name in STAGING_COLUMNS)
+    + ") ON COMMIT DROP;"
+    " CREATE TEMP TABLE task_import_ids (id INTEGER PRIMARY KEY) ON COMMIT DROP"
+)
+
+# Same normalization as app.models.assignee.name_key
+_ASSIGNEE_NAME = r"regexp_replace(btrim(assigned_to), '\s+', ' ', 'g')"
+_ASSIGNEE_KEY = f"lower({_ASSIGNEE_NAME})"
+
+
+def _sql_list(values) -> str:
+    return ', '.join(f"'{value}'" for value in values)
+
+
+_FIRST_INVALID_ROW = text(f"""
+    SELECT row_number, problem FROM (
+        SELECT row_number, CASE
+            WHEN NULLIF(btrim(title), '') IS NULL THEN 'title is required'
+            WHEN length(title) > 200 THEN 'title is longer than 200 characters'
+            WHEN NULLIF(btrim(assigned_to), '') IS NULL THEN 'assigned_to is required'
+            WHEN length({_ASSIGNEE_NAME}) > 100 THEN 'assigned_to is longer than 100 characters'
+            WHEN COALESCE(NULLIF(btrim(status), ''), 'Not_Started') NOT IN ({_sql_list(STATUS_COLUMNS)})
+                THEN 'status must be one of: {', '.join(STATUS_COLUMNS)}'
+            WHEN COALESCE(NULLIF(btrim(priority), ''), 'Medium') NOT IN ({_sql_list(TASK_PRIORITIES)})
+                THEN 'priority must be one of: {', '.join(TASK_PRIORITIES)}'
+        END AS problem
+        FROM task_import
+    ) checked
+    WHERE problem IS NOT NULL
+    ORDER BY row_number
+    LIMIT 1
+""")
+
+# The first spelling of a new name (in file order) becomes the canonical one.
+# Known names are filtered out first so they do not use up sequence values.
+_ASSIGNEES_INSERT = text(f"""
+    INSERT INTO assignees (name, name_key, created_at)
+    SELECT DISTINCT ON (name_key) name, name_key, :now
+    FROM (SELECT row_number, {_ASSIGNEE_NAME} AS name, {_ASSIGNEE_KEY} AS name_key FROM task_import) named
+    WHERE NOT EXISTS (SELECT 1 FROM assignees a WHERE a.name_key = named.name_key)
+    ORDER BY name_key, row_number
+    ON CONFLICT (name_key) DO NOTHING
+""")
+
+_TASK_FIELDS = ', '.join(column.key for column in TASK_ROW_COLUMNS)
+
+# One statement writes the tasks, their creation logs and the counter deltas,
+# and keeps the new ids for the change feed events. Creation logs are stamped with the task's created_at
+# so imported history lands on the right day in the trend rollups.
+_MERGE = text(f"""
+    WITH src AS (
+        SELECT
+            i.row_number,
+            i.title,
+            NULLIF(i.description, '') AS description,
+            a.id AS assignee_id,
+            a.name AS assigned_to,
+            COALESCE(NULLIF(btrim(i.status), ''), 'Not_Started') AS status,
+            COALESCE(NULLIF(btrim(i.priority), ''), 'Medium') AS priority,
+            NULLIF(btrim(i.start_date), '')::timestamp AS start_date,
+            NULLIF(btrim(i.due_date), '')::timestamp AS due_date,
+            NULLIF(btrim(i.completed_date), '')::timestamp AS completed_date,
+            COALESCE(NULLIF(btrim(i.created_at), '')::timestamp, :now) AS created_at
+        FROM task_import i
+        JOIN assignees a ON a.name_key = {_ASSIGNEE_KEY}
+    ), ins AS (
+        INSERT INTO tasks (
+            title, description, assignee_id, assigned_to, status, priority,
+            start_date, due_date, completed_date, created_by, created_at, updated_at, version
+        )
+        SELECT
+            title, description, assignee_id, assigned_to, status, priority, start_date, due_date,
+            CASE WHEN status = 'Completed' THEN COALESCE(completed_date, :now) ELSE completed_date END,
+            :user_id, created_at, :now, 1
+        FROM src
+        ORDER BY row_number
+        RETURNING {_TASK_FIELDS}
+    ), logs AS (
+        INSERT INTO task_logs (task_id, assignee_id, old_status, new_status, changed_by, changed_at)
+        SELECT id, assignee_id, NULL, status, :user_id, created_at FROM ins
+    ), counts AS (
+        INSERT INTO task_status_counts (assignee_id, total_tasks, not_started, in_progress, completed, version)
+        SELECT
+            assignee_id,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE status = 'Not_Started'),
+            COUNT(*) FILTER (WHERE status = 'In_Progress'),
+            COUNT(*) FILTER (WHERE status = 'Completed'),
+            1
+        FROM ins
+        GROUP BY assignee_id
+        ON CONFLICT (assignee_id) DO UPDATE SET
+            total_tasks = task_status_counts.total_tasks + excluded.total_tasks,
+            not_started = task_status_counts.not_started + excluded.not_started,
+            in_progress = task_status_counts.in_progress + excluded.in_progress,
+            completed = task_status_counts.completed + excluded.completed,
+            version = task_status_counts.version + 1
+    ), imported AS (
+        INSERT INTO task_import_ids (id) SELECT id FROM ins
+    )
+    SELECT COUNT(*) FROM ins
+""")
+
+# Queued with TaskEventService.record_statement, so the change feed events are
+# written at commit: the event order lock is not held during the merge
+_EVENTS_INSERT = text(f"""
+    INSERT INTO task_events (event_type, task_id, payload, created_at)
+    SELECT 'task.created', t.id, jsonb_build_object('task', to_jsonb(t)), :now
+    FROM (SELECT {_TASK_FIELDS} FROM tasks JOIN task_import_ids USING (id)) t
+    ORDER BY t.id
+""")
+
+
+class TaskImportTooLarge(Exception):
+    """Raised when an import body exceeds the configured size limit"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Import is limited to {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+class _LimitedReader:
+    """read() / readline() over a binary stream, failing once more than `max_bytes` were read"""
+
+    def __init__(self, stream, max_bytes: Optional[int]):
+        self._stream = stream
+        self._max_bytes = max_bytes
+        self.bytes_read = 0
+
+    def _counted(self, data: bytes) -> bytes:
+        self.bytes_read += len(data)
+        if self._max_bytes and self.bytes_read > self._max_bytes:
+            raise TaskImportTooLarge(self._max_bytes)
+        return data
+
+    def read(self, size: int = -1) -> bytes:
+        return self._counted(self._stream.read(size))
+
+    def readline(self) -> bytes:
+        return self._counted(self._stream.readline())
+
+
+class _NdjsonAsCsv:
+    """Translate NDJSON objects into COPY CSV rows (STAGING_COLUMNS order) as COPY reads them"""
+
+    def __init__(self, reader: _LimitedReader):
+        self._reader = reader
+        self._buffer = bytearray()
+        self._out = io.StringIO()
+        self._writer = csv.writer(self._out, lineterminator='\n')
+        self._row = 0
+        self._done = False
+
+    def _row_values(self, line: bytes) -> list:
+        self._row += 1
+        try:
+            item = loads(line)
+        except ValueError:
+            raise ValueError(f"Row {self._row}: invalid JSON")
+        if not isinstance(item, dict):
+            raise ValueError(f"Row {self._row}: expected a JSON object")
+        unknown = item.keys() - set(STAGING_COLUMNS)
+        if unknown:
+            raise ValueError(f"Row {self._row}: unknown field(s): {', '.join(sorted(unknown))}")
+        values = []
+        for name in STAGING_COLUMNS:
+            value = item.get(name)
+            if isinstance(value, (dict, list)):
+                raise ValueError(f"Row {self._row}: {name} must be a string, number or null")
+            values.append(value)
+        return values
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._done and (size < 0 or len(self._buffer) < size):
+            line = self._reader.readline()
+            if not line:
+                self._done = True
+                break
+            if line.strip():
+                self._writer.writerow(self._row_values(line))
+                self._buffer += self._out.getvalue().encode()
+                self._out.seek(0)
+                self._out.truncate()
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def _csv_header(reader: _LimitedReader) -> list:
+    """Read and check the header line of a CSV import; returns its column names"""
+    line = reader.readline().decode('utf-8-sig')
+    names = [name.strip() for name in next(csv.reader([line]), [])]
+    if not any(names):
+        raise ValueError("CSV import needs a header line")
+    unknown = [name for name in names if name not in STAGING_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+    if len(set(names)) != len(names):
+        raise ValueError("Duplicate columns in CSV header")
+    missing = [name for name in ('title', 'assigned_to') if name not in names]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+    return names
+
+
+def _copy_out_sql(statement, fmt: str) -> str:
+    if fmt == 'csv':
+        return f"COPY ({render(statement)}) TO STDOUT WITH (FORMAT csv, HEADER true)"
+    # One JSON document per row. CSV format with quote and delimiter characters
+    # that JSON always escapes, so the documents are written verbatim (text
+    # format would double their backslashes).
+    return (
+        f"COPY (SELECT row_to_json(r) FROM ({render(statement)}) r) "
+        f"TO STDOUT WITH (FORMAT csv, QUOTE E'\\x01', DELIMITER E'\\x02')"
+    )
+
+
+class TaskTransferService:
+    @staticmethod
+    def import_tasks(
+        session: Session,
+        source,
+        fmt: str,
+        user_id: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        statement_timeout_ms: Optional[int] = None,
+    ) -> dict:
+        """Create tasks from a CSV (with header) or NDJSON byte stream in the session's transaction.
+
+        The body is streamed through COPY FROM STDIN into a temporary staging
+        table, checked, and merged into `tasks` together with the creation
+        logs, counters and change feed events, all set-wise. Memory use does
+        not depend on the file size. The import is all-or-nothing: the first
+        invalid row raises ValueError (TaskImportTooLarge past `max_bytes`)
+        and the caller rolls back. Returns the row count and rows/sec.
+        """
+        if fmt not in TRANSFER_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(TRANSFER_FORMATS)}")
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        if statement_timeout_ms is not None:
+            session.execute(text(f"SET LOCAL statement_timeout = {int(statement_timeout_ms)}"))
+        session.execute(_STAGING_TABLE)
+
+        reader = _LimitedReader(source, max_bytes)
+        if fmt == 'csv':
+            columns, copy_source = _csv_header(reader), reader
+        else:
+            columns, copy_source = STAGING_COLUMNS, _NdjsonAsCsv(reader)
+        copied = copy_in(session, f"COPY task_import ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", copy_source)
+
+        imported = 0
+        if copied:
+            session.execute(text("ANALYZE task_import"))
+            invalid = session.execute(_FIRST_INVALID_ROW).first()
+            if invalid is not None:
+                raise ValueError(f"Row {invalid.row_number}: {invalid.problem}")
+            session.execute(_ASSIGNEES_INSERT, {'now': now})
+            try:
+                imported = session.execute(_MERGE, {'now': now, 'user_id': user_id}).scalar_one()
+            except DataError as e:
+                raise ValueError(f"Invalid value: {e.orig.diag.message_primary if e.orig else e}")
+            TaskEventService.record_statement(session, _EVENTS_INSERT, {'now': now})
+            mark_changed(session, 'tasks')
+
+        seconds = time.perf_counter() - started
+        return {
+            'imported': imported,
+            'bytes': reader.bytes_read,
+            'seconds': round(seconds, 3),
+            'rows_per_second': round(imported / seconds) if seconds else None
+        }
+
+    @staticmethod
+    def export_tasks(
+        fmt: str,
+        status: Optional[str] = None,
+        assigned_to: Optional[str] = None,
+        statement_timeout_ms: Optional[int] = None,
+    ) -> CopyOut:
+        """Tasks (TASK_ROW_COLUMNS, by id) as a COPY TO STDOUT stream of CSV or NDJSON chunks.
+
+        Read from a replica when the current request may use one (see app.database.replicas).
+        """
+        if fmt not in TRANSFER_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(TRANSFER_FORMATS)}")
+        stmt = TaskService._filter(select(*TASK_ROW_COLUMNS), status, assigned_to).order_by(Task.id)
+        return CopyOut(_copy_out_sql(stmt, fmt), statement_timeout_ms=statement_timeout_ms, engine=read_engine())
+
+    @staticmethod
+    def export_logs(
+        fmt: str, task_id: Optional[int] = None, statement_timeout_ms: Optional[int] = None
+    ) -> CopyOut:
+        """Task logs (TASK_LOG_ROW_COLUMNS, oldest first) as a COPY TO STDOUT stream"""
+        if fmt not in TRANSFER_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(TRANSFER_FORMATS)}")
+        stmt = select(*TASK_LOG_ROW_COLUMNS).order_by(TaskLog.changed_at, TaskLog.id)
+        if task_id is not None:
+            stmt = stmt.where(TaskLog.task_id == task_id)
+        return CopyOut(_copy_out_sql(stmt, fmt), statement_timeout_ms=statement_timeout_ms, engine=read_engine())
@@ -0,0 +1,109 @@
+import pickle
+import threading
+import time
+from typing import Any, Optional
+from sqlalchemy import event
+from app.config import Config
+from sqlalchemy.orm import Session
+
+
+class LocalCache:
+    """Thread-safe in-process cache with per-entry TTL and integer version counters"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                now = time.monotonic()
+                for stale in [k for k, (expires_at, _) in self._entries.items() if expires_at < now]:
+                    del self._entries[stale]
+                while len(self._entries) >= self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class RedisCache:
+    """Cache shared by all workers; version bumps are visible to every process immediately"""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('CACHE_REDIS_URL is set but the redis package is not installed')
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self._client.get(key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self._client.setex(key, ttl, pickle.dumps(value))
+
+    def get_counter(self, key: str) -> int:
+        raw = self._client.get(key)
+        return int(raw) if raw is not None else 0
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(key)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the configured cache backend (Redis when CACHE_REDIS_URL is set)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = RedisCache(Config.CACHE_REDIS_URL) if Config.CACHE_REDIS_URL else LocalCache()
+    return _cache
+
+
+def get_version(namespace: str) -> int:
+    """Current version of a data namespace; bumped whenever it changes"""
+    return get_cache().get_counter(f"version:{namespace}")
+
+
+def mark_changed(session, namespace: str) -> None:
+    """Bump `namespace`'s version once the session's current transaction commits"""
+    session.info.setdefault('changed_namespaces', set()).add(namespace)
+
+
+# Registered on the Session class so sync sessions and the sync sessions behind
+# AsyncSession both bump versions
+@event.listens_for(Session, 'after_commit')
+def _bump_changed_versions(session):
+    for namespace in session.info.pop('changed_namespaces', ()):
+        get_cache().incr(f"version:{namespace}")
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_versions(session):
+    session.info.pop('changed_namespaces', None)
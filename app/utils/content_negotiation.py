@@ -0,0 +1,111 @@
+import gzip
+import zlib
+from typing import Iterable, Iterator
+from flask import Flask, Response, g, request
+from app.utils.serialization import MSGPACK_MIMETYPE, loads, msgpack, packb
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip is offered when it is not installed
+    brotli = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPES = (MSGPACK_MIMETYPE, 'application/x-msgpack')
+COMPRESSIBLE_MIMETYPES = (JSON_MIMETYPE, MSGPACK_MIMETYPE, 'text/csv', 'application/x-ndjson')
+
+
+def _preferred_format() -> str:
+    if msgpack is None:
+        return JSON_MIMETYPE
+    best = request.accept_mimetypes.best_match((JSON_MIMETYPE,) + MSGPACK_MIMETYPES)
+    return MSGPACK_MIMETYPE if best in MSGPACK_MIMETYPES else JSON_MIMETYPE
+
+
+def _preferred_encoding():
+    return request.accept_encodings.best_match(('br', 'gzip') if brotli is not None else ('gzip',))
+
+
+def _compress(body: bytes, encoding: str, config) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=config['COMPRESS_BROTLI_QUALITY'])
+    return gzip.compress(body, compresslevel=config['COMPRESS_LEVEL'], mtime=0)
+
+
+def _compress_stream(chunks: Iterable, encoding: str, config) -> Iterator[bytes]:
+    # Every chunk is flushed so clients can start parsing before the stream ends
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=config['COMPRESS_BROTLI_QUALITY'])
+        compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)
+        compress, finish = compressor.compress, compressor.flush
+        flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            data = compress(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        # Closes the wrapped generator (and its database cursor) on disconnect
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def _weaken_etag(response: Response) -> None:
+    # The transformed body is a different representation of the same data
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def negotiate_response(response: Response, config) -> Response:
+    """Re-encode a JSON response as MessagePack and/or compress it, per Accept / Accept-Encoding"""
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    if response.status_code in (204, 304) or response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return response
+
+    if (g.get('response_format') == MSGPACK_MIMETYPE and response.mimetype == JSON_MIMETYPE
+            and not response.is_streamed):
+        # Bodies built by jsonify / the response cache; large lists are packed
+        # directly by json_response. Streamed lists stay JSON.
+        response.set_data(packb(loads(response.get_data())))
+        response.mimetype = MSGPACK_MIMETYPE
+    if response.mimetype == MSGPACK_MIMETYPE:
+        _weaken_etag(response)
+
+    encoding = _preferred_encoding()
+    if encoding is None or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding, config)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(_compress(body, encoding, config))
+    response.headers['Content-Encoding'] = encoding
+    _weaken_etag(response)
+    return response
+
+
+def init_app(app: Flask, blueprints: Iterable[str]) -> None:
+    """Negotiate MessagePack and gzip/brotli for the named blueprints' responses.
+
+    Register before the session hooks so compression runs after the commit.
+    """
+    names = frozenset(blueprints)
+
+    @app.before_request
+    def _choose_format():
+        if request.blueprint in names:
+            g.response_format = _preferred_format()
+
+    @app.after_request
+    def _encode_response(response):
+        if request.blueprint not in names:
+            return response
+        return negotiate_response(response, app.config)
@@ -0,0 +1,127 @@
+import logging
+import queue
+import select
+import threading
+import time
+from typing import Optional
+from app.database.db import get_engine
+from app.services.task_event_service import CHANNEL, TaskEventService
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriptionOverflow(Exception):
+    """Raised to a subscriber that fell too far behind; it must resync from the database"""
+
+
+class Subscription:
+    """One SSE client's queue of TaskEvent rows"""
+
+    def __init__(self, max_pending: int):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self.overflowed = False
+
+    def put(self, event) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout: float):
+        """Next event, or None after `timeout` seconds without one"""
+        if self.overflowed:
+            raise SubscriptionOverflow()
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBroker:
+    """Per-process fan-out of the task change feed.
+
+    A single background thread LISTENs on a dedicated connection; on every
+    NOTIFY it reads the new task_events rows once and hands them to each
+    local subscriber, so the database cost does not grow with open streams.
+    The thread starts with the first subscriber, i.e. inside each worker.
+    """
+
+    def __init__(self, max_pending: int = 1000, poll_timeout: float = 5.0):
+        self.max_pending = max_pending
+        self.poll_timeout = poll_timeout
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.last_id = 0
+        self._backoff = 1
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.max_pending)
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self.last_id = TaskEventService.latest_id()
+                self._thread = threading.Thread(target=self._run, name='task-event-listener', daemon=True)
+                self._thread.start()
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self._listen()
+            except Exception:
+                logger.exception('Task event listener failed; reconnecting in %ss', self._backoff)
+                time.sleep(self._backoff)
+                self._backoff = min(self._backoff * 2, 30)
+
+    def _listen(self) -> None:
+        # A pool connection detached for good: LISTEN state must not leak back into the pool
+        raw = get_engine().raw_connection()
+        connection = raw.driver_connection
+        raw.detach()
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            # Catch up on anything committed while (re)connecting
+            self._dispatch_new()
+            self._backoff = 1
+            while True:
+                readable, _, _ = select.select([connection], [], [], self.poll_timeout)
+                if not readable:
+                    continue
+                connection.poll()
+                if connection.notifies:
+                    connection.notifies.clear()
+                    self._dispatch_new()
+        finally:
+            connection.close()
+
+    def _dispatch_new(self) -> None:
+        while True:
+            events = TaskEventService.get_events_after(self.last_id)
+            if not events:
+                return
+            with self._lock:
+                subscribers = list(self._subscribers)
+            for event in events:
+                for subscription in subscribers:
+                    subscription.put(event)
+            self.last_id = events[-1].id
+
+
+_broker: Optional[EventBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_broker(max_pending: int = 1000) -> EventBroker:
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = EventBroker(max_pending=max_pending)
+    return _broker
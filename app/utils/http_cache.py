@@ -0,0 +1,68 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from flask import Response, current_app, request
+from app.database.session import read_from_primary
+from app.utils.cache import get_cache
+from app.utils.serialization import dumps
+
+
+def make_etag(*parts) -> str:
+    """Derive a strong ETag from the values that version a resource"""
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _as_http_date(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC; HTTP dates have one-second resolution
+    return value.replace(microsecond=0, tzinfo=value.tzinfo or timezone.utc)
+
+
+def is_not_modified(etag: str, last_modified: Optional[datetime] = None, req=None) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since when it is absent.
+
+    `req` defaults to Flask's current request; the async app passes its own.
+    """
+    req = req if req is not None else request
+    if req.if_none_match:
+        # Weak comparison: compressed / MessagePack bodies carry the weak form
+        return req.if_none_match.contains_weak(etag)
+    if last_modified is not None and req.if_modified_since is not None:
+        return _as_http_date(last_modified) <= req.if_modified_since
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """Attach ETag / Last-Modified and ask clients to revalidate before reuse"""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _as_http_date(last_modified)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def not_modified(etag: str) -> Response:
+    """Build an empty 304 response carrying the current ETag"""
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    return response
+
+
+def cached_json_response(key: str, ttl: int, build: Callable[[], dict]) -> Response:
+    """Serve a JSON body from the cache under `key`, honouring If-None-Match.
+
+    `build` runs only on a cache miss; hits skip both the database and JSON
+    encoding, and a matching If-None-Match returns 304 without a body. Misses
+    are built from the primary, never a replica (see read_from_primary).
+    """
+    cache = get_cache()
+    entry = cache.get(key)
+    if entry is None:
+        read_from_primary()
+        body = dumps(build())
+        entry = (hashlib.sha1(body).hexdigest(), body)
+        cache.set(key, entry, ttl)
+
+    etag, body = entry
+    if is_not_modified(etag):
+        return not_modified(etag)
+    return set_validators(current_app.response_class(body, mimetype='application/json'), etag)
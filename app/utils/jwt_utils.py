@@ -1,11 +1,87 @@
 import jwt
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from functools import wraps
-from flask import request, jsonify
+from typing import Optional
+from flask import request, jsonify, g
 from app.config import Config
 
 config = Config()
 
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Authenticated user of the current request, available as `g.current_user`"""
+    user_id: int
+    username: str
+    expires_at: float
+
+
+class TokenCache:
+    """Bounded LRU of verified tokens keyed by their SHA-256 digest.
+
+    Entries expire at the token's own `exp`, and revoked digests are refused
+    until that time, so a cached hit is never more permissive than a fresh
+    `jwt.decode`. The cache and the revocation list are per process: a token
+    revoked in one worker is still accepted by the others until it expires.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._revoked = {}
+        self._lock = threading.Lock()
+
+    def get(self, digest: bytes) -> Optional[CurrentUser]:
+        with self._lock:
+            user = self._entries.get(digest)
+            if user is None:
+                return None
+            if user.expires_at <= time.time():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return user
+
+    def put(self, digest: bytes, user: CurrentUser) -> None:
+        with self._lock:
+            if digest in self._revoked:
+                return
+            self._entries[digest] = user
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def is_revoked(self, digest: bytes) -> bool:
+        with self._lock:
+            return digest in self._revoked
+
+    def revoke(self, digest: bytes, expires_at: float) -> None:
+        """Evict a digest and refuse it until `expires_at` (expired revocations are pruned here)"""
+        with self._lock:
+            now = time.time()
+            for stale in [d for d, exp in self._revoked.items() if exp <= now]:
+                del self._revoked[stale]
+            self._revoked[digest] = expires_at
+            self._entries.pop(digest, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+
+
+token_cache = TokenCache(config.TOKEN_CACHE_SIZE)
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
 def generate_token(user_id: int, username: str) -> str:
     """Generate JWT token for authenticated user"""
     payload = {
@@ -27,16 +103,36 @@ def decode_token(token: str) -> dict:
     except jwt.InvalidTokenError:
         raise Exception('Invalid token')
 
+def authenticate_token(token: str) -> CurrentUser:
+    """Return the user for a token, verifying its signature only on a cache miss"""
+    digest = _digest(token)
+    user = token_cache.get(digest)
+    if user is not None:
+        return user
+    if token_cache.is_revoked(digest):
+        raise Exception('Token has been revoked')
+    payload = decode_token(token)
+    user = CurrentUser(user_id=payload['user_id'], username=payload['username'], expires_at=payload['exp'])
+    token_cache.put(digest, user)
+    return user
+
+def revoke_token(token: str) -> None:
+    """Refuse a token in this process until it expires, evicting it from the cache"""
+    try:
+        payload = decode_token(token)
+    except Exception:
+        return
+    token_cache.revoke(_digest(token), payload['exp'])
+
 def token_required(f):
     """Decorator to protect routes with JWT authentication"""
     @wraps(f)
     def decorated(*args, **kwargs):
         token = None
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            try:
-                token = auth_header.split(' ')[1]
-            except IndexError:
+        auth_header = request.headers.get('Authorization')
+        if auth_header:
+            token = auth_header.partition(' ')[2]
+            if not token:
                 return jsonify({
                     'success': False,
                     'message': 'Token format invalid. Use: Bearer <token>'
@@ -47,14 +143,13 @@ def token_required(f):
                 'message': 'Authentication token is missing'
             }), 401
         try:
-            payload = decode_token(token)
-            request.current_user = payload
+            g.current_user = authenticate_token(token)
         except Exception as e:
             return jsonify({
                 'success': False,
                 'message': str(e)
             }), 401
-        
+
         return f(*args, **kwargs)
-    
-    return decorated
\ No newline at end of file
+
+    return decorated
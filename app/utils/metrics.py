@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, Tuple
+from flask import Flask, g, request
+from app.database.query_stats import begin_tracking, end_tracking
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# name -> (help, buckets)
+HISTOGRAMS = {
+    'http_request_duration_seconds': ('Time to produce a response, by route and status', LATENCY_BUCKETS),
+    'http_request_db_seconds': ('Time spent executing SQL per request', LATENCY_BUCKETS),
+    'http_request_sql_statements': ('SQL statements executed per request', SQL_COUNT_BUCKETS),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """Process-local histograms, rendered in the Prometheus text format.
+
+    Each series keeps per-bucket counts plus sum and count; observing is a
+    bisect and three additions under a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series: Dict[str, Dict[Labels, list]] = {name: {} for name in HISTOGRAMS}
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        buckets = HISTOGRAMS[name][1]
+        index = bisect_left(buckets, value)
+        with self._lock:
+            series = self._series[name].get(labels)
+            if series is None:
+                # one slot per bucket plus +Inf, then sum and count
+                series = self._series[name][labels] = [0] * (len(buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self) -> dict:
+        """JSON-serializable copy of every series"""
+        with self._lock:
+            return {
+                name: [[list(labels), list(values)] for labels, values in series.items()]
+                for name, series in self._series.items()
+            }
+
+    @staticmethod
+    def merge(snapshots: Iterable[dict]) -> dict:
+        merged: Dict[str, Dict[Labels, list]] = {name: {} for name in HISTOGRAMS}
+        for snapshot in snapshots:
+            for name, series in snapshot.items():
+                if name not in merged:
+                    continue
+                for labels, values in series:
+                    key = tuple(tuple(pair) for pair in labels)
+                    current = merged[name].get(key)
+                    merged[name][key] = values[:] if current is None else [a + b for a, b in zip(current, values)]
+        return {name: [[list(k), v] for k, v in series.items()] for name, series in merged.items()}
+
+    @staticmethod
+    def render(snapshot: dict) -> str:
+        lines = []
+        for name, (help_text, buckets) in HISTOGRAMS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, values in sorted(snapshot.get(name, []), key=lambda item: item[0]):
+                base = ','.join(f'{key}="{_escape(value)}"' for key, value in labels)
+                prefix = base + ',' if base else ''
+                cumulative = 0
+                for bound, count in zip(buckets + (float('inf'),), values):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(float(bound))
+                    lines.append(f'{name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{base}}} {values[-2]}')
+                lines.append(f'{name}_count{{{base}}} {values[-1]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics = MetricsRegistry()
+
+
+class MultiprocessStore:
+    """Share metrics across gunicorn workers through a directory of per-process snapshots.
+
+    Each worker rewrites its own file at most every `interval` seconds; the
+    scrape merges all files, so counters keep the totals of workers that
+    have since exited.
+    """
+
+    def __init__(self, directory: str, interval: float):
+        self.directory = directory
+        self.interval = interval
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def maybe_write(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_write < self.interval:
+            return
+        with self._lock:
+            self._last_write = now
+            path = os.path.join(self.directory, f"metrics_{os.getpid()}.json")
+            partial = f"{path}.{threading.get_ident()}.partial"
+            with open(partial, 'w') as out:
+                json.dump(metrics.snapshot(), out)
+            os.replace(partial, path)
+
+    def collect(self) -> dict:
+        self.maybe_write(force=True)
+        snapshots = []
+        for filename in os.listdir(self.directory):
+            if filename.startswith('metrics_') and filename.endswith('.json'):
+                try:
+                    with open(os.path.join(self.directory, filename)) as source:
+                        snapshots.append(json.load(source))
+                except (OSError, ValueError):
+                    continue
+        return MetricsRegistry.merge(snapshots)
+
+
+def render_metrics(app: Flask) -> str:
+    store = app.extensions.get('metrics_store')
+    return MetricsRegistry.render(store.collect() if store else metrics.snapshot())
+
+
+def init_app(app: Flask) -> None:
+    """Time every request and count its SQL; register before the session hooks
+    so the commit is included (after_request hooks run in reverse order)."""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    store = None
+    if app.config.get('METRICS_MULTIPROC_DIR'):
+        store = app.extensions['metrics_store'] = MultiprocessStore(
+            app.config['METRICS_MULTIPROC_DIR'], app.config.get('METRICS_FLUSH_SECONDS', 5)
+        )
+
+    @app.before_request
+    def start_metrics():
+        g.metrics_start = time.perf_counter()
+        g.metrics_queries = begin_tracking()
+
+    @app.after_request
+    def record_metrics(response):
+        start = g.pop('metrics_start', None)
+        tracking = g.pop('metrics_queries', None)
+        if start is None or tracking is None:
+            return response
+        stats, token = tracking
+        end_tracking(token)
+        elapsed = time.perf_counter() - start
+        route = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        labels = (('method', request.method), ('route', route))
+        metrics.observe('http_request_duration_seconds', labels + (('status', str(response.status_code)),), elapsed)
+        metrics.observe('http_request_db_seconds', labels, stats.seconds)
+        metrics.observe('http_request_sql_statements', labels, stats.count)
+        if store is not None:
+            store.maybe_write()
+        return response
+
+    @app.teardown_request
+    def stop_metrics(exception=None):
+        # after_request is skipped when a response could not be built
+        tracking = g.pop('metrics_queries', None)
+        if tracking is not None:
+            end_tracking(tracking[1])
@@ -0,0 +1,104 @@
+import asyncio
+import multiprocessing
+import threading
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional, Tuple
+from werkzeug.security import check_password_hash, generate_password_hash
+from app.config import Config
+
+
+class PasswordPoolSaturated(Exception):
+    """Raised when too many password verifications are already queued"""
+
+    def __init__(self, retry_after: int):
+        super().__init__('Too many login attempts in progress, please retry shortly')
+        self.retry_after = retry_after
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(max(Config.PASSWORD_POOL_MAX_PENDING, 1))
+
+
+@lru_cache(maxsize=None)
+def _full_method(method: str) -> str:
+    # The method as werkzeug writes it in a hash's prefix ("scrypt" is stored
+    # as "scrypt:32768:8:1"); itself a valid method, so hashing with it keeps
+    # the prefix stable. Costs one hash per process and method.
+    return generate_password_hash('', method=method).split('$', 1)[0]
+
+
+def hash_password(password: str) -> str:
+    """Hash a password with the configured method and cost"""
+    return generate_password_hash(password, method=_full_method(Config.PASSWORD_HASH_METHOD))
+
+
+def _verify_and_rehash(password_hash: str, password: str, method: str) -> Tuple[bool, Optional[str]]:
+    # Runs in a pool process: verify, and re-hash when the stored method/cost is
+    # outdated. `method` is spelled out in full (see _full_method).
+    if not check_password_hash(password_hash, password):
+        return False, None
+    if password_hash.split('$', 1)[0] != method:
+        return True, generate_password_hash(password, method=method)
+    return True, None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    # Created lazily so each gunicorn worker owns its pool; forkserver avoids
+    # forking a worker that may hold locks in other threads
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=Config.PASSWORD_POOL_WORKERS,
+                    mp_context=multiprocessing.get_context('forkserver')
+                )
+    return _executor
+
+
+def _submit(password_hash: str, password: str, method: str):
+    # Reserve a pending slot and submit; the slot is held until the hash
+    # finishes, even if the caller stops waiting
+    if not _pending.acquire(blocking=False):
+        raise PasswordPoolSaturated(Config.PASSWORD_POOL_RETRY_AFTER)
+    try:
+        future = _get_executor().submit(_verify_and_rehash, password_hash, password, method)
+    except Exception:
+        _pending.release()
+        raise
+    future.add_done_callback(lambda _: _pending.release())
+    return future
+
+
+def verify_password(password_hash: str, password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password off the request thread.
+
+    Returns (valid, new_hash); new_hash is set when the stored hash should be
+    upgraded to PASSWORD_HASH_METHOD. Raises PasswordPoolSaturated when
+    PASSWORD_POOL_MAX_PENDING verifications are already queued or running,
+    or when the result does not arrive within PASSWORD_VERIFY_TIMEOUT.
+    """
+    method = _full_method(Config.PASSWORD_HASH_METHOD)
+    if Config.PASSWORD_POOL_WORKERS <= 0:
+        return _verify_and_rehash(password_hash, password, method)
+
+    future = _submit(password_hash, password, method)
+    try:
+        return future.result(timeout=Config.PASSWORD_VERIFY_TIMEOUT)
+    except FutureTimeoutError:
+        raise PasswordPoolSaturated(Config.PASSWORD_POOL_RETRY_AFTER)
+
+
+async def verify_password_async(password_hash: str, password: str) -> Tuple[bool, Optional[str]]:
+    """Awaitable verify_password for the async app; never blocks the event loop"""
+    method = await asyncio.to_thread(_full_method, Config.PASSWORD_HASH_METHOD)
+    if Config.PASSWORD_POOL_WORKERS <= 0:
+        return await asyncio.to_thread(_verify_and_rehash, password_hash, password, method)
+
+    future = _submit(password_hash, password, method)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), Config.PASSWORD_VERIFY_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise PasswordPoolSaturated(Config.PASSWORD_POOL_RETRY_AFTER)
@@ -0,0 +1,101 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+from flask import Flask, g, request
+
+
+class SlowRequestProfiler:
+    """Sampling profiler for requests that turn out to be slow.
+
+    While any request is in flight, a background thread samples the stacks
+    of the request threads every `interval` seconds. When a request finishes
+    above `threshold`, its samples are written in the folded-stack format
+    ("outer;inner;leaf count" per line) that flamegraph.pl and speedscope
+    read. Samples are per thread, so this suits sync/gthread workers.
+    """
+
+    def __init__(self, threshold: float, interval: float, directory: str, max_depth: int = 64):
+        self.threshold = threshold
+        self.interval = interval
+        self.directory = directory
+        self.max_depth = max_depth
+        self._samples = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        with self._lock:
+            self._samples[threading.get_ident()] = Counter()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='slow-request-profiler', daemon=True)
+                self._thread.start()
+
+    def stop(self, elapsed: float, label: str) -> Optional[str]:
+        """Stop sampling this thread; returns the profile path when the request was slow"""
+        with self._lock:
+            samples = self._samples.pop(threading.get_ident(), None)
+        if not samples or elapsed < self.threshold:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        slug = ''.join(ch if ch.isalnum() else '_' for ch in label).strip('_')[:80]
+        path = os.path.join(
+            self.directory, f"{datetime.utcnow():%Y%m%dT%H%M%S%f}_{os.getpid()}_{slug}_{int(elapsed * 1000)}ms.folded"
+        )
+        with open(path, 'w') as out:
+            for stack, count in samples.most_common():
+                out.write(f"{stack} {count}\n")
+        return path
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                threads = list(self._samples)
+            if not threads:
+                continue
+            frames = sys._current_frames()
+            for ident in threads:
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if not stack:
+                    continue
+                key = ';'.join(reversed(stack))
+                with self._lock:
+                    counter = self._samples.get(ident)
+                    if counter is not None:
+                        counter[key] += 1
+
+
+def init_app(app: Flask) -> None:
+    """Enable the profiler when PROFILE_SLOW_REQUEST_MS is set (> 0)"""
+    threshold_ms = app.config.get('PROFILE_SLOW_REQUEST_MS', 0)
+    if threshold_ms <= 0:
+        return
+    profiler = app.extensions['slow_request_profiler'] = SlowRequestProfiler(
+        threshold_ms / 1000,
+        app.config.get('PROFILE_SAMPLE_INTERVAL_MS', 5) / 1000,
+        app.config.get('PROFILE_DIR', 'profiles')
+    )
+
+    @app.before_request
+    def start_profile():
+        g.profile_start = time.perf_counter()
+        profiler.start()
+
+    @app.teardown_request
+    def stop_profile(exception=None):
+        start = g.pop('profile_start', None)
+        if start is None:
+            return
+        route = request.url_rule.rule if request.url_rule is not None else request.path
+        path = profiler.stop(time.perf_counter() - start, f"{request.method} {route}")
+        if path:
+            app.logger.warning('Slow request %s %s profiled to %s', request.method, request.path, path)
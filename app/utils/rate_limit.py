@@ -0,0 +1,186 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Union
+from flask import current_app, g, jsonify, make_response, request
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Decision:
+    """Outcome of taking `cost` tokens from a bucket"""
+    allowed: bool
+    remaining: float
+    retry_after: float
+
+
+class LocalRateLimiter:
+    """Thread-safe in-process token buckets, bounded to the `max_keys` most recently used.
+
+    An evicted bucket comes back full, which only ever errs on the permissive
+    side. Each worker process keeps its own buckets, so the effective limit is
+    multiplied by the number of workers.
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, cost: float, capacity: float, rate: float) -> Decision:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                decision = Decision(True, tokens, 0.0)
+            else:
+                decision = Decision(False, tokens, (cost - tokens) / rate)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return decision
+
+
+# Refill and take in one round trip; the Redis clock is used so that workers
+# on different hosts agree on elapsed time
+_CONSUME_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+
+class RedisRateLimiter:
+    """Token buckets shared by all workers and hosts, updated atomically by a Lua script"""
+
+    def __init__(self, url: str, prefix: str = 'ratelimit:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('RATE_LIMIT_REDIS_URL is set but the redis package is not installed')
+        self._client = redis.Redis.from_url(url, socket_timeout=0.25)
+        self._consume = self._client.register_script(_CONSUME_SCRIPT)
+        self.prefix = prefix
+
+    def consume(self, key: str, cost: float, capacity: float, rate: float) -> Decision:
+        allowed, remaining, retry_after = self._consume(
+            keys=[self.prefix + key], args=[capacity, rate, cost]
+        )
+        return Decision(bool(int(allowed)), float(remaining), float(retry_after))
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Return the configured limiter backend (Redis when RATE_LIMIT_REDIS_URL is set).
+
+    Any object with a `consume(key, cost, capacity, rate) -> Decision` method
+    can be installed with `set_rate_limiter`.
+    """
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                if Config.RATE_LIMIT_REDIS_URL:
+                    _limiter = RedisRateLimiter(Config.RATE_LIMIT_REDIS_URL)
+                else:
+                    _limiter = LocalRateLimiter(Config.RATE_LIMIT_LOCAL_MAX_KEYS)
+    return _limiter
+
+
+def set_rate_limiter(limiter) -> None:
+    """Replace the limiter backend (e.g. with a shared store other than Redis)"""
+    global _limiter
+    with _limiter_lock:
+        _limiter = limiter
+
+
+def client_ip() -> str:
+    """Client address, taken from X-Forwarded-For when RATE_LIMIT_TRUSTED_PROXIES proxies are in front"""
+    proxies = current_app.config['RATE_LIMIT_TRUSTED_PROXIES']
+    if proxies:
+        forwarded = [ip.strip() for ip in request.headers.get('X-Forwarded-For', '').split(',') if ip.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.remote_addr or 'unknown'
+
+
+def _bucket_key(bucket: str) -> str:
+    user = g.get('current_user')
+    if user is not None:
+        return f"{bucket}:user:{user.user_id}"
+    return f"{bucket}:ip:{client_ip()}"
+
+
+def _set_headers(response, capacity: float, decision: Decision) -> None:
+    response.headers['RateLimit-Limit'] = str(int(capacity))
+    response.headers['RateLimit-Remaining'] = str(int(decision.remaining))
+    if not decision.allowed:
+        response.headers['Retry-After'] = str(max(1, math.ceil(decision.retry_after)))
+
+
+def rate_limit(cost: Union[float, Callable[[], float]] = 1, bucket: str = 'api'):
+    """Take `cost` tokens from the caller's bucket, answering 429 when it is empty.
+
+    Place it below @token_required: requests are keyed on the JWT user, or on
+    the client IP when there is none. `bucket` selects the
+    RATE_LIMIT_<BUCKET>_CAPACITY / _PER_SECOND settings, and `cost` may be a
+    callable evaluated per request. If the backend is unreachable the request
+    is let through.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            config = current_app.config
+            if not config['RATE_LIMIT_ENABLED']:
+                return f(*args, **kwargs)
+            capacity = config[f'RATE_LIMIT_{bucket.upper()}_CAPACITY']
+            rate = config[f'RATE_LIMIT_{bucket.upper()}_PER_SECOND']
+            weight = min(cost() if callable(cost) else cost, capacity)
+            try:
+                decision = get_rate_limiter().consume(_bucket_key(bucket), weight, capacity, rate)
+            except Exception:
+                logger.warning('Rate limiter unavailable; request not limited', exc_info=True)
+                return f(*args, **kwargs)
+
+            if not decision.allowed:
+                response = jsonify({
+                    'success': False,
+                    'message': 'Too many requests, please retry later'
+                })
+                response.status_code = 429
+            else:
+                response = make_response(f(*args, **kwargs))
+            _set_headers(response, capacity, decision)
+            return response
+
+        return decorated
+    return decorator
@@ -0,0 +1,61 @@
+import json
+from datetime import date
+from typing import Any, Callable, Sequence
+from flask import Response, current_app, g
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used when it is not installed
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional: MessagePack is only offered when it is installed
+    msgpack = None
+
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+
+def _default(value: Any):
+    # Same output as orjson for the naive UTC timestamps stored by the models
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload: Any) -> bytes:
+    """Encode to JSON bytes with orjson when installed; datetimes become ISO 8601"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, default=_default, separators=(',', ':')).encode()
+
+
+def loads(body: bytes) -> Any:
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def packb(payload: Any) -> bytes:
+    """Encode to MessagePack; datetimes become ISO 8601 strings like in JSON"""
+    return msgpack.packb(payload, default=_default, use_bin_type=True)
+
+
+def json_response(payload: Any, status: int = 200) -> Response:
+    """Like jsonify, but encoded with dumps (no key sorting, datetimes as ISO 8601).
+
+    Encodes straight to MessagePack instead when content negotiation chose it
+    for this request (see app.utils.content_negotiation).
+    """
+    if g.get('response_format') == MSGPACK_MIMETYPE:
+        return current_app.response_class(packb(payload), status=status, mimetype=MSGPACK_MIMETYPE)
+    return current_app.response_class(dumps(payload), status=status, mimetype='application/json')
+
+
+def compile_row_encoder(columns: Sequence) -> Callable[[Sequence], dict]:
+    """Build a function turning a row selected as `select(*columns)` into a dict.
+
+    Keys are the columns' keys (or labels), computed once per column list, so
+    encoding a row is a single zip over its values; datetimes are left for
+    dumps to format.
+    """
+    keys = tuple(column.key for column in columns)
+    return lambda row: dict(zip(keys, row))
@@ -0,0 +1,28 @@
+from typing import Any, Callable, Iterable, Iterator
+from flask import Response, stream_with_context
+from app.utils.serialization import dumps
+
+
+def iter_json_list(items: Iterable[Any], serialize: Callable[[Any], dict], chunk_size: int = 100) -> Iterator[bytes]:
+    """Encode {"success": true, "data": [...]} incrementally, one chunk of items at a time"""
+    yield b'{"success": true, "data": ['
+    separator = b''
+    chunk = []
+    for item in items:
+        chunk.append(dumps(serialize(item)))
+        if len(chunk) >= chunk_size:
+            yield separator + b', '.join(chunk)
+            separator = b', '
+            chunk = []
+    if chunk:
+        yield separator + b', '.join(chunk)
+    yield b']}'
+
+
+def stream_json_list(items: Iterable[Any], serialize: Callable[[Any], dict]) -> Response:
+    """Stream a list response without materializing the rows or the encoded body.
+
+    `items` is consumed lazily while the response is being sent, so it may be a
+    generator that keeps a database cursor open until the last row is written.
+    """
+    return Response(stream_with_context(iter_json_list(items, serialize)), mimetype='application/json')
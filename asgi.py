@@ -0,0 +1,6 @@
+import os
+from app.aio import create_async_app
+
+# ASGI entry point: hypercorn asgi:app  (or: uvicorn asgi:app)
+env = os.getenv('FLASK_ENV', 'production')
+app = create_async_app(env)
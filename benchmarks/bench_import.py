@@ -0,0 +1,79 @@
+"""Bulk import throughput: COPY staging-table merge vs. the batch endpoint's bulk statements.
+
+Usage (from the backend folder, with .env configured):
+    python -m benchmarks.bench_import [rows ...]
+
+Imports each row count (default 10000 and 100000) as generated CSV, inside a
+transaction that is rolled back afterwards, so the database is left
+unchanged. The baseline feeds the same rows through TaskService's batch path
+(POST /api/tasks/batch) in chunks of TASKS_BATCH_MAX_ITEMS. Reports rows/sec.
+"""
+import io
+import os
+import sys
+import time
+from app import create_app
+from app.database.db import SessionLocal
+from app.services.task_service import TaskService
+from app.services.task_transfer_service import TaskTransferService
+
+ASSIGNEES = 20
+
+
+def _rows(count: int):
+    for index in range(count):
+        yield {
+            'title': f"Imported task {index}",
+            'description': f"Benchmark import row {index}",
+            'assigned_to': f"bench-import-{index % ASSIGNEES}",
+            'status': 'Not_Started',
+            'priority': 'Medium',
+        }
+
+
+def _csv(count: int) -> io.BytesIO:
+    lines = ['title,description,assigned_to,status,priority\n']
+    lines.extend(
+        f"{row['title']},{row['description']},{row['assigned_to']},{row['status']},{row['priority']}\n"
+        for row in _rows(count)
+    )
+    return io.BytesIO(''.join(lines).encode())
+
+
+def _copy_import(count: int) -> float:
+    body = _csv(count)
+    with SessionLocal() as session:
+        started = time.perf_counter()
+        TaskTransferService.import_tasks(session, body, 'csv')
+        seconds = time.perf_counter() - started
+        session.rollback()
+    return seconds
+
+
+def _batch_import(count: int, chunk: int) -> float:
+    rows = list(_rows(count))
+    with SessionLocal() as session:
+        started = time.perf_counter()
+        for offset in range(0, count, chunk):
+            TaskService._apply_batch(session, rows[offset:offset + chunk], [], [], None)
+            session.expunge_all()
+        seconds = time.perf_counter() - started
+        session.rollback()
+    return seconds
+
+
+def main(row_counts):
+    app = create_app(os.getenv('FLASK_ENV', 'production'))
+    chunk = app.config['TASKS_BATCH_MAX_ITEMS']
+    print(f"{'rows':>8} {'path':<24} {'seconds':>8} {'rows/sec':>10}")
+    with app.app_context():
+        for rows in row_counts:
+            for label, seconds in (
+                (f"batch ({chunk}/request)", _batch_import(rows, chunk)),
+                ('copy + merge', _copy_import(rows)),
+            ):
+                print(f"{rows:>8} {label:<24} {seconds:>8.3f} {rows / seconds:>10.0f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,82 @@
+"""Read path throughput: ORM objects + to_dict() + jsonify vs. Core rows + compiled row encoder.
+
+Usage (from the backend folder, with .env configured):
+    python -m benchmarks.bench_serialization [rows ...]
+
+Seeds each row count (default 10000 and 100000) as tasks inside a transaction
+that is rolled back afterwards, so the database is left unchanged. Times the
+full list path of GET /api/tasks (query, row handling, JSON encoding) and
+reports rows/sec, best of three runs.
+"""
+import os
+import sys
+import time
+from sqlalchemy import text
+from app import create_app
+from app.database.db import SessionLocal
+from app.services.assignee_service import AssigneeService
+from app.services.task_service import TaskService, TASK_ROW_COLUMNS, encode_task_row
+from app.utils import serialization
+
+ASSIGNEE = 'bench-serialization'
+RUNS = 3
+
+
+def _seed(session, rows: int) -> None:
+    assignee_id, _ = AssigneeService.resolve_one(session, ASSIGNEE)
+    session.execute(text(
+        "INSERT INTO tasks (title, description, assignee_id, assigned_to, status, priority, start_date, due_date, "
+        "created_at, updated_at, version) "
+        "SELECT 'Task ' || g, 'Benchmark task number ' || g, :assignee_id, :assignee, 'Not_Started', 'Medium', "
+        "now(), now() + interval '7 days', now() - g * interval '1 second', now(), 1 "
+        "FROM generate_series(1, :rows) AS g"
+    ), {'assignee_id': assignee_id, 'assignee': ASSIGNEE, 'rows': rows})
+
+
+def _orm_path(app, session) -> int:
+    tasks = session.scalars(TaskService._list_select(None, ASSIGNEE)).all()
+    body = app.json.dumps({'success': True, 'data': [task.to_dict() for task in tasks]})
+    session.expunge_all()
+    return len(body)
+
+
+def _row_path(app, session) -> int:
+    rows = session.execute(TaskService._list_select(None, ASSIGNEE, TASK_ROW_COLUMNS)).all()
+    body = serialization.dumps({'success': True, 'data': [encode_task_row(row) for row in rows]})
+    return len(body)
+
+
+def _best(fn, *args) -> float:
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(row_counts):
+    app = create_app(os.getenv('FLASK_ENV', 'production'))
+    orjson = serialization.orjson
+    print(f"orjson: {'installed' if orjson is not None else 'not installed'}")
+    print(f"{'rows':>8} {'path':<28} {'seconds':>8} {'rows/sec':>10}")
+    with app.app_context():
+        for rows in row_counts:
+            with SessionLocal() as session:
+                _seed(session, rows)
+                results = [('orm + to_dict + jsonify', _best(_orm_path, app, session))]
+                if orjson is not None:
+                    serialization.orjson = None
+                    results.append(('rows + encoder + json', _best(_row_path, app, session)))
+                    serialization.orjson = orjson
+                results.append((
+                    'rows + encoder + orjson' if orjson is not None else 'rows + encoder + json',
+                    _best(_row_path, app, session)
+                ))
+                session.rollback()
+            for label, seconds in results:
+                print(f"{rows:>8} {label:<28} {seconds:>8.3f} {rows / seconds:>10.0f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,64 @@
+"""Time to first request: boot with create_all vs. without, with and without warm-up.
+
+Usage (from the backend folder, with .env configured):
+    python -m benchmarks.bench_startup [runs]
+
+Each configuration is started in a fresh interpreter (default 5 runs, median
+reported) that imports the app, builds it with create_app, then sends
+GET /api/tasks?limit=20 and GET /api/dashboard/statistics through the test
+client. `boot` covers imports + create_app (including any warm-up), `first`
+is the first request, `ready` is the sum: how long a new worker takes to
+answer its first client, and `second` repeats the requests once warm.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = [
+    ('create_all on boot', {'DB_CREATE_ALL': 'true', 'STARTUP_WARMUP': 'false'}),
+    ('no create_all', {'DB_CREATE_ALL': 'false', 'STARTUP_WARMUP': 'false'}),
+    ('no create_all + warm-up', {'DB_CREATE_ALL': 'false', 'STARTUP_WARMUP': 'true'}),
+]
+
+_CHILD = """
+import json, os, time
+started = time.perf_counter()
+from app import create_app
+app = create_app(os.getenv('FLASK_ENV', 'production'))
+booted = time.perf_counter()
+from app.utils.jwt_utils import generate_token
+client = app.test_client()
+headers = {'Authorization': 'Bearer ' + generate_token(1, 'admin')}
+timings = []
+for _ in range(2):
+    before = time.perf_counter()
+    assert client.get('/api/tasks?limit=20', headers=headers).status_code == 200
+    assert client.get('/api/dashboard/statistics', headers=headers).status_code == 200
+    timings.append(time.perf_counter() - before)
+print(json.dumps({'boot': booted - started, 'first': timings[0], 'second': timings[1]}))
+"""
+
+
+def _run(env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, '-c', _CHILD], env={**os.environ, 'SQLALCHEMY_ECHO': 'false', **env},
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(runs: int):
+    print(f"{'configuration':<26} {'boot ms':>8} {'first ms':>9} {'ready ms':>9} {'second ms':>9}")
+    for label, env in SCENARIOS:
+        results = [_run(env) for _ in range(runs)]
+        boot = statistics.median(r['boot'] for r in results) * 1000
+        first = statistics.median(r['first'] for r in results) * 1000
+        ready = statistics.median(r['boot'] + r['first'] for r in results) * 1000
+        second = statistics.median(r['second'] for r in results) * 1000
+        print(f"{label:<26} {boot:>8.0f} {first:>9.1f} {ready:>9.0f} {second:>9.1f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,112 @@
+"""Load comparison: the Flask (WSGI) app vs. the Quart (ASGI) app.
+
+Start both servers against the same database, e.g.
+    gunicorn -w 4 -b :5000 run:app
+    hypercorn -w 4 -b :5001 asgi:app
+then run (from the backend folder):
+    python -m benchmarks.bench_sync_vs_async http://localhost:5000 http://localhost:5001 [concurrency] [seconds]
+
+Each client logs in once and then loops over the read endpoints; the report
+shows throughput and latency percentiles per server.
+"""
+import http.client
+import json
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+PATHS = [
+    '/api/tasks?limit=50',
+    '/api/tasks',
+    '/api/dashboard/statistics',
+]
+
+
+def _request(conn, method, path, body=None, headers=None):
+    conn.request(method, path, body=body, headers=headers or {})
+    response = conn.getresponse()
+    data = response.read()
+    return response.status, data
+
+
+def _login(base_url: str) -> str:
+    url = urlsplit(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port)
+    status, data = _request(
+        conn, 'POST', '/api/auth/login',
+        body=json.dumps({'username': 'admin', 'password': 'admin123'}),
+        headers={'Content-Type': 'application/json'}
+    )
+    conn.close()
+    if status != 200:
+        raise SystemExit(f"{base_url}: login failed with {status}")
+    return json.loads(data)['data']['access_token']
+
+
+def run(base_url: str, concurrency: int, seconds: float) -> dict:
+    token = _login(base_url)
+    url = urlsplit(base_url)
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def client(offset: int):
+        conn = http.client.HTTPConnection(url.hostname, url.port)
+        headers = {'Authorization': f'Bearer {token}'}
+        local, failed, i = [], 0, offset
+        while time.monotonic() < deadline:
+            path = PATHS[i % len(PATHS)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                status, _ = _request(conn, 'GET', path, headers=headers)
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(url.hostname, url.port)
+                status = 0
+            local.append(time.perf_counter() - start)
+            if status != 200:
+                failed += 1
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    pick = lambda q: latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000 if latencies else 0
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': len(latencies) / seconds,
+        'p50_ms': pick(0.50),
+        'p95_ms': pick(0.95),
+        'p99_ms': pick(0.99),
+    }
+
+
+def main(sync_url: str, async_url: str, concurrency: int = 32, seconds: float = 20):
+    print(f"concurrency: {concurrency}, duration: {seconds}s, paths: {', '.join(PATHS)}")
+    print(f"{'server':<8}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, base_url in (('sync', sync_url), ('async', async_url)):
+        r = run(base_url, concurrency, seconds)
+        print(f"{name:<8}{r['requests']:>10}{r['errors']:>8}{r['rps']:>10.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        raise SystemExit(__doc__)
+    main(
+        sys.argv[1],
+        sys.argv[2],
+        int(sys.argv[3]) if len(sys.argv) > 3 else 32,
+        float(sys.argv[4]) if len(sys.argv) > 4 else 20,
+    )
@@ -0,0 +1,29 @@
+"""gunicorn settings, read automatically when gunicorn starts in this folder.
+
+GUNICORN_PRELOAD=true imports and builds the app once in the master, so
+workers fork from it (shared memory pages, faster worker boot). Every worker
+then drops the connections inherited from the master (app.database.db) and,
+with STARTUP_WARMUP, opens its own before taking requests.
+"""
+import os
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false').lower() in ('1', 'true', 'yes')
+
+
+def when_ready(server):
+    if preload_app:
+        # The master serves no requests: close the connections it opened while
+        # building (and warming) the app before the workers are forked
+        from app.database.db import get_engine
+        get_engine().dispose()
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        # The worker builds (and warms) the app itself after this hook
+        return
+    app = worker.app.wsgi()
+    if app.config['STARTUP_WARMUP']:
+        # Statements were compiled in the master; only the pool is per worker
+        from app.database.warmup import warm_up
+        warm_up(app, queries=False)
@@ -0,0 +1,11 @@
+-- Upgrade an existing database for keyset pagination on GET /api/tasks.
+-- Run outside a transaction block (CREATE INDEX CONCURRENTLY).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_created_at_id ON tasks(created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_status_created_at_id ON tasks(status, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_assigned_to_created_at_id ON tasks(assigned_to, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_status_assigned_to_created_at_id ON tasks(status, assigned_to, created_at, id);
+
+-- Superseded by the composite indexes above (same leading column)
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_status;
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_assigned_to;
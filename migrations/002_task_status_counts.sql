@@ -0,0 +1,12 @@
+-- Upgrade an existing database with the dashboard rollup table.
+-- Afterwards run `flask --app run rollups rebuild` once to populate it.
+
+CREATE TABLE IF NOT EXISTS task_status_counts (
+    assigned_to VARCHAR(100) PRIMARY KEY,
+    total_tasks INTEGER NOT NULL DEFAULT 0,
+    not_started INTEGER NOT NULL DEFAULT 0,
+    in_progress INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_open_due_date ON tasks(due_date) WHERE status <> 'Completed';
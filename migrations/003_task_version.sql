@@ -0,0 +1,3 @@
+-- Upgrade an existing database for optimistic concurrency on task updates.
+
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
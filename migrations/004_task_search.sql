@@ -0,0 +1,10 @@
+-- Upgrade an existing database for full-text task search (GET /api/tasks/search).
+-- Run outside a transaction block (CREATE INDEX CONCURRENTLY); adding the stored
+-- generated column rewrites the table once.
+
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_search_vector ON tasks USING GIN (search_vector);
@@ -0,0 +1,62 @@
+-- Convert an existing task_logs table to monthly range partitions on changed_at.
+-- Takes task_logs offline for the duration of the copy; run in a maintenance window.
+-- Afterwards, schedule `flask --app run logs ensure-partitions` (monthly) and
+-- `flask --app run logs archive` (as retention requires).
+
+BEGIN;
+
+ALTER TABLE task_logs RENAME TO task_logs_legacy;
+ALTER INDEX IF EXISTS idx_task_logs_task_id RENAME TO idx_task_logs_legacy_task_id;
+ALTER INDEX IF EXISTS idx_task_logs_changed_at RENAME TO idx_task_logs_legacy_changed_at;
+ALTER TABLE task_logs_legacy RENAME CONSTRAINT chk_log_old_status TO chk_log_legacy_old_status;
+ALTER TABLE task_logs_legacy RENAME CONSTRAINT chk_log_new_status TO chk_log_legacy_new_status;
+
+CREATE TABLE task_logs (
+    id INTEGER NOT NULL DEFAULT nextval('task_logs_id_seq'),
+    task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    old_status VARCHAR(20),
+    new_status VARCHAR(20) NOT NULL,
+    changed_by INTEGER REFERENCES users(id) ON DELETE SET NULL,
+    change_reason TEXT,
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (id, changed_at),
+
+    CONSTRAINT chk_log_old_status CHECK (old_status IN ('Not_Started', 'In_Progress', 'Completed')),
+    CONSTRAINT chk_log_new_status CHECK (new_status IN ('Not_Started', 'In_Progress', 'Completed'))
+) PARTITION BY RANGE (changed_at);
+
+CREATE TABLE task_logs_default PARTITION OF task_logs DEFAULT;
+
+-- One partition per month from the oldest log through three months ahead
+DO $$
+DECLARE
+    month DATE;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', COALESCE((SELECT MIN(changed_at) FROM task_logs_legacy), CURRENT_DATE)),
+            date_trunc('month', CURRENT_DATE) + interval '3 months',
+            interval '1 month'
+        )::date
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF task_logs FOR VALUES FROM (%L) TO (%L)',
+            'task_logs_y' || to_char(month, 'YYYY') || 'm' || to_char(month, 'MM'),
+            month,
+            (month + interval '1 month')::date
+        );
+    END LOOP;
+END $$;
+
+INSERT INTO task_logs (id, task_id, old_status, new_status, changed_by, change_reason, changed_at)
+SELECT id, task_id, old_status, new_status, changed_by, change_reason, COALESCE(changed_at, CURRENT_TIMESTAMP)
+FROM task_logs_legacy;
+
+CREATE INDEX idx_task_logs_task_id_changed_at ON task_logs(task_id, changed_at, id);
+CREATE INDEX idx_task_logs_changed_at ON task_logs(changed_at);
+
+ALTER SEQUENCE task_logs_id_seq OWNED BY task_logs.id;
+DROP TABLE task_logs_legacy;
+
+COMMIT;
@@ -0,0 +1,12 @@
+-- Upgrade an existing database for the task change feed (GET /api/events).
+-- Schedule `flask --app run events prune` to bound the table.
+
+CREATE TABLE IF NOT EXISTS task_events (
+    id BIGSERIAL PRIMARY KEY,
+    event_type VARCHAR(40) NOT NULL,
+    task_id INTEGER NOT NULL,
+    payload JSONB NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_events_created_at ON task_events(created_at);
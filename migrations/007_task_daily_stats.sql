@@ -0,0 +1,21 @@
+-- Upgrade an existing database for GET /api/dashboard/trends.
+-- Afterwards run `flask --app run analytics backfill` once, then schedule
+-- `flask --app run analytics refresh` (e.g. every 5 minutes).
+
+CREATE TABLE IF NOT EXISTS task_daily_stats (
+    day DATE NOT NULL,
+    assigned_to VARCHAR(100) NOT NULL,
+    created INTEGER NOT NULL DEFAULT 0,
+    started INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    cycle_time_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    cycle_time_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, assigned_to)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+    name VARCHAR(50) PRIMARY KEY,
+    processed_until TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_daily_stats_assigned_to_day ON task_daily_stats(assigned_to, day);
@@ -0,0 +1,91 @@
+-- Upgrade an existing database to integer assignee keys.
+-- Stop the API while it runs (it rewrites tasks and the rollup tables), deploy
+-- the new code, then run `flask --app run rollups check` and
+-- `flask --app run analytics backfill` to rebuild the trend rollups.
+-- Names that differ only in case or spacing become one assignee.
+
+BEGIN;
+
+CREATE TABLE assignees (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    name_key VARCHAR(100) UNIQUE NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- The first spelling (by task id) of each name becomes the canonical one
+INSERT INTO assignees (name, name_key)
+SELECT DISTINCT ON (name_key) regexp_replace(btrim(assigned_to), '\s+', ' ', 'g'), name_key
+FROM (
+    SELECT id, assigned_to, lower(regexp_replace(btrim(assigned_to), '\s+', ' ', 'g')) AS name_key
+    FROM tasks
+) t
+WHERE name_key <> ''
+ORDER BY name_key, id;
+
+ALTER TABLE tasks ADD COLUMN assignee_id INTEGER REFERENCES assignees(id);
+
+UPDATE tasks t SET assignee_id = a.id, assigned_to = a.name
+FROM assignees a
+WHERE a.name_key = lower(regexp_replace(btrim(t.assigned_to), '\s+', ' ', 'g'));
+
+-- Fails if any task has a blank assignee; fix those rows first
+ALTER TABLE tasks ALTER COLUMN assignee_id SET NOT NULL;
+
+DROP INDEX IF EXISTS idx_tasks_assigned_to_created_at_id;
+DROP INDEX IF EXISTS idx_tasks_status_assigned_to_created_at_id;
+CREATE INDEX idx_tasks_assignee_id_created_at_id ON tasks(assignee_id, created_at, id);
+CREATE INDEX idx_tasks_status_assignee_id_created_at_id ON tasks(status, assignee_id, created_at, id);
+
+-- Counters are rebuilt from tasks, keyed by assignee id
+DROP TABLE task_status_counts;
+CREATE TABLE task_status_counts (
+    assignee_id INTEGER PRIMARY KEY REFERENCES assignees(id),
+    total_tasks INTEGER NOT NULL DEFAULT 0,
+    not_started INTEGER NOT NULL DEFAULT 0,
+    in_progress INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+INSERT INTO task_status_counts (assignee_id, total_tasks, not_started, in_progress, completed)
+SELECT
+    assignee_id,
+    COUNT(*),
+    COUNT(CASE WHEN status = 'Not_Started' THEN 1 END),
+    COUNT(CASE WHEN status = 'In_Progress' THEN 1 END),
+    COUNT(CASE WHEN status = 'Completed' THEN 1 END)
+FROM tasks
+GROUP BY assignee_id;
+
+-- Trend rollups are recreated empty; `analytics backfill` refills them
+DROP TABLE IF EXISTS task_daily_stats;
+CREATE TABLE task_daily_stats (
+    day DATE NOT NULL,
+    assignee_id INTEGER NOT NULL REFERENCES assignees(id),
+    created INTEGER NOT NULL DEFAULT 0,
+    started INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    cycle_time_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    cycle_time_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, assignee_id)
+);
+CREATE INDEX idx_task_daily_stats_assignee_id_day ON task_daily_stats(assignee_id, day);
+DELETE FROM rollup_watermarks WHERE name = 'task_daily_stats';
+
+DROP VIEW IF EXISTS team_activity;
+CREATE VIEW team_activity AS
+SELECT
+    t.assignee_id,
+    a.name as assigned_to,
+    COUNT(*) as total_tasks,
+    COUNT(CASE WHEN t.status = 'Completed' THEN 1 END) as completed_tasks,
+    COUNT(CASE WHEN t.status = 'In_Progress' THEN 1 END) as ongoing_tasks,
+    ROUND(
+        (COUNT(CASE WHEN t.status = 'Completed' THEN 1 END)::DECIMAL /
+        NULLIF(COUNT(*), 0)) * 100, 2
+    ) as completion_rate
+FROM tasks t
+JOIN assignees a ON a.id = t.assignee_id
+GROUP BY t.assignee_id, a.name
+ORDER BY completed_tasks DESC;
+
+COMMIT;
@@ -0,0 +1,3 @@
+-- Upgrade an existing database for the commit-versioned task list ETags.
+
+ALTER TABLE task_status_counts ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 0;
@@ -0,0 +1,16 @@
+-- Upgrade an existing database to record the assignee on every task log row.
+-- Existing rows get the task's current assignee (the earlier ones are unknown).
+-- Rewrites task_logs: run it in a quiet period, then run
+-- `flask --app run analytics backfill` to rebuild the trend rollups.
+
+BEGIN;
+
+ALTER TABLE task_logs ADD COLUMN IF NOT EXISTS assignee_id INTEGER REFERENCES assignees(id);
+
+UPDATE task_logs l SET assignee_id = t.assignee_id
+FROM tasks t
+WHERE t.id = l.task_id AND l.assignee_id IS NULL;
+
+ALTER TABLE task_logs ALTER COLUMN assignee_id SET NOT NULL;
+
+COMMIT;
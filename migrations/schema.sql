@@ -1,6 +1,11 @@
 -- Drop tables if exists (development)
+DROP TABLE IF EXISTS rollup_watermarks CASCADE;
+DROP TABLE IF EXISTS task_daily_stats CASCADE;
+DROP TABLE IF EXISTS task_events CASCADE;
+DROP TABLE IF EXISTS task_status_counts CASCADE;
 DROP TABLE IF EXISTS task_logs CASCADE;
 DROP TABLE IF EXISTS tasks CASCADE;
+DROP TABLE IF EXISTS assignees CASCADE;
 DROP TABLE IF EXISTS users CASCADE;
 
 -- Table: users
@@ -15,11 +20,21 @@ CREATE TABLE users (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Table: assignees (matched on name_key: trimmed, single-spaced, lower-case name)
+CREATE TABLE assignees (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    name_key VARCHAR(100) UNIQUE NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Table: tasks
 CREATE TABLE tasks (
     id SERIAL PRIMARY KEY,
     title VARCHAR(200) NOT NULL,
     description TEXT,
+    assignee_id INTEGER NOT NULL REFERENCES assignees(id),
+    -- The assignee's name, copied on write so task reads need no join
     assigned_to VARCHAR(100) NOT NULL,
     status VARCHAR(20) DEFAULT 'Not_Started',
     priority VARCHAR(20) DEFAULT 'Medium',
@@ -29,6 +44,12 @@ CREATE TABLE tasks (
     created_by INTEGER REFERENCES users(id) ON DELETE SET NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    version INTEGER NOT NULL DEFAULT 1,
+    -- Full-text search document, regenerated by Postgres on every write
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED,
     
     -- Constraint status
     CONSTRAINT chk_status CHECK (status IN ('Not_Started', 'In_Progress', 'Completed')),
@@ -37,27 +58,95 @@ CREATE TABLE tasks (
     CONSTRAINT chk_priority CHECK (priority IN ('Low', 'Medium', 'High'))
 );
 
--- Table: task_logs
+-- Table: task_logs (partitioned by month on changed_at; see `flask logs ...`)
 CREATE TABLE task_logs (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    assignee_id INTEGER NOT NULL REFERENCES assignees(id),
     old_status VARCHAR(20),
     new_status VARCHAR(20) NOT NULL,
     changed_by INTEGER REFERENCES users(id) ON DELETE SET NULL,
     change_reason TEXT,
-    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     
+    PRIMARY KEY (id, changed_at),
+
     -- Constraint status
     CONSTRAINT chk_log_old_status CHECK (old_status IN ('Not_Started', 'In_Progress', 'Completed')),
     CONSTRAINT chk_log_new_status CHECK (new_status IN ('Not_Started', 'In_Progress', 'Completed'))
+) PARTITION BY RANGE (changed_at);
+
+-- Catch-all for rows outside the monthly partitions
+CREATE TABLE task_logs_default PARTITION OF task_logs DEFAULT;
+
+-- Monthly partitions for the current month and the next three
+DO $$
+DECLARE
+    month DATE;
+BEGIN
+    FOR i IN 0..3 LOOP
+        month := (date_trunc('month', CURRENT_DATE) + make_interval(months => i))::date;
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF task_logs FOR VALUES FROM (%L) TO (%L)',
+            'task_logs_y' || to_char(month, 'YYYY') || 'm' || to_char(month, 'MM'),
+            month,
+            (month + interval '1 month')::date
+        );
+    END LOOP;
+END $$;
+
+-- Table: task_status_counts (dashboard rollups, maintained by the API on every task write)
+CREATE TABLE task_status_counts (
+    assignee_id INTEGER PRIMARY KEY REFERENCES assignees(id),
+    total_tasks INTEGER NOT NULL DEFAULT 0,
+    not_started INTEGER NOT NULL DEFAULT 0,
+    in_progress INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+-- Table: task_events (change feed for GET /api/events; ids follow commit order)
+CREATE TABLE task_events (
+    id BIGSERIAL PRIMARY KEY,
+    event_type VARCHAR(40) NOT NULL,
+    task_id INTEGER NOT NULL,
+    payload JSONB NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Table: task_daily_stats (trend rollups per day and assignee, kept by `flask analytics refresh`)
+CREATE TABLE task_daily_stats (
+    day DATE NOT NULL,
+    assignee_id INTEGER NOT NULL REFERENCES assignees(id),
+    created INTEGER NOT NULL DEFAULT 0,
+    started INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    cycle_time_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    cycle_time_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, assignee_id)
+);
+
+CREATE TABLE rollup_watermarks (
+    name VARCHAR(50) PRIMARY KEY,
+    processed_until TIMESTAMP NOT NULL
 );
 
 -- Indexes query
-CREATE INDEX idx_tasks_status ON tasks(status);
-CREATE INDEX idx_tasks_assigned_to ON tasks(assigned_to);
 CREATE INDEX idx_tasks_created_by ON tasks(created_by);
-CREATE INDEX idx_task_logs_task_id ON task_logs(task_id);
+
+-- Indexes keyset pagination (newest first on created_at, id) per filter combination;
+-- the leading status / assignee_id columns also serve plain equality filters
+CREATE INDEX idx_tasks_created_at_id ON tasks(created_at, id);
+CREATE INDEX idx_tasks_status_created_at_id ON tasks(status, created_at, id);
+CREATE INDEX idx_tasks_assignee_id_created_at_id ON tasks(assignee_id, created_at, id);
+CREATE INDEX idx_tasks_status_assignee_id_created_at_id ON tasks(status, assignee_id, created_at, id);
+CREATE INDEX idx_tasks_open_due_date ON tasks(due_date) WHERE status <> 'Completed';
+CREATE INDEX idx_tasks_search_vector ON tasks USING GIN (search_vector);
+
+CREATE INDEX idx_task_logs_task_id_changed_at ON task_logs(task_id, changed_at, id);
 CREATE INDEX idx_task_logs_changed_at ON task_logs(changed_at);
+CREATE INDEX idx_task_events_created_at ON task_events(created_at);
+CREATE INDEX idx_task_daily_stats_assignee_id_day ON task_daily_stats(assignee_id, day);
 
 -- Function auto-update timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -90,21 +179,42 @@ VALUES (
     'project_manager'
 );
 
--- Sample tasks
-INSERT INTO TASKS (title, description, assigned_to, status, priority, start_date, due_date, created_by) 
+-- Sample assignees and tasks
+INSERT INTO assignees (name, name_key)
+VALUES
+    ('Budi Santoso', 'budi santoso'),
+    ('Ani Wijaya', 'ani wijaya'),
+    ('Citra Dewi', 'citra dewi'),
+    ('Doni Pratama', 'doni pratama');
+
+INSERT INTO TASKS (title, description, assignee_id, assigned_to, status, priority, start_date, due_date, created_by) 
 VALUES 
-    ('Desain Landing Page', 'Membuat desain landing page untuk website baru', 'Budi Santoso', 'In_Progress', 'High', '2025-10-01', '2025-10-20', 1),
-    ('Setup Database', 'Konfigurasi database PostgreSQL untuk production', 'Ani Wijaya', 'Completed', 'High', '2025-09-25', '2025-10-05', 1),
-    ('Testing API', 'Testing semua endpoint REST API', 'Citra Dewi', 'Not_Started', 'Medium', '2025-10-15', '2025-10-25', 1),
-    ('Dokumentasi Project', 'Membuat dokumentasi lengkap untuk project', 'Doni Pratama', 'In_Progress', 'Low', '2025-10-10', '2025-10-30', 1);
+    ('Desain Landing Page', 'Membuat desain landing page untuk website baru', 1, 'Budi Santoso', 'In_Progress', 'High', '2025-10-01', '2025-10-20', 1),
+    ('Setup Database', 'Konfigurasi database PostgreSQL untuk production', 2, 'Ani Wijaya', 'Completed', 'High', '2025-09-25', '2025-10-05', 1),
+    ('Testing API', 'Testing semua endpoint REST API', 3, 'Citra Dewi', 'Not_Started', 'Medium', '2025-10-15', '2025-10-25', 1),
+    ('Dokumentasi Project', 'Membuat dokumentasi lengkap untuk project', 4, 'Doni Pratama', 'In_Progress', 'Low', '2025-10-10', '2025-10-30', 1);
+
+-- Seed rollups for the sample tasks
+INSERT INTO task_status_counts (assignee_id, total_tasks, not_started, in_progress, completed)
+SELECT
+    assignee_id,
+    COUNT(*),
+    COUNT(CASE WHEN status = 'Not_Started' THEN 1 END),
+    COUNT(CASE WHEN status = 'In_Progress' THEN 1 END),
+    COUNT(CASE WHEN status = 'Completed' THEN 1 END)
+FROM tasks
+GROUP BY assignee_id;
 
 -- Insert sample task logs
-INSERT INTO TASK_LOGS (task_id, old_status, new_status, changed_by, change_reason) 
-VALUES 
+INSERT INTO TASK_LOGS (task_id, assignee_id, old_status, new_status, changed_by, change_reason) 
+SELECT l.task_id, t.assignee_id, l.old_status, l.new_status, l.changed_by, l.change_reason
+FROM (VALUES 
     (1, 'Not_Started', 'In_Progress', 1, 'Task dimulai oleh Budi'),
     (2, 'Not_Started', 'In_Progress', 1, 'Database setup dimulai'),
     (2, 'In_Progress', 'Completed', 1, 'Database berhasil dikonfigurasi'),
-    (4, 'Not_Started', 'In_Progress', 1, 'Dokumentasi dimulai');
+    (4, 'Not_Started', 'In_Progress', 1, 'Dokumentasi dimulai')
+) AS l (task_id, old_status, new_status, changed_by, change_reason)
+JOIN tasks t ON t.id = l.task_id;
 
 -- View for dashboard statistics
 CREATE OR REPLACE VIEW task_statistics AS
@@ -119,14 +229,16 @@ FROM tasks;
 -- View for team member activity
 CREATE OR REPLACE VIEW team_activity AS
 SELECT 
-    assigned_to,
+    t.assignee_id,
+    a.name as assigned_to,
     COUNT(*) as total_tasks,
-    COUNT(CASE WHEN status = 'Completed' THEN 1 END) as completed_tasks,
-    COUNT(CASE WHEN status = 'In_Progress' THEN 1 END) as ongoing_tasks,
+    COUNT(CASE WHEN t.status = 'Completed' THEN 1 END) as completed_tasks,
+    COUNT(CASE WHEN t.status = 'In_Progress' THEN 1 END) as ongoing_tasks,
     ROUND(
-        (COUNT(CASE WHEN status = 'Completed' THEN 1 END)::DECIMAL / 
+        (COUNT(CASE WHEN t.status = 'Completed' THEN 1 END)::DECIMAL / 
         NULLIF(COUNT(*), 0)) * 100, 2
     ) as completion_rate
-FROM tasks
-GROUP BY assigned_to
+FROM tasks t
+JOIN assignees a ON a.id = t.assignee_id
+GROUP BY t.assignee_id, a.name
 ORDER BY completed_tasks DESC;
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""Fixtures for the test suite.
+
+The tests run against a real Postgres: the `testing` configuration's
+DB_HOST / DB_PORT / DB_USER / DB_PASSWORD (from the environment or .env),
+with the database TestingConfig.DB_NAME recreated from migrations/schema.sql
+once per run. Its QUERY_BUDGET_MODE is `raise`, so any route going over its
+@query_budget fails the test that called it.
+"""
+import os
+
+# Before anything imports app.config / app.database.db
+os.environ.setdefault('FLASK_ENV', 'testing')
+os.environ.setdefault('DB_CREATE_ALL', 'false')
+os.environ.setdefault('STARTUP_WARMUP', 'false')
+os.environ.setdefault('SQLALCHEMY_ECHO', 'false')
+os.environ.setdefault('PASSWORD_POOL_WORKERS', '0')
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from werkzeug.security import generate_password_hash
+from app.config import TestingConfig
+
+ADMIN_PASSWORD = 'admin123'
+
+
+def _recreate_database(conf) -> None:
+    url = make_url(conf().DATABASE_URL)
+    admin = create_engine(url.set(database='postgres'), isolation_level='AUTOCOMMIT')
+    try:
+        with admin.connect() as connection:
+            connection.execute(text(f'DROP DATABASE IF EXISTS "{url.database}" WITH (FORCE)'))
+            connection.execute(text(f'CREATE DATABASE "{url.database}"'))
+    finally:
+        admin.dispose()
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import create_app
+    from app.database import db, schema
+
+    _recreate_database(TestingConfig)
+    app = create_app('testing')
+    schema.run_script(schema.read_sql(schema.SCHEMA_FILE))
+    with db.get_engine().begin() as connection:
+        connection.execute(
+            text("UPDATE users SET password_hash = :password_hash WHERE username = 'admin'"),
+            {'password_hash': generate_password_hash(ADMIN_PASSWORD)}
+        )
+    yield app
+    db.get_engine().dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(app):
+    from app.utils.jwt_utils import generate_token
+    with app.app_context():
+        return {'Authorization': 'Bearer ' + generate_token(1, 'admin')}
+
+
+@pytest.fixture(autouse=True)
+def fresh_process_state(monkeypatch):
+    """Start every test from empty process-local caches.
+
+    Query counts depend on them (a resolved assignee name or a cached
+    dashboard payload saves a statement), so budgets are checked on the
+    cold path a freshly started worker takes.
+    """
+    from app.services.assignee_service import AssigneeService
+    from app.utils import cache
+    from app.utils.jwt_utils import token_cache
+
+    AssigneeService.clear_cache()
+    token_cache.clear()
+    monkeypatch.setattr(cache, '_cache', cache.LocalCache())
+    yield
+    AssigneeService.clear_cache()
@@ -0,0 +1,35 @@
+"""Token cache and revocation (POST /api/auth/logout)"""
+import time
+from app.utils.jwt_utils import TokenCache, CurrentUser, _digest, authenticate_token, generate_token, token_cache
+
+
+def test_logout_revokes_the_token(client, auth_headers):
+    assert client.get('/api/tasks?limit=1', headers=auth_headers).status_code == 200
+
+    assert client.post('/api/auth/logout', headers=auth_headers).status_code == 200
+
+    response = client.get('/api/tasks?limit=1', headers=auth_headers)
+    assert response.status_code == 401
+    assert response.get_json()['message'] == 'Token has been revoked'
+
+
+def test_revoke_evicts_a_cached_token(app):
+    with app.app_context():
+        token = generate_token(1, 'admin')
+    authenticate_token(token)
+    digest = _digest(token)
+    assert token_cache.get(digest) is not None
+
+    token_cache.revoke(digest, time.time() + 60)
+
+    assert token_cache.get(digest) is None
+    assert token_cache.is_revoked(digest)
+
+
+def test_revocations_are_pruned_once_expired():
+    cache = TokenCache(max_size=10)
+    cache.revoke(b'old', time.time() - 1)
+    cache.revoke(b'new', time.time() + 60)
+    assert not cache.is_revoked(b'old')
+    cache.put(b'new', CurrentUser(user_id=1, username='admin', expires_at=time.time() + 60))
+    assert cache.get(b'new') is None
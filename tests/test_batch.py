@@ -0,0 +1,45 @@
+"""POST /api/tasks/batch reports invalid items instead of failing the batch; PUT rejects bad versions"""
+
+
+def test_invalid_status_and_priority_are_reported_per_item(client, auth_headers):
+    created = client.post('/api/tasks', json={'title': 'Batch target', 'assigned_to': 'Batch Tester'}, headers=auth_headers)
+    task_id = created.get_json()['data']['id']
+
+    response = client.post('/api/tasks/batch', json={
+        'create': [
+            {'title': 'Bad priority', 'assigned_to': 'Batch Tester', 'priority': 'Urgent'},
+            {'title': 'Good', 'assigned_to': 'Batch Tester'},
+        ],
+        'update': [
+            {'id': task_id, 'status': 'Nope'},
+            {'id': 1, 'priority': 'High'},
+        ],
+    }, headers=auth_headers)
+
+    assert response.status_code == 200
+    results = response.get_json()['data']
+    assert [item['success'] for item in results['create']] == [False, True]
+    assert results['create'][0]['message'] == 'priority must be one of: Low, Medium, High'
+    assert [item['success'] for item in results['update']] == [False, True]
+    assert results['update'][0]['message'] == 'status must be one of: Not_Started, In_Progress, Completed'
+    task = client.get(f'/api/tasks/{task_id}', headers=auth_headers).get_json()['data']
+    assert task['status'] == 'Not_Started'
+
+
+def test_boolean_ids_and_versions_are_rejected(client, auth_headers):
+    response = client.post('/api/tasks/batch', json={
+        'update': [{'id': True, 'status': 'Completed'}, {'id': 1, 'status': 'Completed', 'version': True}],
+        'delete': [True],
+    }, headers=auth_headers)
+
+    assert response.status_code == 200
+    results = response.get_json()['data']
+    assert [item['message'] for item in results['update']] == ['Task not found', 'version must be an integer']
+    assert results['delete'][0]['message'] == 'Task not found'
+    assert client.get('/api/tasks/1', headers=auth_headers).status_code == 200
+
+
+def test_update_rejects_boolean_version(client, auth_headers):
+    response = client.put('/api/tasks/2', json={'status': 'Completed', 'version': True}, headers=auth_headers)
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'version must be an integer'
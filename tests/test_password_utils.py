@@ -0,0 +1,24 @@
+"""Password verification re-hashes only hashes made with another method or cost"""
+import pytest
+from werkzeug.security import generate_password_hash
+from app.config import Config
+from app.utils.password_utils import hash_password, verify_password
+
+
+@pytest.mark.parametrize('method', ['scrypt', 'pbkdf2', 'pbkdf2:sha256', 'pbkdf2:sha256:600000'])
+def test_current_hash_is_not_rehashed(monkeypatch, method):
+    monkeypatch.setattr(Config, 'PASSWORD_HASH_METHOD', method)
+    assert verify_password(hash_password('secret'), 'secret') == (True, None)
+
+
+def test_outdated_hash_is_rehashed(monkeypatch):
+    monkeypatch.setattr(Config, 'PASSWORD_HASH_METHOD', 'scrypt')
+    valid, new_hash = verify_password(generate_password_hash('secret', method='pbkdf2:sha256:1000'), 'secret')
+    assert valid
+    assert new_hash.startswith('scrypt:32768:8:1$')
+    assert verify_password(new_hash, 'secret') == (True, None)
+
+
+def test_wrong_password(monkeypatch):
+    monkeypatch.setattr(Config, 'PASSWORD_HASH_METHOD', 'scrypt')
+    assert verify_password(hash_password('secret'), 'wrong') == (False, None)
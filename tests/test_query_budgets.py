@@ -0,0 +1,180 @@
+"""Every task, dashboard and auth route stays within its @query_budget.
+
+TestingConfig runs with QUERY_BUDGET_MODE=raise, so a route that goes over
+its budget (or repeats a statement, the N+1 pattern) raises
+QueryBudgetExceeded out of the test client instead of returning a response.
+"""
+import pytest
+from app.database.query_budget import QueryBudgetExceeded, query_budget
+from app.database.session import get_read_session
+from app.models.task_log import TaskLog
+from app.services.task_log_service import TaskLogService
+from tests.conftest import ADMIN_PASSWORD
+
+
+def _create_task(client, headers, **fields):
+    body = {'title': 'Budget check', 'assigned_to': 'Budget Tester', **fields}
+    response = client.post('/api/tasks', json=body, headers=headers)
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['data']
+
+
+def test_login(client):
+    response = client.post('/api/auth/login', json={'username': 'admin', 'password': ADMIN_PASSWORD})
+    assert response.status_code == 200
+    assert response.get_json()['data']['access_token']
+
+
+def test_login_wrong_password(client):
+    response = client.post('/api/auth/login', json={'username': 'admin', 'password': 'wrong'})
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize('query', [
+    '',
+    '?status=In_Progress',
+    '?assigned_to=Budi%20Santoso',
+    '?limit=2',
+    '?limit=2&assigned_to=Budi%20Santoso',
+    '?stream=1',
+])
+def test_list_tasks(client, auth_headers, query):
+    response = client.get('/api/tasks' + query, headers=auth_headers)
+    assert response.status_code == 200
+    response.get_data()
+
+
+def test_list_tasks_not_modified(client, auth_headers):
+    etag = client.get('/api/tasks', headers=auth_headers).headers['ETag']
+    response = client.get('/api/tasks', headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+
+
+def test_list_tasks_next_page(client, auth_headers):
+    first = client.get('/api/tasks?limit=1', headers=auth_headers).get_json()
+    cursor = first['pagination']['next_cursor']
+    response = client.get(f'/api/tasks?limit=1&cursor={cursor}', headers=auth_headers)
+    assert response.status_code == 200
+
+
+def test_search_tasks(client, auth_headers):
+    response = client.get('/api/tasks/search?q=desa%20lan', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.get_json()['data']
+
+
+def test_get_task(client, auth_headers):
+    response = client.get('/api/tasks/1', headers=auth_headers)
+    assert response.status_code == 200
+    response = client.get('/api/tasks/1', headers={**auth_headers, 'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+
+def test_get_missing_task(client, auth_headers):
+    assert client.get('/api/tasks/999999', headers=auth_headers).status_code == 404
+
+
+def test_create_task(client, auth_headers):
+    task = _create_task(client, auth_headers, assigned_to='New Assignee')
+    assert task['assigned_to'] == 'New Assignee'
+
+
+def test_create_task_existing_assignee(client, auth_headers):
+    _create_task(client, auth_headers, assigned_to='Ani Wijaya')
+
+
+def test_update_task(client, auth_headers):
+    task = _create_task(client, auth_headers)
+    response = client.put(
+        f"/api/tasks/{task['id']}",
+        json={'status': 'In_Progress', 'assigned_to': 'Another Assignee', 'version': task['version']},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.get_json()['data']['status'] == 'In_Progress'
+
+
+def test_update_task_version_conflict(client, auth_headers):
+    task = _create_task(client, auth_headers)
+    response = client.put(
+        f"/api/tasks/{task['id']}", json={'status': 'Completed', 'version': task['version'] + 1}, headers=auth_headers
+    )
+    assert response.status_code == 409
+
+
+def test_delete_task(client, auth_headers):
+    task = _create_task(client, auth_headers)
+    assert client.delete(f"/api/tasks/{task['id']}", headers=auth_headers).status_code == 200
+    assert client.delete(f"/api/tasks/{task['id']}", headers=auth_headers).status_code == 404
+
+
+def test_task_logs(client, auth_headers):
+    task = _create_task(client, auth_headers)
+    client.put(f"/api/tasks/{task['id']}", json={'status': 'Completed'}, headers=auth_headers)
+    for query in ('', '?limit=1', '?stream=1'):
+        response = client.get(f"/api/tasks/{task['id']}/logs{query}", headers=auth_headers)
+        assert response.status_code == 200
+        response.get_data()
+
+
+def test_batch(client, auth_headers):
+    existing = [_create_task(client, auth_headers) for _ in range(3)]
+    response = client.post('/api/tasks/batch', json={
+        'create': [{'title': f'Batch {i}', 'assigned_to': f'Batch Assignee {i}'} for i in range(5)],
+        'update': [{'id': task['id'], 'status': 'Completed'} for task in existing[:2]],
+        'delete': [existing[2]['id'], 999999],
+    }, headers=auth_headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('content_type, body', [
+    ('text/csv', b'title,assigned_to,status\nImported A,Import One,Not_Started\nImported B,Import Two,Completed\n'),
+    ('application/x-ndjson', b'{"title": "Imported C", "assigned_to": "Import One"}\n'),
+])
+def test_import(client, auth_headers, content_type, body):
+    response = client.post('/api/tasks/import', data=body, headers={**auth_headers, 'Content-Type': content_type})
+    assert response.status_code == 201, response.get_json()
+
+
+@pytest.mark.parametrize('path', ['/api/tasks/export', '/api/tasks/export/logs'])
+@pytest.mark.parametrize('fmt', ['csv', 'ndjson'])
+def test_export(client, auth_headers, path, fmt):
+    response = client.get(f'{path}?format={fmt}', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.get_data()
+
+
+def test_dashboard_statistics(client, auth_headers):
+    response = client.get('/api/dashboard/statistics', headers=auth_headers)
+    assert response.status_code == 200
+    response = client.get('/api/dashboard/statistics', headers={**auth_headers, 'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize('query', ['', '?interval=week', '?assigned_to=Budi%20Santoso'])
+def test_dashboard_trends(client, auth_headers, query):
+    assert client.get('/api/dashboard/trends' + query, headers=auth_headers).status_code == 200
+
+
+def test_get_all_logs_loads_task_and_user_with_the_logs(app, client, auth_headers):
+    """Regression: get_all_logs used to lazy-load each log's task and user (N+1)"""
+    for _ in range(3):
+        task = _create_task(client, auth_headers)
+        client.put(f"/api/tasks/{task['id']}", json={'status': 'Completed'}, headers=auth_headers)
+
+    with app.test_request_context():
+        with query_budget(1, label='get_all_logs'):
+            logs = TaskLogService.get_all_logs(limit=10)
+        assert len(logs) == 10
+        assert all(log['task_title'] and log['changed_by'] for log in logs)
+
+
+def test_query_budget_reports_lazy_loads(app):
+    """The check the regression test relies on: per-row lazy loads exceed the budget"""
+    with app.test_request_context():
+        db = get_read_session()
+        with pytest.raises(QueryBudgetExceeded):
+            with query_budget(1, label='lazy logs'):
+                logs = db.query(TaskLog).order_by(TaskLog.id).limit(3).all()
+                [log.task.title for log in logs]
+        db.rollback()
@@ -0,0 +1,21 @@
+"""Validation of single-task create and update"""
+import pytest
+
+
+@pytest.mark.parametrize('assigned_to', [5, ['Budi'], {'name': 'Budi'}, '   '])
+def test_create_rejects_invalid_assignee(client, auth_headers, assigned_to):
+    response = client.post('/api/tasks', json={'title': 't', 'assigned_to': assigned_to}, headers=auth_headers)
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'assigned_to must be a non-blank string'
+
+
+@pytest.mark.parametrize('assigned_to', [5, ['Budi'], '   '])
+def test_update_rejects_invalid_assignee(client, auth_headers, assigned_to):
+    response = client.put('/api/tasks/3', json={'assigned_to': assigned_to}, headers=auth_headers)
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'assigned_to must be a non-blank string'
+
+
+def test_create_rejects_unknown_status(client, auth_headers):
+    response = client.post('/api/tasks', json={'title': 't', 'assigned_to': 'Someone', 'status': 'Nope'}, headers=auth_headers)
+    assert response.status_code == 400